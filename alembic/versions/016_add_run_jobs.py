@@ -0,0 +1,70 @@
+"""Add durable run job queue.
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "016"
+down_revision: Union[str, None] = "015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "run_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("run_id", sa.Integer(), nullable=False),
+        sa.Column("query_ids", postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column("batch_size", sa.Integer(), nullable=False, server_default="10"),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="queued"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("worker_id", sa.String(length=120), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column(
+            "available_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["run_id"], ["runs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_run_jobs_run_id", "run_jobs", ["run_id"], unique=False)
+    op.create_index("ix_run_jobs_status", "run_jobs", ["status"], unique=False)
+    op.create_index("ix_run_jobs_available_at", "run_jobs", ["available_at"], unique=False)
+
+    # Runs that were left pending by the old in-process scheduler would never
+    # start again; mark them failed so users can re-launch them explicitly.
+    op.execute(
+        """
+        UPDATE runs
+        SET status = 'failed',
+            error_message = 'Run was interrupted before the durable job queue was introduced.',
+            completed_at = now()
+        WHERE status IN ('pending', 'running')
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_run_jobs_available_at", table_name="run_jobs")
+    op.drop_index("ix_run_jobs_status", table_name="run_jobs")
+    op.drop_index("ix_run_jobs_run_id", table_name="run_jobs")
+    op.drop_table("run_jobs")
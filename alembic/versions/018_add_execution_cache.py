@@ -0,0 +1,52 @@
+"""Add content-addressed execution cache.
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "018"
+down_revision: Union[str, None] = "017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "execution_cache",
+        sa.Column("cache_key", sa.String(64), primary_key=True),
+        sa.Column("executor_type", sa.String(50), nullable=False),
+        sa.Column("model", sa.String(255), nullable=True),
+        sa.Column("result", postgresql.JSONB(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.Column(
+            "last_used_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_execution_cache_last_used_at", "execution_cache", ["last_used_at"]
+    )
+    op.create_index("ix_execution_cache_expires_at", "execution_cache", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_execution_cache_expires_at", table_name="execution_cache")
+    op.drop_index("ix_execution_cache_last_used_at", table_name="execution_cache")
+    op.drop_table("execution_cache")
@@ -0,0 +1,53 @@
+"""Store computed costs on results and trace logs.
+
+Revision ID: 020
+Revises: 019
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "020"
+down_revision: Union[str, None] = "019"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLES = ("results", "trace_logs")
+_COST_COLUMNS = (
+    "total_cost_usd",
+    "input_cost_usd",
+    "cached_input_cost_usd",
+    "output_cost_usd",
+    "reasoning_output_cost_usd",
+    "web_search_cost_usd",
+)
+
+
+def upgrade() -> None:
+    # Existing rows stay NULL here and are priced by the repricing job
+    # (workers/reprice.py, ``python -m workers.reprice``), which needs the
+    # pricing file.
+    for table in _TABLES:
+        for column in _COST_COLUMNS:
+            op.add_column(table, sa.Column(column, sa.Float(), nullable=True))
+        op.add_column(table, sa.Column("web_search_calls", sa.Integer(), nullable=True))
+        op.add_column(
+            table, sa.Column("missing_model_pricing", sa.Boolean(), nullable=True)
+        )
+        op.add_column(table, sa.Column("pricing_version", sa.String(64), nullable=True))
+        op.create_index(f"ix_{table}_pricing_version", table, ["pricing_version"])
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.drop_index(f"ix_{table}_pricing_version", table_name=table)
+        for column in (
+            *_COST_COLUMNS,
+            "web_search_calls",
+            "missing_model_pricing",
+            "pricing_version",
+        ):
+            op.drop_column(table, column)
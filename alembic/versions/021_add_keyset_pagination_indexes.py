@@ -0,0 +1,37 @@
+"""Add (created_at, id) indexes for keyset pagination of list endpoints.
+
+Revision ID: 021
+Revises: 020
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "021"
+down_revision: Union[str, None] = "020"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEXES = (
+    ("ix_runs_created_at_id", "runs", ["created_at", "id"]),
+    ("ix_benchmark_suites_created_at_id", "benchmark_suites", ["created_at", "id"]),
+    ("ix_agent_configs_created_at_id", "agent_configs", ["created_at", "id"]),
+    ("ix_results_run_id_created_at_id", "results", ["run_id", "created_at", "id"]),
+    (
+        "ix_trace_logs_project_id_created_at_id",
+        "trace_logs",
+        ["project_id", "created_at", "id"],
+    ),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in _INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in _INDEXES:
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,30 @@
+"""Index queries and runs by suite for suite listings.
+
+Revision ID: 022
+Revises: 021
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "022"
+down_revision: Union[str, None] = "021"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_queries_suite_id", "queries", ["suite_id"], unique=False)
+    op.create_index(
+        "ix_runs_suite_id_created_at_id",
+        "runs",
+        ["suite_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_runs_suite_id_created_at_id", table_name="runs")
+    op.drop_index("ix_queries_suite_id", table_name="queries")
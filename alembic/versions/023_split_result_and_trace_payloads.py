@@ -0,0 +1,81 @@
+"""Move heavy result and trace payloads into side tables.
+
+Revision ID: 023
+Revises: 022
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "023"
+down_revision: Union[str, None] = "022"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "result_payloads",
+        sa.Column(
+            "result_id",
+            sa.Integer(),
+            sa.ForeignKey("results.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("agent_response", sa.Text(), nullable=True),
+        sa.Column("tool_calls", postgresql.JSONB, nullable=True),
+        sa.Column("reasoning", postgresql.JSONB, nullable=True),
+    )
+    op.create_table(
+        "trace_payloads",
+        sa.Column(
+            "trace_log_id",
+            sa.Integer(),
+            sa.ForeignKey("trace_logs.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("request_payload", postgresql.JSONB, nullable=True),
+        sa.Column("response_payload", postgresql.JSONB, nullable=True),
+    )
+    op.execute(
+        "INSERT INTO result_payloads (result_id, agent_response, tool_calls, reasoning) "
+        "SELECT id, agent_response, tool_calls, reasoning FROM results"
+    )
+    op.execute(
+        "INSERT INTO trace_payloads (trace_log_id, request_payload, response_payload) "
+        "SELECT id, request_payload, response_payload FROM trace_logs"
+    )
+    for column in ("agent_response", "tool_calls", "reasoning"):
+        op.drop_column("results", column)
+    for column in ("request_payload", "response_payload"):
+        op.drop_column("trace_logs", column)
+    # Dropped columns keep their space until the tables are rewritten (for
+    # example by VACUUM FULL or pg_repack), which is left to the operator.
+
+
+def downgrade() -> None:
+    op.add_column("results", sa.Column("agent_response", sa.Text(), nullable=True))
+    op.add_column("results", sa.Column("tool_calls", postgresql.JSONB, nullable=True))
+    op.add_column("results", sa.Column("reasoning", postgresql.JSONB, nullable=True))
+    op.add_column(
+        "trace_logs", sa.Column("request_payload", postgresql.JSONB, nullable=True)
+    )
+    op.add_column(
+        "trace_logs", sa.Column("response_payload", postgresql.JSONB, nullable=True)
+    )
+    op.execute(
+        "UPDATE results SET agent_response = p.agent_response, "
+        "tool_calls = p.tool_calls, reasoning = p.reasoning "
+        "FROM result_payloads p WHERE p.result_id = results.id"
+    )
+    op.execute(
+        "UPDATE trace_logs SET request_payload = p.request_payload, "
+        "response_payload = p.response_payload "
+        "FROM trace_payloads p WHERE p.trace_log_id = trace_logs.id"
+    )
+    op.drop_table("trace_payloads")
+    op.drop_table("result_payloads")
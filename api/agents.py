@@ -2,7 +2,7 @@ import ast
 import json
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
 from starlette.responses import StreamingResponse
 from sqlalchemy import or_, select
@@ -14,6 +14,7 @@ from models.agent import AgentConfig
 from models.project import Project
 from models.project_membership import ProjectMembership
 from models.trace_log import TraceLog
+from models.trace_payload import TracePayload
 from models.user_permission_grant import UserPermissionGrant
 from schemas.schemas import (
     AgentChatRequest,
@@ -23,13 +24,22 @@ from schemas.schemas import (
     AgentUpdate,
     TraceLogOut,
 )
-from services.openai_pricing import calculate_cost
-from services.trace_utils import trace_to_out
+from services.openai_pricing import calculate_cost, set_cost_columns
+from services.trace_utils import EXCLUDABLE_TRACE_FIELDS, trace_to_out
 from services.db_utils import get_or_404
 from services.context import WorkspaceContext, get_request_context
 from services.error_format import format_exception_details
+from services.pagination import (
+    blank_deferred,
+    defer_columns,
+    finish_page,
+    page_size,
+    paginate,
+    parse_exclude,
+)
 from services.openai_tools import build_openai_tools
 from services.permissions import require_permission
+from services.rate_limits import governed_execute_chat, governor
 from services.tenancy import apply_workspace_filter, assign_workspace_fields
 
 router = APIRouter()
@@ -265,17 +275,33 @@ async def parse_code(body: ParseCodeRequest):
     return extracted
 
 
+# Heavy columns list views may leave out (``exclude=``)
+_EXCLUDABLE_AGENT_FIELDS = ("system_prompt", "source_code", "tools_config", "model_settings")
+
+
 @router.get("", response_model=list[AgentOut])
-async def list_agents(tag: str | None = None, db: AsyncSession = Depends(get_db)):
+async def list_agents(
+    response: Response,
+    tag: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    exclude: str | None = Query(
+        None, description="Comma-separated heavy fields to leave out"
+    ),
+    db: AsyncSession = Depends(get_db),
+):
     ctx = get_request_context()
     await require_permission(db, ctx, "agents.read")
+    q = page_size(limit)
+    excluded = parse_exclude(exclude, _EXCLUDABLE_AGENT_FIELDS)
     stmt = select(AgentConfig)
     stmt = apply_workspace_filter(stmt, AgentConfig, ctx)
     if tag:
         stmt = stmt.where(AgentConfig.tags.overlap([tag]))
-    stmt = stmt.order_by(AgentConfig.created_at.desc())
-    result = await db.execute(stmt)
-    return [AgentOut.model_validate(a) for a in result.scalars().all()]
+    stmt = defer_columns(paginate(stmt, AgentConfig, cursor, q), AgentConfig, excluded)
+    agents = finish_page((await db.execute(stmt)).scalars().all(), q, response)
+    blank_deferred(agents, excluded)
+    return [AgentOut.model_validate(a) for a in agents]
 
 
 @router.get("/importable", response_model=list[AgentOut])
@@ -344,26 +370,33 @@ async def chat_with_agent(
         model=agent.model,
         status="started",
         started_at=started_at,
-        request_payload={"messages": [m.model_dump() for m in body.messages]},
+        payload=TracePayload(
+            request_payload={"messages": [m.model_dump() for m in body.messages]}
+        ),
     )
     db.add(trace)
     await db.flush()
 
-    exec_result = await executor.execute_chat(
-        [m.model_dump() for m in body.messages], config
+    exec_result = await governed_execute_chat(
+        executor,
+        [m.model_dump() for m in body.messages],
+        config,
+        organization_id=ctx.organization_id,
     )
     completed_at = datetime.now(timezone.utc)
     trace.completed_at = completed_at
     trace.latency_ms = int((completed_at - started_at).total_seconds() * 1000)
     trace.status = "failed" if exec_result.error else "completed"
     trace.error = exec_result.error
+    trace.attempts = exec_result.attempts
     trace.usage = exec_result.usage or None
-    trace.response_payload = {
+    trace.payload.response_payload = {
         "response": exec_result.response,
         "tool_calls": exec_result.tool_calls,
         "reasoning": exec_result.reasoning,
     }
     breakdown = calculate_cost(agent.model or "", exec_result.usage or {}, exec_result.tool_calls)
+    set_cost_columns(trace, breakdown)
     await db.commit()
     await db.refresh(trace)
     return AgentChatResponse(
@@ -446,6 +479,10 @@ async def chat_with_agent_stream(
         raise HTTPException(400, "messages cannot be empty")
 
     started_at = datetime.now(timezone.utc)
+    # Kept by reference: the refresh below unloads trace.payload
+    trace_payload = TracePayload(
+        request_payload={"messages": [m.model_dump() for m in body.messages]}
+    )
     trace = TraceLog(
         organization_id=ctx.organization_id,
         project_id=ctx.project_id,
@@ -460,13 +497,20 @@ async def chat_with_agent_stream(
         model=agent.model,
         status="started",
         started_at=started_at,
-        request_payload={"messages": [m.model_dump() for m in body.messages]},
+        payload=trace_payload,
     )
     db.add(trace)
     await db.commit()
     await db.refresh(trace)
 
     async def event_stream():
+        async with governor.acquire(
+            model=agent.model or "", organization_id=ctx.organization_id
+        ) as lease:
+            async for chunk in _stream_chat(lease):
+                yield chunk
+
+    async def _stream_chat(lease):
         full_text = ""
         message_output_chunks: list[str] = []
         reasoning_chunks: list[str] = []
@@ -552,6 +596,7 @@ async def chat_with_agent_stream(
                 final_text = "No assistant text was returned."
             if usage_dict is None:
                 usage_dict = {}
+            lease.record_usage(usage_dict)
             reasoning_payload = [{"summary": ["".join(reasoning_chunks)]}] if reasoning_chunks else []
             breakdown = calculate_cost(agent.model or "", usage_dict, tool_calls)
 
@@ -561,11 +606,12 @@ async def chat_with_agent_stream(
             trace.status = "completed"
             trace.error = None
             trace.usage = usage_dict or None
-            trace.response_payload = {
+            trace_payload.response_payload = {
                 "response": final_text,
                 "tool_calls": tool_calls,
                 "reasoning": reasoning_payload,
             }
+            set_cost_columns(trace, breakdown)
             await db.commit()
 
             done_payload = {
@@ -594,11 +640,12 @@ async def chat_with_agent_stream(
             trace.status = "failed"
             formatted_error = format_exception_details(exc)
             trace.error = formatted_error
-            trace.response_payload = {
+            trace_payload.response_payload = {
                 "response": full_text,
                 "tool_calls": tool_calls,
                 "reasoning": [{"summary": ["".join(reasoning_chunks)]}] if reasoning_chunks else [],
             }
+            set_cost_columns(trace, calculate_cost(agent.model or "", None, tool_calls))
             await db.commit()
             yield f"event: error\ndata: {json.dumps({'error': formatted_error, 'trace_log_id': trace.id})}\n\n"
 
@@ -615,18 +662,24 @@ async def chat_with_agent_stream(
 
 @router.get("/{agent_id}/traces", response_model=list[TraceLogOut])
 async def list_agent_traces(
+    response: Response,
     agent_id: int,
     status: str | None = None,
     trace_type: str | None = None,
     run_id: int | None = None,
     conversation_id: str | None = None,
     limit: int = 200,
+    cursor: str | None = None,
+    exclude: str | None = Query(
+        None, description="Comma-separated heavy fields to leave out"
+    ),
     db: AsyncSession = Depends(get_db),
 ):
     ctx = get_request_context()
     await require_permission(db, ctx, "traces.read")
     agent = await get_or_404(db, AgentConfig, agent_id, "Agent")
-    q = min(max(limit, 1), 1000)
+    q = page_size(limit)
+    excluded = parse_exclude(exclude, EXCLUDABLE_TRACE_FIELDS)
     stmt = select(TraceLog).where(TraceLog.agent_config_id == agent_id)
     stmt = apply_workspace_filter(stmt, TraceLog, ctx)
     if status:
@@ -637,8 +690,9 @@ async def list_agent_traces(
         stmt = stmt.where(TraceLog.run_id == run_id)
     if conversation_id:
         stmt = stmt.where(TraceLog.conversation_id == conversation_id)
-    stmt = stmt.order_by(TraceLog.created_at.desc()).limit(q)
-    rows = (await db.execute(stmt)).scalars().all()
+    stmt = defer_columns(paginate(stmt, TraceLog, cursor, q), TraceLog, excluded)
+    rows = finish_page((await db.execute(stmt)).scalars().all(), q, response)
+    blank_deferred(rows, excluded)
     return [trace_to_out(trace) for trace in rows]
 
 
@@ -6,15 +6,17 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import HTMLResponse, StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased
 
-from database import get_db
+from database import async_session, get_db
 from models.grade import Grade
 from models.query import Query as QueryModel
 from models.result import Result
+from models.result_payload import ResultPayload
 from models.run import Run
 from services.analytics import compute_compare_analytics, compute_run_analytics
 from services.html_export import generate_export_html
+from services.columnar_export import pyarrow_available, stream_columnar_export
 from services.context import get_request_context
 from services.permissions import require_permission
 from services.tenancy import apply_workspace_filter
@@ -33,96 +35,181 @@ async def export_html(run_ids: str = Query(...), db: AsyncSession = Depends(get_
     return HTMLResponse(content=html)
 
 
-@router.get("/csv")
-async def export_csv(run_ids: str = Query(...), db: AsyncSession = Depends(get_db)):
-    ctx = get_request_context()
-    await require_permission(db, ctx, "exports.read")
+# Exports stream straight from server-side cursors: rows are fetched in
+# batches of this many and written out as they arrive, so memory stays flat
+# no matter how many results the runs hold.
+_EXPORT_BATCH_SIZE = 500
+# Serialized output is buffered up to roughly this many bytes per chunk
+_EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def _parse_run_ids(run_ids: str) -> list[int]:
     ids = [int(x.strip()) for x in run_ids.split(",") if x.strip()]
     if not ids:
         raise HTTPException(400, "At least 1 run ID required")
+    return ids
 
-    rows = []
-    header = ["query_id", "tag", "query_text", "expected_answer"]
 
-    # Load runs
-    for rid in ids:
-        run_stmt = apply_workspace_filter(select(Run).where(Run.id == rid), Run, ctx)
-        run = (await db.execute(run_stmt)).scalar_one_or_none()
-        if run:
-            header.extend(
-                [f"{run.label}_response", f"{run.label}_grade", f"{run.label}_time"]
-            )
+async def _load_runs(db: AsyncSession, ids: list[int], ctx) -> list[tuple]:
+    """(id, label, status) of the accessible runs, in the requested order."""
+    stmt = apply_workspace_filter(
+        select(Run.id, Run.label, Run.status).where(Run.id.in_(ids)), Run, ctx
+    )
+    found = {row.id: row for row in (await db.execute(stmt)).all()}
+    return [found[rid] for rid in ids if rid in found]
 
-    rows.append(header)
-
-    # Get all results for first run to know query order
-    first_results = (
-        (
-            await db.execute(
-                apply_workspace_filter(
-                    select(Result)
-                    .where(Result.run_id == ids[0])
-                    .options(selectinload(Result.query), selectinload(Result.grade))
-                    .order_by(Result.query_id),
-                    Result,
-                    ctx,
-                )
+
+def _csv_stmt(run_ids: list[int]):
+    """One row per result of the first run, with every other run's result for
+    the same query outer-joined alongside (its default version if versioned)."""
+    first_grade = aliased(Grade)
+    columns = [
+        Result.query_id,
+        QueryModel.tag,
+        QueryModel.query_text,
+        QueryModel.expected_answer,
+        ResultPayload.agent_response,
+        first_grade.grade,
+        Result.execution_time_seconds,
+    ]
+    others = []
+    for rid in run_ids[1:]:
+        other = (
+            select(
+                Result.query_id,
+                ResultPayload.agent_response,
+                Result.execution_time_seconds,
+                Grade.grade,
+            )
+            .outerjoin(ResultPayload, ResultPayload.result_id == Result.id)
+            .outerjoin(Grade, Grade.result_id == Result.id)
+            .where(Result.run_id == rid)
+            .distinct(Result.query_id)
+            .order_by(
+                Result.query_id,
+                Result.is_default_version.desc(),
+                Result.id.desc(),
             )
+            .subquery()
+        )
+        others.append(other)
+        columns.extend(
+            [other.c.agent_response, other.c.grade, other.c.execution_time_seconds]
         )
-        .scalars()
-        .all()
+    stmt = (
+        select(*columns)
+        .join(QueryModel, QueryModel.id == Result.query_id)
+        .outerjoin(ResultPayload, ResultPayload.result_id == Result.id)
+        .outerjoin(first_grade, first_grade.result_id == Result.id)
+    )
+    for other in others:
+        stmt = stmt.outerjoin(other, other.c.query_id == Result.query_id)
+    return (
+        stmt.where(Result.run_id == run_ids[0])
+        .order_by(Result.query_id, Result.id)
+        .execution_options(yield_per=_EXPORT_BATCH_SIZE)
     )
 
-    # Build result map for all runs
-    result_maps = {}
-    for rid in ids:
-        results = (
-            (
-                await db.execute(
-                    apply_workspace_filter(
-                        select(Result)
-                        .where(Result.run_id == rid)
-                        .options(selectinload(Result.grade)),
-                        Result,
-                        ctx,
-                    )
+
+def _csv_cells(response, grade, seconds) -> list:
+    return [
+        response or "",
+        grade or "not_graded",
+        f"{seconds:.2f}" if seconds else "",
+    ]
+
+
+async def _stream_csv(runs: list[tuple]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    header = ["query_id", "tag", "query_text", "expected_answer"]
+    for run in runs:
+        header.extend([f"{run.label}_response", f"{run.label}_grade", f"{run.label}_time"])
+    writer.writerow(header)
+    if runs:
+        # The request's session is closed before the body streams, so the
+        # cursor lives in its own session for the lifetime of the response.
+        async with async_session() as db:
+            result = await db.stream(_csv_stmt([run.id for run in runs]))
+            async for partition in result.partitions():
+                for row in partition:
+                    cells = [row[0], row[1] or "", row[2], row[3]]
+                    for i in range(4, len(row), 3):
+                        cells.extend(_csv_cells(*row[i : i + 3]))
+                    writer.writerow(cells)
+                if buffer.tell() >= _EXPORT_CHUNK_BYTES:
+                    yield buffer.getvalue().encode()
+                    buffer.seek(0)
+                    buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+async def _stream_json(runs: list[tuple]):
+    yield b'{"runs": ['
+    async with async_session() as db:
+        for run_index, run in enumerate(runs):
+            head = json.dumps({"id": run.id, "label": run.label, "status": run.status})
+            chunk = [", " if run_index else "", head[:-1], ', "results": [']
+            size = 0
+            first = True
+            stmt = (
+                select(
+                    Result.query_id,
+                    QueryModel.query_text,
+                    QueryModel.tag,
+                    QueryModel.expected_answer,
+                    ResultPayload.agent_response,
+                    Grade.grade,
+                    Result.execution_time_seconds,
+                    ResultPayload.tool_calls,
+                    Result.usage,
                 )
+                .join(QueryModel, QueryModel.id == Result.query_id)
+                .outerjoin(ResultPayload, ResultPayload.result_id == Result.id)
+                .outerjoin(Grade, Grade.result_id == Result.id)
+                .where(Result.run_id == run.id)
+                .order_by(Result.query_id, Result.id)
+                .execution_options(yield_per=_EXPORT_BATCH_SIZE)
             )
-            .scalars()
-            .all()
-        )
-        result_maps[rid] = {r.query_id: r for r in results}
-
-    for r in first_results:
-        row = [
-            r.query_id,
-            r.query.tag or "",
-            r.query.query_text,
-            r.query.expected_answer,
-        ]
-        for rid in ids:
-            rm = result_maps.get(rid, {})
-            res = rm.get(r.query_id)
-            if res:
-                row.extend(
-                    [
-                        res.agent_response or "",
-                        res.grade.grade if res.grade else "not_graded",
-                        f"{res.execution_time_seconds:.2f}"
-                        if res.execution_time_seconds
-                        else "",
-                    ]
-                )
-            else:
-                row.extend(["", "not_graded", ""])
-        rows.append(row)
+            result = await db.stream(stmt)
+            async for partition in result.partitions():
+                for row in partition:
+                    item = json.dumps(
+                        {
+                            "query_id": row.query_id,
+                            "query_text": row.query_text,
+                            "tag": row.tag,
+                            "expected_answer": row.expected_answer,
+                            "agent_response": row.agent_response,
+                            "grade": row.grade or "not_graded",
+                            "execution_time_seconds": row.execution_time_seconds,
+                            "tool_calls": row.tool_calls,
+                            "usage": row.usage,
+                        }
+                    )
+                    chunk.append(item if first else ", " + item)
+                    size += len(item)
+                    first = False
+                if size >= _EXPORT_CHUNK_BYTES:
+                    yield "".join(chunk).encode()
+                    chunk = []
+                    size = 0
+            chunk.append("]}")
+            yield "".join(chunk).encode()
+    yield b"]}"
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerows(rows)
+
+@router.get("/csv")
+async def export_csv(run_ids: str = Query(...), db: AsyncSession = Depends(get_db)):
+    ctx = get_request_context()
+    await require_permission(db, ctx, "exports.read")
+    runs = await _load_runs(db, _parse_run_ids(run_ids), ctx)
+    # get_db's teardown only runs after the body has streamed; release the
+    # connection now since the stream reads through its own session.
+    await db.close()
 
     return StreamingResponse(
-        io.BytesIO(output.getvalue().encode()),
+        _stream_csv(runs),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=benchmark_export.csv"},
     )
@@ -132,56 +219,65 @@ async def export_csv(run_ids: str = Query(...), db: AsyncSession = Depends(get_d
 async def export_json(run_ids: str = Query(...), db: AsyncSession = Depends(get_db)):
     ctx = get_request_context()
     await require_permission(db, ctx, "exports.read")
-    ids = [int(x.strip()) for x in run_ids.split(",") if x.strip()]
-    if not ids:
-        raise HTTPException(400, "At least 1 run ID required")
-
-    data = {"runs": []}
-    for rid in ids:
-        run_stmt = apply_workspace_filter(select(Run).where(Run.id == rid), Run, ctx)
-        run = (await db.execute(run_stmt)).scalar_one_or_none()
-        if not run:
-            continue
-        results = (
-            (
-                await db.execute(
-                    apply_workspace_filter(
-                        select(Result)
-                        .where(Result.run_id == rid)
-                        .options(selectinload(Result.query), selectinload(Result.grade))
-                        .order_by(Result.query_id),
-                        Result,
-                        ctx,
-                    )
-                )
-            )
-            .scalars()
-            .all()
-        )
-
-        run_data = {
-            "id": run.id,
-            "label": run.label,
-            "status": run.status,
-            "results": [
-                {
-                    "query_id": r.query_id,
-                    "query_text": r.query.query_text,
-                    "tag": r.query.tag,
-                    "expected_answer": r.query.expected_answer,
-                    "agent_response": r.agent_response,
-                    "grade": r.grade.grade if r.grade else "not_graded",
-                    "execution_time_seconds": r.execution_time_seconds,
-                    "tool_calls": r.tool_calls,
-                    "usage": r.usage,
-                }
-                for r in results
-            ],
-        }
-        data["runs"].append(run_data)
+    runs = await _load_runs(db, _parse_run_ids(run_ids), ctx)
+    # get_db's teardown only runs after the body has streamed; release the
+    # connection now since the stream reads through its own session.
+    await db.close()
 
     return StreamingResponse(
-        io.BytesIO(json.dumps(data, indent=2).encode()),
+        _stream_json(runs),
         media_type="application/json",
         headers={"Content-Disposition": "attachment; filename=benchmark_export.json"},
     )
+
+
+async def _columnar_response(
+    run_ids: str,
+    db: AsyncSession,
+    fmt: str,
+    include_text: bool,
+    include_tool_calls: bool,
+) -> StreamingResponse:
+    ctx = get_request_context()
+    await require_permission(db, ctx, "exports.read")
+    runs = await _load_runs(db, _parse_run_ids(run_ids), ctx)
+    # As for CSV/JSON: the export reads through its own session
+    await db.close()
+    if not pyarrow_available():
+        raise HTTPException(501, "Columnar export requires pyarrow (pip install axiom[export])")
+
+    if fmt == "parquet":
+        media_type, filename = "application/vnd.apache.parquet", "benchmark_export.parquet"
+    else:
+        media_type, filename = "application/vnd.apache.arrow.stream", "benchmark_export.arrows"
+    return StreamingResponse(
+        stream_columnar_export(
+            [run.id for run in runs], fmt, include_text, include_tool_calls
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+@router.get("/parquet")
+async def export_parquet(
+    run_ids: str = Query(...),
+    include_text: bool = Query(False),
+    include_tool_calls: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+):
+    return await _columnar_response(
+        run_ids, db, "parquet", include_text, include_tool_calls
+    )
+
+
+@router.get("/arrow")
+async def export_arrow(
+    run_ids: str = Query(...),
+    include_text: bool = Query(False),
+    include_tool_calls: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+):
+    return await _columnar_response(
+        run_ids, db, "arrow", include_text, include_tool_calls
+    )
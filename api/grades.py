@@ -9,8 +9,10 @@ from sqlalchemy.orm import selectinload
 
 from database import get_db
 from models.grade import Grade
+from models.query import Query
 from models.result import Result
 from schemas.schemas import GradeCreate, GradeOut
+from services.analytics import apply_grade_changes
 from services.db_utils import get_or_404
 from services.context import get_request_context
 from services.permissions import require_permission
@@ -31,6 +33,12 @@ async def upsert_grade(
 
     stmt = select(Grade).where(Grade.result_id == result_id)
     existing = (await db.execute(stmt)).scalar_one_or_none()
+    tag = (
+        await db.execute(select(Query.tag).where(Query.id == result.query_id))
+    ).scalar_one_or_none()
+    await apply_grade_changes(
+        db, result.run_id, [(tag, existing.grade if existing else None, body.grade)]
+    )
 
     if existing:
         existing.grade = body.grade
@@ -57,6 +65,7 @@ async def import_grades_csv(
 
     mapping is a JSON string: {"query_text": "col", "grade": "col", "notes": "col"|null}
     """
+    ctx = get_request_context()
     try:
         col_map = json.loads(mapping)
     except json.JSONDecodeError:
@@ -98,6 +107,7 @@ async def import_grades_csv(
     imported = 0
     skipped = 0
     errors: list[dict] = []
+    grade_changes: list[tuple[str | None, str | None, str | None]] = []
 
     for i, row in enumerate(reader, start=2):  # row 1 is header
         query_text = row.get(col_map["query_text"], "").strip()
@@ -121,15 +131,20 @@ async def import_grades_csv(
             continue
 
         # Upsert grade
+        grade_changes.append(
+            (result.query.tag, result.grade.grade if result.grade else None, grade_val)
+        )
         if result.grade:
             result.grade.grade = grade_val
             result.grade.notes = notes_val or result.grade.notes
         else:
             g = Grade(result_id=result.id, grade=grade_val, notes=notes_val or None)
             db.add(g)
+            result.grade = g
 
         imported += 1
 
+    await apply_grade_changes(db, run_id, grade_changes)
     await db.commit()
     return {"imported": imported, "skipped": skipped, "errors": errors}
     ctx = get_request_context()
@@ -10,12 +10,26 @@ from executors.registry import get_executor
 from models.grade import Grade
 from models.query import Query
 from models.result import Result
+from models.result_payload import ResultPayload
 from models.run import Run
 from models.trace_log import TraceLog
+from models.trace_payload import TracePayload
 from schemas.schemas import ResultListOut, ResultOut
+from services.analytics import apply_grade_changes
+from services.analytics_snapshots import invalidate_run_analytics
 from services.db_utils import get_or_404
+from services.openai_pricing import calculate_cost, set_cost_columns
 from services.context import get_request_context
+from services.pagination import (
+    blank_deferred,
+    defer_columns,
+    finish_page,
+    page_size,
+    paginate,
+    parse_exclude,
+)
 from services.permissions import require_permission
+from services.rate_limits import governed_execute
 from services.tenancy import apply_workspace_filter
 
 router = APIRouter()
@@ -40,10 +54,23 @@ async def _load_result_with_context(result_id: int, db: AsyncSession) -> Result
     return (await db.execute(stmt)).scalar_one_or_none()
 
 
+# Heavy columns list views may leave out (``exclude=``)
+_EXCLUDABLE_RESULT_FIELDS = ("agent_response", "tool_calls", "reasoning", "usage")
+
+
 @router.get("", response_model=list[ResultOut])
-async def list_results(run_id: int, db: AsyncSession = Depends(get_db)):
+async def list_results(
+    run_id: int,
+    response: Response,
+    limit: int | None = None,
+    cursor: str | None = None,
+    exclude: str | None = None,
+    db: AsyncSession = Depends(get_db),
+):
     ctx = get_request_context()
     await require_permission(db, ctx, "results.read")
+    q = page_size(limit)
+    excluded = parse_exclude(exclude, _EXCLUDABLE_RESULT_FIELDS)
     stmt = (
         select(Result)
         .where(Result.run_id == run_id)
@@ -51,7 +78,25 @@ async def list_results(run_id: int, db: AsyncSession = Depends(get_db)):
         .order_by(Result.query_id.asc(), Result.version_number.asc(), Result.created_at.asc())
     )
     stmt = apply_workspace_filter(stmt, Result, ctx)
+    if q is not None or cursor:
+        # Pages are taken over base results in creation order; each page then
+        # loads the versions of just those bases.
+        base_stmt = apply_workspace_filter(
+            select(Result.id, Result.created_at).where(
+                Result.run_id == run_id, Result.parent_result_id.is_(None)
+            ),
+            Result,
+            ctx,
+        )
+        base_stmt = paginate(base_stmt, Result, cursor, q, descending=False)
+        bases = finish_page((await db.execute(base_stmt)).all(), q, response)
+        base_ids = [row.id for row in bases]
+        stmt = stmt.where(
+            or_(Result.id.in_(base_ids), Result.parent_result_id.in_(base_ids))
+        )
+    stmt = defer_columns(stmt, Result, excluded)
     rows = (await db.execute(stmt)).scalars().all()
+    blank_deferred(rows, excluded)
     by_base: dict[int, list[Result]] = {}
     for row in rows:
         base_id = _base_result_id(row)
@@ -79,7 +124,11 @@ async def list_results_with_families(run_id: int, db: AsyncSession = Depends(get
     stmt = (
         select(Result)
         .where(Result.run_id == run_id)
-        .options(selectinload(Result.grade), selectinload(Result.query))
+        .options(
+            selectinload(Result.grade),
+            selectinload(Result.query),
+            selectinload(Result.payload),
+        )
         .order_by(Result.query_id.asc(), Result.version_number.asc(), Result.created_at.asc())
     )
     stmt = apply_workspace_filter(stmt, Result, ctx)
@@ -114,7 +163,11 @@ async def get_result(result_id: int, db: AsyncSession = Depends(get_db)):
     stmt = (
         select(Result)
         .where(Result.id == result_id)
-        .options(selectinload(Result.grade), selectinload(Result.query))
+        .options(
+            selectinload(Result.grade),
+            selectinload(Result.query),
+            selectinload(Result.payload),
+        )
     )
     stmt = apply_workspace_filter(stmt, Result, ctx)
     result = await db.execute(stmt)
@@ -154,6 +207,17 @@ async def retry_result(result_id: int, db: AsyncSession = Depends(get_db)):
     }
 
     started_at = datetime.now(timezone.utc)
+    # Kept by reference: the refresh below unloads trace.payload
+    trace_payload = TracePayload(
+        request_payload={
+            "query": query.query_text,
+            "model": agent.model,
+            "system_prompt": agent.system_prompt,
+            "tools_config": agent.tools_config,
+            "model_settings": agent.model_settings,
+            "source_result_id": base.id,
+        }
+    )
     trace = TraceLog(
         organization_id=base.organization_id,
         project_id=base.project_id,
@@ -167,33 +231,37 @@ async def retry_result(result_id: int, db: AsyncSession = Depends(get_db)):
         model=agent.model,
         status="started",
         started_at=started_at,
-        request_payload={
-            "query": query.query_text,
-            "model": agent.model,
-            "system_prompt": agent.system_prompt,
-            "tools_config": agent.tools_config,
-            "model_settings": agent.model_settings,
-            "source_result_id": base.id,
-        },
+        payload=trace_payload,
     )
     db.add(trace)
     await db.flush()
     await db.commit()
     await db.refresh(trace)
 
-    exec_result = await executor.execute(query.query_text, exec_config)
+    exec_result = await governed_execute(
+        executor,
+        query.query_text,
+        exec_config,
+        organization_id=base.organization_id,
+        # A retry asks for a fresh answer; it still refreshes the cache
+        use_cache=False,
+    )
     completed_at = datetime.now(timezone.utc)
     latency_ms = int((completed_at - started_at).total_seconds() * 1000)
-    trace.response_payload = {
+    trace_payload.response_payload = {
         "response": exec_result.response,
         "tool_calls": exec_result.tool_calls,
         "reasoning": exec_result.reasoning,
+        "cache_hit": exec_result.cache_hit,
     }
     trace.usage = exec_result.usage or None
     trace.error = exec_result.error
     trace.status = "failed" if exec_result.error else "completed"
     trace.completed_at = completed_at
     trace.latency_ms = latency_ms
+    trace.attempts = exec_result.attempts
+    breakdown = calculate_cost(agent.model or "", exec_result.usage, exec_result.tool_calls)
+    set_cost_columns(trace, breakdown)
 
     max_stmt = select(func.max(Result.version_number)).where(
         or_(Result.id == base.id, Result.parent_result_id == base.id)
@@ -211,16 +279,21 @@ async def retry_result(result_id: int, db: AsyncSession = Depends(get_db)):
         is_default_version=False,
         version_status="active",
         trace_log_id=trace.id,
-        agent_response=exec_result.response if not exec_result.error else None,
-        tool_calls=exec_result.tool_calls or None,
-        reasoning=exec_result.reasoning or None,
+        payload=ResultPayload(
+            agent_response=exec_result.response if not exec_result.error else None,
+            tool_calls=exec_result.tool_calls or None,
+            reasoning=exec_result.reasoning or None,
+        ),
         usage=exec_result.usage or None,
         execution_time_seconds=exec_result.execution_time_seconds,
         error=exec_result.error,
     )
+    set_cost_columns(new_version, breakdown)
     db.add(new_version)
+    await invalidate_run_analytics(db, base.run_id)
     await db.commit()
     await db.refresh(new_version)
+    await db.refresh(new_version, ["payload"])
     return ResultOut.model_validate(new_version)
 
 
@@ -251,9 +324,16 @@ async def accept_result_version(
         item.is_default_version = item.id == target.id
 
     family_ids = [item.id for item in family]
+    dropped = (
+        await db.execute(select(Grade.grade).where(Grade.result_id.in_(family_ids)))
+    ).scalars().all()
+    await apply_grade_changes(
+        db, base.run_id, [(base.query.tag if base.query else None, g, None) for g in dropped]
+    )
     await db.execute(delete(Grade).where(Grade.result_id.in_(family_ids)))
     await db.commit()
     await db.refresh(target)
+    await db.refresh(target, ["payload"])
     return ResultOut.model_validate(target)
 
 
@@ -280,5 +360,6 @@ async def delete_result_version(
         raise HTTPException(400, "Default/base version cannot be ignored")
 
     await db.delete(version)
+    await invalidate_run_analytics(db, base.run_id)
     await db.commit()
     return Response(status_code=204)
@@ -6,9 +6,9 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -18,12 +18,16 @@ from executors.registry import get_executor
 from models.agent import AgentConfig
 from models.query import Query
 from models.result import Result
+from models.result_payload import ResultPayload
 from models.run import Run
 from models.app_notification import AppNotification
 from models.run_cost_preview import RunCostPreview
+from models.run_job import RunJob
 from models.suite import BenchmarkSuite
 from models.trace_log import TraceLog
+from models.trace_payload import TracePayload
 from schemas.schemas import (
+    RateLimitScopeOut,
     RunningJobItem,
     RunningJobsOut,
     RunCostPreviewOut,
@@ -32,11 +36,22 @@ from schemas.schemas import (
     RunDetailOut,
     RunOut,
 )
-from services.openai_pricing import calculate_cost, load_pricing
+from services.openai_pricing import (
+    batch_cost_columns,
+    calculate_cost,
+    calculate_costs,
+    load_pricing,
+    set_cost_columns,
+)
 from services.db_utils import get_or_404
 from services.context import get_request_context
+from services.pagination import finish_page, page_size, paginate
 from services.permissions import require_permission
+from services.rate_limits import governed_execute, governor
 from services.tenancy import apply_workspace_filter, assign_workspace_fields
+from workers.queue import enqueue_run_job
+from workers.result_writer import save_result_json
+from workers.sse_bus import preview_topic, publish_notification, sse_bus
 
 router = APIRouter()
 
@@ -88,6 +103,8 @@ async def _create_runs(
     query_ids: list[int],
     query_count: int,
     db: AsyncSession,
+    preview: RunCostPreview | None = None,
+    queries: list[Query] | None = None,
 ) -> list[Run]:
     ctx = get_request_context()
     repeat = max(1, body.repeat)
@@ -119,15 +136,106 @@ async def _create_runs(
         )
         assign_workspace_fields(run, ctx)
         db.add(run)
+        await db.flush()
+        if preview is not None and run_num == 1:
+            # Seed before enqueueing so the worker's checkpoint skips them
+            await _seed_run_from_preview(db, run, preview, queries or [])
+        enqueue_run_job(
+            db, run_id=run.id, query_ids=query_ids, batch_size=body.batch_size
+        )
         await db.commit()
         await db.refresh(run)
         created_runs.append(run)
-        task = asyncio.create_task(_start_run_job(run.id, query_ids, body.batch_size))
-        task.add_done_callback(_task_done_callback)
 
     return created_runs
 
 
+async def _seed_run_from_preview(
+    db: AsyncSession,
+    run: Run,
+    preview: RunCostPreview,
+    queries: list[Query],
+) -> int:
+    """Turn a preview's successful sample executions into results of ``run``.
+
+    Samples are only reused if the agent config is unchanged since the
+    preview; their traces are attached to the run. Returns the number of
+    seeded results.
+    """
+    usage = preview.sample_usage if isinstance(preview.sample_usage, dict) else {}
+    trace_ids = [
+        e["trace_log_id"]
+        for e in usage.get("per_query_costs") or []
+        if e.get("trace_log_id") and not e.get("error")
+    ]
+    if not trace_ids:
+        return 0
+
+    agent = await db.get(AgentConfig, run.agent_config_id)
+    current_config = {
+        "system_prompt": agent.system_prompt,
+        "model": agent.model,
+        "tools_config": agent.tools_config,
+        "model_settings": agent.model_settings,
+    }
+    queries_by_id = {q.id: q for q in queries}
+    stmt = select(TraceLog).where(
+        TraceLog.id.in_(trace_ids),
+        TraceLog.run_id.is_(None),
+        TraceLog.trace_type == "preview",
+        TraceLog.status == "completed",
+        TraceLog.agent_config_id == run.agent_config_id,
+    ).options(selectinload(TraceLog.payload))
+    traces = (await db.execute(stmt)).scalars().all()
+
+    json_dir = Path(run.output_dir) / "json" if run.output_dir else None
+    seeded = 0
+    for trace in traces:
+        query = queries_by_id.get(trace.query_id)
+        request = trace.request_payload or {}
+        if query is None or any(request.get(k) != v for k, v in current_config.items()):
+            continue
+        response = trace.response_payload or {}
+        result = Result(
+            organization_id=run.organization_id,
+            project_id=run.project_id,
+            created_by_user_id=run.created_by_user_id,
+            visibility_scope=run.visibility_scope,
+            run_id=run.id,
+            query_id=query.id,
+            trace_log_id=trace.id,
+            payload=ResultPayload(
+                agent_response=response.get("response"),
+                tool_calls=response.get("tool_calls") or None,
+                reasoning=response.get("reasoning") or None,
+            ),
+            usage=trace.usage,
+            execution_time_seconds=(trace.latency_ms or 0) / 1000,
+        )
+        set_cost_columns(
+            result, calculate_cost(trace.model or "", trace.usage, result.tool_calls)
+        )
+        db.add(result)
+        trace.run_id = run.id
+        seeded += 1
+        if json_dir:
+            json_dir.mkdir(parents=True, exist_ok=True)
+            save_result_json(
+                json_dir / f"{query.ordinal}.json",
+                query,
+                {
+                    "agent_response": result.agent_response,
+                    "tool_calls": result.tool_calls,
+                    "reasoning": result.reasoning,
+                    "usage": result.usage,
+                    "execution_time_seconds": result.execution_time_seconds,
+                },
+            )
+
+    run.progress_current = seeded
+    return seeded
+
+
 async def _build_preview(
     body: RunCreate, db: AsyncSession, preview: RunCostPreview | None = None
 ) -> RunCostPreviewOut:
@@ -154,7 +262,12 @@ async def _build_preview(
     async def _run_sample(query: Query):
         started_at = datetime.now(timezone.utc)
         try:
-            exec_result = await executor.execute(query.query_text, exec_config)
+            exec_result = await governed_execute(
+                executor,
+                query.query_text,
+                exec_config,
+                organization_id=ctx.organization_id,
+            )
             return exec_result, started_at, datetime.now(timezone.utc)
         except Exception as exc:
             return exc, started_at, datetime.now(timezone.utc)
@@ -180,6 +293,7 @@ async def _build_preview(
         "total_usd": 0.0,
     }
     per_query_costs: list[dict] = []
+    sample_traces: list[tuple[dict, TraceLog]] = []
     missing_pricing = False
 
     for q, result_item in zip(sampled_queries, sample_results):
@@ -203,33 +317,36 @@ async def _build_preview(
                 started_at=started_at,
                 completed_at=completed_at,
                 latency_ms=latency_ms,
-                request_payload={
-                    "query": q.query_text,
-                    "system_prompt": exec_config.get("system_prompt"),
-                    "model": exec_config.get("model"),
-                    "tools_config": exec_config.get("tools_config"),
-                    "model_settings": exec_config.get("model_settings"),
-                    "mode": "cost_preview",
-                },
+                payload=TracePayload(
+                    request_payload={
+                        "query": q.query_text,
+                        "system_prompt": exec_config.get("system_prompt"),
+                        "model": exec_config.get("model"),
+                        "tools_config": exec_config.get("tools_config"),
+                        "model_settings": exec_config.get("model_settings"),
+                        "mode": "cost_preview",
+                    }
+                ),
                 error=str(item),
             )
+            set_cost_columns(trace, calculate_cost(agent.model or "", None, None))
             db.add(trace)
-            per_query_costs.append(
-                {
-                    "query_id": q.id,
-                    "ordinal": q.ordinal,
-                    "error": str(item),
-                    "usage": {},
-                    "cost": {
-                        "input_cost_usd": 0.0,
-                        "cached_input_cost_usd": 0.0,
-                        "output_cost_usd": 0.0,
-                        "reasoning_output_cost_usd": 0.0,
-                        "web_search_cost_usd": 0.0,
-                        "total_usd": 0.0,
-                    },
-                }
-            )
+            entry = {
+                "query_id": q.id,
+                "ordinal": q.ordinal,
+                "error": str(item),
+                "usage": {},
+                "cost": {
+                    "input_cost_usd": 0.0,
+                    "cached_input_cost_usd": 0.0,
+                    "output_cost_usd": 0.0,
+                    "reasoning_output_cost_usd": 0.0,
+                    "web_search_cost_usd": 0.0,
+                    "total_usd": 0.0,
+                },
+            }
+            per_query_costs.append(entry)
+            sample_traces.append((entry, trace))
             continue
 
         usage = item.usage or {}
@@ -251,24 +368,23 @@ async def _build_preview(
         )
         aggregate_cost["web_search_cost_usd"] += breakdown.web_search_cost_usd
         aggregate_cost["total_usd"] += breakdown.total_usd
-        per_query_costs.append(
-            {
-                "query_id": q.id,
-                "ordinal": q.ordinal,
-                "error": item.error,
-                "usage": breakdown.usage,
-                "cost": {
-                    "input_cost_usd": breakdown.input_cost_usd,
-                    "cached_input_cost_usd": breakdown.cached_input_cost_usd,
-                    "output_cost_usd": breakdown.output_cost_usd,
-                    "reasoning_output_cost_usd": breakdown.reasoning_output_cost_usd,
-                    "web_search_cost_usd": breakdown.web_search_cost_usd,
-                    "total_usd": breakdown.total_usd,
-                },
-                "web_search_calls": breakdown.web_search_calls,
-                "model_key": breakdown.model_key,
-            }
-        )
+        entry = {
+            "query_id": q.id,
+            "ordinal": q.ordinal,
+            "error": item.error,
+            "usage": breakdown.usage,
+            "cost": {
+                "input_cost_usd": breakdown.input_cost_usd,
+                "cached_input_cost_usd": breakdown.cached_input_cost_usd,
+                "output_cost_usd": breakdown.output_cost_usd,
+                "reasoning_output_cost_usd": breakdown.reasoning_output_cost_usd,
+                "web_search_cost_usd": breakdown.web_search_cost_usd,
+                "total_usd": breakdown.total_usd,
+            },
+            "web_search_calls": breakdown.web_search_calls,
+            "model_key": breakdown.model_key,
+        }
+        per_query_costs.append(entry)
         trace = TraceLog(
             organization_id=ctx.organization_id,
             project_id=ctx.project_id,
@@ -284,23 +400,34 @@ async def _build_preview(
             started_at=started_at,
             completed_at=completed_at,
             latency_ms=latency_ms,
-            request_payload={
-                "query": q.query_text,
-                "system_prompt": exec_config.get("system_prompt"),
-                "model": exec_config.get("model"),
-                "tools_config": exec_config.get("tools_config"),
-                "model_settings": exec_config.get("model_settings"),
-                "mode": "cost_preview",
-            },
-            response_payload={
-                "response": item.response,
-                "tool_calls": item.tool_calls,
-                "reasoning": item.reasoning,
-            },
+            payload=TracePayload(
+                request_payload={
+                    "query": q.query_text,
+                    "system_prompt": exec_config.get("system_prompt"),
+                    "model": exec_config.get("model"),
+                    "tools_config": exec_config.get("tools_config"),
+                    "model_settings": exec_config.get("model_settings"),
+                    "mode": "cost_preview",
+                },
+                response_payload={
+                    "response": item.response,
+                    "tool_calls": item.tool_calls,
+                    "reasoning": item.reasoning,
+                    "cache_hit": item.cache_hit,
+                },
+            ),
             usage=item.usage or None,
             error=item.error,
+            attempts=item.attempts,
         )
+        set_cost_columns(trace, breakdown)
         db.add(trace)
+        sample_traces.append((entry, trace))
+
+    # Link each sample to its trace so an approved preview can reuse it
+    await db.flush()
+    for entry, trace in sample_traces:
+        entry["trace_log_id"] = trace.id
 
     sample_cost_usd = round(aggregate_cost["total_usd"], 6)
     estimated_total_calls = len(queries) * max(1, body.repeat)
@@ -390,18 +517,35 @@ async def _create_notification(
     message: str,
     related_id: int | None = None,
 ):
-    db.add(
-        AppNotification(
-            organization_id=organization_id,
-            project_id=project_id,
-            user_id=user_id,
-            notif_type=notif_type,
-            title=title,
-            message=message,
-            related_id=related_id,
-        )
+    notification = AppNotification(
+        organization_id=organization_id,
+        project_id=project_id,
+        user_id=user_id,
+        notif_type=notif_type,
+        title=title,
+        message=message,
+        related_id=related_id,
     )
+    db.add(notification)
     await db.commit()
+    await publish_notification(notification)
+
+
+async def _publish_preview_status(preview: RunCostPreview):
+    await sse_bus.publish_topic(
+        preview_topic(preview.organization_id),
+        "preview",
+        {
+            "id": preview.id,
+            "project_id": preview.project_id,
+            "visibility_scope": preview.visibility_scope,
+            "label": preview.label,
+            "status": preview.status,
+            "error_message": preview.error_message,
+            "sample_cost_usd": preview.sample_cost_usd,
+            "estimated_total_cost_usd": preview.estimated_total_cost_usd,
+        },
+    )
 
 
 async def _start_cost_preview_job(preview_id: int, mark_running: bool = True):
@@ -413,6 +557,7 @@ async def _start_cost_preview_job(preview_id: int, mark_running: bool = True):
             preview.status = "running"
             preview.started_at = datetime.now(timezone.utc)
             await db.commit()
+            await _publish_preview_status(preview)
 
         body = RunCreate(
             suite_id=preview.suite_id,
@@ -427,6 +572,7 @@ async def _start_cost_preview_job(preview_id: int, mark_running: bool = True):
         )
         try:
             await _build_preview(body, db, preview=preview)
+            await _publish_preview_status(preview)
             await _create_notification(
                 db,
                 organization_id=preview.organization_id,
@@ -441,6 +587,7 @@ async def _start_cost_preview_job(preview_id: int, mark_running: bool = True):
             preview.error_message = str(exc)
             preview.completed_at = datetime.now(timezone.utc)
             await db.commit()
+            await _publish_preview_status(preview)
             await _create_notification(
                 db,
                 organization_id=preview.organization_id,
@@ -493,6 +640,7 @@ async def _enqueue_pending_previews(db: AsyncSession):
         p.started_at = p.started_at or now
     await db.commit()
     for p in pending:
+        await _publish_preview_status(p)
         task = asyncio.create_task(_start_cost_preview_job(p.id, mark_running=False))
         task.add_done_callback(_task_done_callback)
 
@@ -545,21 +693,31 @@ def _preview_record_out(
 
 
 @router.get("", response_model=list[RunDetailOut])
-async def list_runs(tag: str | None = None, db: AsyncSession = Depends(get_db)):
+async def list_runs(
+    response: Response,
+    tag: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_db),
+):
     ctx = get_request_context()
     await require_permission(db, ctx, "runs.read")
-    stmt = select(Run).options(selectinload(Run.suite), selectinload(Run.agent_config))
+    q = page_size(limit)
+    # Only the suite and agent names are needed, not the full related rows
+    stmt = (
+        select(Run, BenchmarkSuite.name, AgentConfig.name)
+        .outerjoin(BenchmarkSuite, BenchmarkSuite.id == Run.suite_id)
+        .outerjoin(AgentConfig, AgentConfig.id == Run.agent_config_id)
+    )
     stmt = apply_workspace_filter(stmt, Run, ctx)
     if tag:
         stmt = stmt.where(Run.tags.overlap([tag]))
-    stmt = stmt.order_by(Run.created_at.desc())
-    result = await db.execute(stmt)
-    runs = result.scalars().all()
+    rows = (await db.execute(paginate(stmt, Run, cursor, q))).all()
     out = []
-    for r in runs:
+    for r, suite_name, agent_name in finish_page(rows, q, response, lambda row: row[0]):
         d = RunDetailOut.model_validate(r)
-        d.suite_name = r.suite.name if r.suite else ""
-        d.agent_name = r.agent_config.name if r.agent_config else ""
+        d.suite_name = suite_name or ""
+        d.agent_name = agent_name or ""
         out.append(d)
     return out
 
@@ -636,6 +794,17 @@ async def list_running_jobs(db: AsyncSession = Depends(get_db)):
     )
 
 
+@router.get("/rate-limits", response_model=list[RateLimitScopeOut])
+async def list_rate_limits(db: AsyncSession = Depends(get_db)):
+    """Live utilization of the execution governor in this API process."""
+    ctx = get_request_context()
+    await require_permission(db, ctx, "runs.read")
+    return [
+        RateLimitScopeOut(**item)
+        for item in governor.snapshot(organization_id=ctx.organization_id)
+    ]
+
+
 @router.post("", response_model=list[RunOut], status_code=201)
 async def create_run(body: RunCreate, db: AsyncSession = Depends(get_db)):
     ctx = get_request_context()
@@ -828,7 +997,12 @@ async def approve_preview_and_start(
             400, "Cost preview approvals are only valid for openai_agents executor"
         )
     created_runs = await _create_runs(
-        body=body, query_ids=query_ids, query_count=len(queries), db=db
+        body=body,
+        query_ids=query_ids,
+        query_count=len(queries),
+        db=db,
+        preview=preview,
+        queries=queries,
     )
     now = datetime.now(timezone.utc)
     preview.approved_at = now
@@ -846,12 +1020,6 @@ def _task_done_callback(task: asyncio.Task):
         _run_logger.opt(exception=exc).error("Background run task failed")
 
 
-async def _start_run_job(run_id: int, query_ids: list[int], batch_size: int):
-    from workers.runner import execute_run
-
-    await execute_run(run_id, query_ids, batch_size)
-
-
 @router.get("/group/{run_group}", response_model=list[RunDetailOut])
 async def list_group_runs(run_group: str, db: AsyncSession = Depends(get_db)):
     ctx = get_request_context()
@@ -964,6 +1132,83 @@ async def cancel_run(run_id: int, db: AsyncSession = Depends(get_db)):
     return RunOut.model_validate(run)
 
 
+@router.post("/{run_id}/resume", response_model=RunOut)
+async def resume_run(
+    run_id: int, retry_errors: bool = True, db: AsyncSession = Depends(get_db)
+):
+    """Re-queue a stopped run, executing only queries without a result.
+
+    With ``retry_errors`` (default), result families whose default version
+    errored are discarded first so those queries run again. Their traces are
+    kept.
+    """
+    ctx = get_request_context()
+    await require_permission(db, ctx, "runs.execute")
+    run = await get_or_404(db, Run, run_id, "Run")
+    if run.status in ("pending", "running"):
+        raise HTTPException(400, "Run is already in progress")
+
+    first_job_stmt = (
+        select(RunJob.query_ids)
+        .where(RunJob.run_id == run.id)
+        .order_by(RunJob.id.asc())
+        .limit(1)
+    )
+    query_ids = (await db.execute(first_job_stmt)).scalar_one_or_none()
+    if query_ids is None:
+        # Runs created before the job queue existed only record a total
+        suite_query_ids = (
+            (await db.execute(select(Query.id).where(Query.suite_id == run.suite_id)))
+            .scalars()
+            .all()
+        )
+        if len(suite_query_ids) != run.progress_total:
+            raise HTTPException(400, "Run has no recorded query set to resume")
+        query_ids = list(suite_query_ids)
+
+    rows = (
+        await db.execute(
+            select(
+                Result.id,
+                Result.query_id,
+                Result.parent_result_id,
+                Result.is_default_version,
+                Result.error,
+            ).where(Result.run_id == run.id)
+        )
+    ).all()
+    families: dict[int, list] = {}
+    for row in rows:
+        families.setdefault(row.parent_result_id or row.id, []).append(row)
+
+    done_query_ids: set[int] = set()
+    errored_base_ids: list[int] = []
+    for base_id, versions in families.items():
+        default = next((v for v in versions if v.is_default_version), None)
+        if default is None:
+            default = max(versions, key=lambda v: v.id)
+        if retry_errors and default.error:
+            errored_base_ids.append(base_id)
+        else:
+            done_query_ids.add(default.query_id)
+
+    remaining = [qid for qid in query_ids if qid not in done_query_ids]
+    if not remaining:
+        raise HTTPException(400, "Run has no missing or errored queries")
+
+    if errored_base_ids:
+        await db.execute(delete(Result).where(Result.id.in_(errored_base_ids)))
+
+    run.status = "pending"
+    run.error_message = None
+    run.completed_at = None
+    run.progress_current = len(done_query_ids)
+    enqueue_run_job(db, run_id=run.id, query_ids=remaining, batch_size=run.batch_size)
+    await db.commit()
+    await db.refresh(run)
+    return RunOut.model_validate(run)
+
+
 @router.delete("/{run_id}", status_code=204)
 async def delete_run(
     run_id: int, delete_data: bool = False, db: AsyncSession = Depends(get_db)
@@ -1011,7 +1256,8 @@ async def import_run(body: RunImport, db: AsyncSession = Depends(get_db)):
         AgentConfig,
         ctx,
     )
-    if (await db.execute(agent_stmt)).scalar_one_or_none() is None:
+    agent = (await db.execute(agent_stmt)).scalar_one_or_none()
+    if agent is None:
         raise HTTPException(404, "Agent config not found")
 
     json_dir = Path(body.json_dir).expanduser()
@@ -1058,7 +1304,7 @@ async def import_run(body: RunImport, db: AsyncSession = Depends(get_db)):
     await db.refresh(run)
 
     # Import each JSON file as a result
-    imported = 0
+    imported_results: list[Result] = []
     for jf in json_files:
         try:
             data = json_mod.loads(jf.read_text())
@@ -1081,15 +1327,28 @@ async def import_run(body: RunImport, db: AsyncSession = Depends(get_db)):
             visibility_scope=run.visibility_scope,
             run_id=run.id,
             query_id=query.id,
-            agent_response=data.get("agent_response") or None,
-            tool_calls=data.get("tool_calls") or None,
-            reasoning=data.get("reasoning") or None,
+            payload=ResultPayload(
+                agent_response=data.get("agent_response") or None,
+                tool_calls=data.get("tool_calls") or None,
+                reasoning=data.get("reasoning") or None,
+            ),
             usage=data.get("usage") or None,
             execution_time_seconds=data.get("execution_time_seconds", 0),
             error=data.get("error") or None,
         )
         db.add(result)
-        imported += 1
+        imported_results.append(result)
+
+    # Price everything imported in one batch
+    batch = calculate_costs(
+        agent.model or "",
+        [result.usage for result in imported_results],
+        [result.tool_calls for result in imported_results],
+    )
+    for result, costs in zip(imported_results, batch_cost_columns(batch)):
+        for key, value in costs.items():
+            setattr(result, key, value)
+    imported = len(imported_results)
 
     await db.commit()
 
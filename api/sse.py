@@ -1,33 +1,95 @@
 import asyncio
+import json
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
 from sse_starlette.sse import EventSourceResponse
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import get_db
+from database import async_session, get_db
 from models.run import Run
+from schemas.schemas import SSEBusMetricsOut
 from services.context import get_request_context
 from services.db_utils import get_or_404
-from services.permissions import require_permission
-from workers.sse_bus import sse_bus
+from services.permissions import has_permission, require_permission
+from services.tenancy import apply_workspace_filter
+from workers.sse_bus import notification_topic, preview_topic, run_topic, sse_bus
 
 router = APIRouter()
 
 
+@router.get("/sse/metrics", response_model=SSEBusMetricsOut)
+async def sse_metrics(db: AsyncSession = Depends(get_db)):
+    """Subscriber queue depths and drop counters of the SSE bus in this process."""
+    ctx = get_request_context()
+    await require_permission(db, ctx, "runs.read")
+    return SSEBusMetricsOut(**sse_bus.metrics())
+
+
+def _run_snapshot(run: Run) -> dict:
+    return {
+        "status": run.status,
+        "current": run.progress_current,
+        "total": run.progress_total,
+        "error": run.error_message,
+    }
+
+
+def _sse_message(event: str, data: str, event_id: int | None) -> dict:
+    message = {"event": event, "data": data}
+    if event_id is not None:
+        message["id"] = str(event_id)
+    return message
+
+
 @router.get("/runs/{run_id}/stream")
-async def stream_run(run_id: int, db: AsyncSession = Depends(get_db)):
+async def stream_run(
+    run_id: int,
+    request: Request,
+    last_event_id: str | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream run events.
+
+    A reconnecting client (``Last-Event-ID`` header, or ``last_event_id``
+    query param) gets the events it missed replayed from the bus buffer.
+    Otherwise the stream starts with a compact "snapshot" of the run; events
+    published after that snapshot was read are replayed so none are missed.
+    The database session is closed before streaming starts.
+    """
     ctx = get_request_context()
     await require_permission(db, ctx, "runs.read")
-    await get_or_404(db, Run, run_id, "Run")
+    resume_from = request.headers.get("last-event-id") or last_event_id
+    # Read the buffer position before the run row: anything newer than the
+    # marker may not be reflected in the snapshot and is replayed after it.
+    marker = sse_bus.last_event_id(run_id)
+    run = await get_or_404(db, Run, run_id, "Run")
+    snapshot = _run_snapshot(run)
+    # get_db's teardown only runs once the response ends; don't pin a pooled
+    # connection for the lifetime of the stream.
+    await db.close()
 
     async def event_generator():
-        q = sse_bus.subscribe(run_id)
+        q = None
+        if resume_from:
+            q = sse_bus.subscribe(run_id, last_event_id=resume_from)
+            if not q.replayed:
+                sse_bus.unsubscribe(run_id, q)
+                q = None
+        if q is None:
+            yield _sse_message("snapshot", json.dumps(snapshot), marker)
+            if snapshot["status"] in ("completed", "failed", "cancelled"):
+                yield _sse_message("complete", json.dumps(snapshot), None)
+                return
+            q = sse_bus.subscribe(
+                run_id, last_event_id=marker, replay_buffered=marker is None
+            )
         try:
             while True:
                 try:
-                    event, data = await asyncio.wait_for(q.get(), timeout=30)
-                    yield {"event": event, "data": data}
-                    if event == "complete" or event == "error":
+                    event, data, event_id = await asyncio.wait_for(q.get(), timeout=30)
+                    yield _sse_message(event, data, event_id)
+                    if event in ("complete", "error", "evicted"):
                         break
                 except asyncio.TimeoutError:
                     yield {"event": "ping", "data": "{}"}
@@ -35,3 +97,134 @@ async def stream_run(run_id: int, db: AsyncSession = Depends(get_db)):
             sse_bus.unsubscribe(run_id, q)
 
     return EventSourceResponse(event_generator())
+
+
+async def _aggregate_snapshot(run_ids: list[int]) -> dict:
+    """Compact progress for every followed run plus totals, in one query."""
+    async with async_session() as db:
+        stmt = select(
+            Run.id,
+            Run.status,
+            Run.progress_current,
+            Run.progress_total,
+            Run.error_message,
+        ).where(Run.id.in_(run_ids))
+        rows = (await db.execute(stmt)).all()
+    runs = []
+    by_status: dict[str, int] = {}
+    current = total = 0
+    for row in rows:
+        runs.append(
+            {
+                "run_id": row.id,
+                "status": row.status,
+                "current": row.progress_current,
+                "total": row.progress_total,
+                "error": row.error_message,
+            }
+        )
+        by_status[row.status] = by_status.get(row.status, 0) + 1
+        current += row.progress_current
+        total += row.progress_total
+    return {
+        "runs": runs,
+        "totals": {"current": current, "total": total, "by_status": by_status},
+    }
+
+
+@router.get("/stream")
+async def stream_many(
+    run_ids: list[int] | None = Query(None),
+    run_group: str | None = None,
+    previews: bool = True,
+    notifications: bool = True,
+    snapshot_seconds: float = 5.0,
+    db: AsyncSession = Depends(get_db),
+):
+    """Multiplexed stream for many runs, cost previews and notifications.
+
+    Follows the given ``run_ids`` and/or every run of ``run_group``; with
+    neither, the workspace's pending and running runs. Each event's data is
+    ``{"source": "run"|"preview"|"notification"|"aggregate", "source_id",
+    "data"}``. An "aggregate" snapshot of all followed runs is sent on connect
+    and every ``snapshot_seconds``, replacing per-run polling. The request's
+    database session is closed once the followed runs are resolved; snapshots
+    read through their own short-lived sessions.
+    """
+    ctx = get_request_context()
+    await require_permission(db, ctx, "runs.read")
+
+    stmt = select(Run.id)
+    if run_ids:
+        stmt = stmt.where(Run.id.in_(run_ids))
+    if run_group:
+        stmt = stmt.where(Run.run_group == run_group)
+    if not run_ids and not run_group:
+        stmt = stmt.where(Run.status.in_(("pending", "running")))
+    stmt = apply_workspace_filter(stmt, Run, ctx)
+    followed = list((await db.execute(stmt)).scalars().all())
+
+    topics = {run_topic(run_id): ("run", run_id) for run_id in followed}
+    if previews:
+        topics[preview_topic(ctx.organization_id)] = ("preview", None)
+    if notifications and await has_permission(db, ctx, "notifications.read"):
+        topics[notification_topic(ctx.organization_id)] = ("notification", None)
+    # get_db's teardown only runs once the response ends; don't pin a pooled
+    # connection for the lifetime of the stream.
+    await db.close()
+    project_id = ctx.project_id
+    interval = max(1.0, snapshot_seconds)
+
+    def _tagged(source: str, source_id, event: str, data: str) -> dict:
+        return {
+            "event": event,
+            "data": f'{{"source":{json.dumps(source)},'
+            f'"source_id":{json.dumps(source_id)},"data":{data}}}',
+        }
+
+    def _visible(source: str, data: str) -> bool:
+        if source != "preview" or project_id is None:
+            return True
+        payload = json.loads(data)
+        return (
+            payload.get("project_id") == project_id
+            or payload.get("visibility_scope") == "organization"
+        )
+
+    async def event_generator():
+        q = sse_bus.subscribe_topics(list(topics))
+        loop = asyncio.get_running_loop()
+        try:
+            if followed:
+                snapshot = await _aggregate_snapshot(followed)
+                yield _tagged("aggregate", None, "snapshot", json.dumps(snapshot))
+            next_snapshot = loop.time() + interval
+            while True:
+                timeout = next_snapshot - loop.time()
+                if timeout <= 0:
+                    if followed:
+                        snapshot = await _aggregate_snapshot(followed)
+                        yield _tagged("aggregate", None, "snapshot", json.dumps(snapshot))
+                    else:
+                        yield {"event": "ping", "data": "{}"}
+                    next_snapshot = loop.time() + interval
+                    continue
+                try:
+                    topic, event, data, _ = await asyncio.wait_for(
+                        q.get_tagged(), timeout=timeout
+                    )
+                except asyncio.TimeoutError:
+                    continue
+                if event == "evicted":
+                    yield {"event": event, "data": data}
+                    break
+                source, source_id = topics.get(topic, ("run", None))
+                if not _visible(source, data):
+                    continue
+                if source_id is None and source != "run":
+                    source_id = json.loads(data).get("id")
+                yield _tagged(source, source_id, event, data)
+        finally:
+            sse_bus.unsubscribe_topics(q)
+
+    return EventSourceResponse(event_generator())
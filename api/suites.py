@@ -3,13 +3,14 @@ import io
 
 import json
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Response, UploadFile
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from database import get_db
 from models.query import Query as QueryModel
+from models.run import Run
 from models.suite import BenchmarkSuite
 from schemas.schemas import (
     QueryCreate,
@@ -22,32 +23,71 @@ from schemas.schemas import (
 from services.db_utils import get_or_404
 from services.context import get_request_context
 from services.permissions import require_permission
+from services.pagination import finish_page, page_size, paginate
 from services.tenancy import apply_workspace_filter, assign_workspace_fields
 
 router = APIRouter()
 
 
-@router.get("", response_model=list[SuiteOut])
-async def list_suites(tag: str | None = None, db: AsyncSession = Depends(get_db)):
-    ctx = get_request_context()
-    await require_permission(db, ctx, "datasets.read")
-    stmt = select(BenchmarkSuite)
+def _suite_list_stmt(ctx, tag: str | None = None):
+    """Suites with their query count, run count and last run, as one statement.
+
+    The counts are correlated subqueries that Postgres evaluates per suite row
+    from the ``queries.suite_id`` / ``runs.suite_id`` indexes, so a page costs
+    one round trip however many suites the project has.
+    """
+
+    def suite_runs(*columns):
+        stmt = select(*columns).where(Run.suite_id == BenchmarkSuite.id)
+        return apply_workspace_filter(stmt, Run, ctx)
+
+    query_count = (
+        select(func.count())
+        .select_from(QueryModel)
+        .where(QueryModel.suite_id == BenchmarkSuite.id)
+        .scalar_subquery()
+    )
+    run_count = suite_runs(func.count()).scalar_subquery()
+    last_run_at = suite_runs(func.max(Run.created_at)).scalar_subquery()
+    last_run_status = (
+        suite_runs(Run.status)
+        .order_by(Run.created_at.desc(), Run.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    stmt = select(
+        BenchmarkSuite,
+        query_count.label("query_count"),
+        run_count.label("run_count"),
+        last_run_status.label("last_run_status"),
+        last_run_at.label("last_run_at"),
+    )
     stmt = apply_workspace_filter(stmt, BenchmarkSuite, ctx)
     if tag:
         stmt = stmt.where(BenchmarkSuite.tags.overlap([tag]))
-    stmt = stmt.order_by(BenchmarkSuite.created_at.desc())
-    result = await db.execute(stmt)
-    suites = result.scalars().all()
+    return stmt
+
+
+@router.get("", response_model=list[SuiteOut])
+async def list_suites(
+    response: Response,
+    tag: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    ctx = get_request_context()
+    await require_permission(db, ctx, "datasets.read")
+    q = page_size(limit)
+    stmt = paginate(_suite_list_stmt(ctx, tag), BenchmarkSuite, cursor, q)
+    rows = (await db.execute(stmt)).all()
     out = []
-    for s in suites:
-        count_stmt = (
-            select(func.count())
-            .select_from(QueryModel)
-            .where(QueryModel.suite_id == s.id)
-        )
-        count = (await db.execute(count_stmt)).scalar() or 0
-        d = SuiteOut.model_validate(s)
-        d.query_count = count
+    for row in finish_page(rows, q, response, lambda row: row[0]):
+        d = SuiteOut.model_validate(row[0])
+        d.query_count = row.query_count or 0
+        d.run_count = row.run_count or 0
+        d.last_run_status = row.last_run_status
+        d.last_run_at = row.last_run_at
         out.append(d)
     return out
 
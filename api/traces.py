@@ -1,14 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import Date, case, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from database import get_db
 from models.trace_log import TraceLog
-from schemas.schemas import TraceLogOut, TraceSummaryOut
-from services.openai_pricing import calculate_cost
-from services.trace_utils import trace_to_out
+from models.trace_payload import TracePayload
+from schemas.schemas import TraceLogOut, TraceSummaryGroupOut, TraceSummaryOut
+from services.analytics import stats_columns, stats_from_row
+from services.openai_pricing import calculate_costs, get_compiled_rate_card
+from services.trace_utils import EXCLUDABLE_TRACE_FIELDS, trace_to_out
 from services.db_utils import get_or_404
 from services.context import get_request_context
+from services.pagination import (
+    blank_deferred,
+    defer_columns,
+    finish_page,
+    page_size,
+    paginate,
+    parse_exclude,
+)
 from services.permissions import require_permission
 from services.tenancy import apply_workspace_filter
 
@@ -36,22 +47,25 @@ def _apply_filters(
     return stmt
 
 
-
-
-
 @router.get("", response_model=list[TraceLogOut])
 async def list_traces(
+    response: Response,
     run_id: int | None = None,
     status: str | None = None,
     trace_type: str | None = None,
     agent_config_id: int | None = None,
     conversation_id: str | None = None,
     limit: int = 200,
+    cursor: str | None = None,
+    exclude: str | None = Query(
+        None, description="Comma-separated heavy fields to leave out"
+    ),
     db: AsyncSession = Depends(get_db),
 ):
     ctx = get_request_context()
     await require_permission(db, ctx, "traces.read")
-    q = min(max(limit, 1), 1000)
+    q = page_size(limit)
+    excluded = parse_exclude(exclude, EXCLUDABLE_TRACE_FIELDS)
     stmt = _apply_filters(
         stmt=select(TraceLog),
         run_id=run_id,
@@ -61,9 +75,44 @@ async def list_traces(
         conversation_id=conversation_id,
     )
     stmt = apply_workspace_filter(stmt, TraceLog, ctx)
-    stmt = stmt.order_by(TraceLog.created_at.desc()).limit(q)
-    result = await db.execute(stmt)
-    return [trace_to_out(r) for r in result.scalars().all()]
+    stmt = defer_columns(paginate(stmt, TraceLog, cursor, q), TraceLog, excluded)
+    rows = finish_page((await db.execute(stmt)).scalars().all(), q, response)
+    blank_deferred(rows, excluded)
+    return [trace_to_out(r) for r in rows]
+
+
+# Summary grouping keys and the TraceLog columns they group by. Plain columns
+# (no bound parameters) so the GROUP BY matches the select list under asyncpg.
+_SUMMARY_GROUPS = {
+    "model": TraceLog.model,
+    "trace_type": TraceLog.trace_type,
+    "day": cast(TraceLog.created_at, Date),
+    "agent": TraceLog.agent_config_id,
+}
+_GROUP_FIELDS = {"agent": "agent_config_id"}
+
+
+def _parse_group_by(group_by: str | None) -> list[str]:
+    keys = [k.strip() for k in (group_by or "").split(",") if k.strip()]
+    unknown = [k for k in keys if k not in _SUMMARY_GROUPS]
+    if unknown:
+        raise HTTPException(
+            400,
+            f"Unknown group_by key(s): {', '.join(unknown)}; "
+            f"expected {', '.join(_SUMMARY_GROUPS)}",
+        )
+    return list(dict.fromkeys(keys))
+
+
+def _summary_values(count, errors, cost, missing, latency) -> dict:
+    return {
+        "count": count,
+        "error_count": errors,
+        "error_rate": round(errors / count * 100, 2) if count else 0.0,
+        "total_cost_usd": round(cost, 6),
+        "missing_model_pricing_count": missing,
+        "latency_ms": latency,
+    }
 
 
 @router.get("/summary", response_model=TraceSummaryOut)
@@ -73,39 +122,103 @@ async def traces_summary(
     trace_type: str | None = None,
     agent_config_id: int | None = None,
     conversation_id: str | None = None,
+    group_by: str | None = Query(
+        None, description="Comma-separated: model, trace_type, day, agent"
+    ),
     db: AsyncSession = Depends(get_db),
 ):
     ctx = get_request_context()
     await require_permission(db, ctx, "traces.read")
-    stmt = _apply_filters(
-        stmt=select(TraceLog).order_by(TraceLog.created_at.desc()),
-        run_id=run_id,
-        status=status,
-        trace_type=trace_type,
-        agent_config_id=agent_config_id,
-        conversation_id=conversation_id,
-    )
-    stmt = apply_workspace_filter(stmt, TraceLog, ctx)
-    traces = (await db.execute(stmt)).scalars().all()
-    total_cost = 0.0
-    missing = 0
-    for t in traces:
-        response_payload = t.response_payload if isinstance(t.response_payload, dict) else {}
-        tool_calls = response_payload.get("tool_calls")
-        breakdown = calculate_cost(t.model or "", t.usage or {}, tool_calls)
-        total_cost += breakdown.total_usd
-        if breakdown.missing_model_pricing:
-            missing += 1
-    return TraceSummaryOut(
-        count=len(traces),
-        total_cost_usd=round(total_cost, 6),
-        missing_model_pricing_count=missing,
+    keys = _parse_group_by(group_by)
+    group_columns = [_SUMMARY_GROUPS[k].label(k) for k in keys]
+
+    def filtered(stmt):
+        stmt = _apply_filters(
+            stmt=stmt,
+            run_id=run_id,
+            status=status,
+            trace_type=trace_type,
+            agent_config_id=agent_config_id,
+            conversation_id=conversation_id,
+        )
+        return apply_workspace_filter(stmt, TraceLog, ctx)
+
+    # Everything is aggregated in Postgres from the slim trace_logs rows; the
+    # payload side table is never read. Costs are the columns stored at write
+    # time.
+    version = get_compiled_rate_card().version
+    fresh = TraceLog.pricing_version == version
+    aggregates = [
+        # Not "count": Row is a tuple and row.count is tuple.count
+        func.count(TraceLog.id).label("traces"),
+        func.count(case((TraceLog.status == "failed", TraceLog.id))).label("errors"),
+        func.coalesce(func.sum(case((fresh, TraceLog.total_cost_usd))), 0.0).label("cost"),
+        func.count(case((fresh & TraceLog.missing_model_pricing, TraceLog.id))).label(
+            "missing"
+        ),
+        *stats_columns("latency", TraceLog.latency_ms),
+    ]
+    # key -> [aggregate row, cost, missing]; () holds the overall totals
+    summaries: dict[tuple, list] = {}
+    for row in (await db.execute(filtered(select(*aggregates)))).all():
+        summaries[()] = [row, float(row.cost), row.missing]
+    if keys:
+        grouped = filtered(select(*group_columns, *aggregates)).group_by(
+            *(_SUMMARY_GROUPS[k] for k in keys)
+        )
+        for row in (await db.execute(grouped)).all():
+            summaries[tuple(row[: len(keys)])] = [row, float(row.cost), row.missing]
+
+    # Rows not yet (re)priced with the current rate card are priced here from
+    # a narrow projection; the repricing job keeps this set empty in steady
+    # state.
+    stale_stmt = filtered(
+        select(
+            *group_columns,
+            TraceLog.model.label("pricing_model"),
+            TraceLog.usage.label("usage"),
+            TracePayload.response_payload["tool_calls"].label("tool_calls"),
+        )
+        .outerjoin(TracePayload, TracePayload.trace_log_id == TraceLog.id)
+        .where(TraceLog.pricing_version.is_distinct_from(version))
     )
+    by_model: dict[str, list] = {}
+    for row in (await db.execute(stale_stmt)).all():
+        by_model.setdefault(row.pricing_model or "", []).append(row)
+    for model, rows in by_model.items():
+        batch = calculate_costs(
+            model,
+            [row.usage for row in rows],
+            [row.tool_calls if isinstance(row.tool_calls, list) else None for row in rows],
+        )
+        for row, cost in zip(rows, batch.total_usd.tolist()):
+            for key in {(), tuple(row[: len(keys)])}:
+                summaries[key][1] += cost
+                summaries[key][2] += int(batch.missing_model_pricing)
+
+    def values(summary: list) -> dict:
+        row, cost, missing = summary
+        return _summary_values(
+            row.traces, row.errors, cost, missing, stats_from_row(row, "latency")
+        )
+
+    groups = [
+        TraceSummaryGroupOut(
+            **{_GROUP_FIELDS.get(k, k): v for k, v in zip(keys, key)},
+            **values(summary),
+        )
+        for key, summary in summaries.items()
+        if key
+    ]
+    groups.sort(key=lambda g: g.count, reverse=True)
+    return TraceSummaryOut(**values(summaries[()]), group_by=keys, groups=groups)
 
 
 @router.get("/{trace_id}", response_model=TraceLogOut)
 async def get_trace(trace_id: int, db: AsyncSession = Depends(get_db)):
     ctx = get_request_context()
     await require_permission(db, ctx, "traces.read")
-    trace = await get_or_404(db, TraceLog, trace_id, "Trace")
+    trace = await get_or_404(
+        db, TraceLog, trace_id, "Trace", options=[selectinload(TraceLog.payload)]
+    )
     return trace_to_out(trace)
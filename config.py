@@ -20,6 +20,57 @@ class Settings(BaseSettings):
     COOKIE_SECURE: bool = False
     SESSION_COOKIE_DOMAIN: str | None = None
     FRONTEND_BASE_URL: str = "http://localhost:3000"
+    # Run queue / workers
+    RUN_WORKER_EMBEDDED: bool = True
+    RUN_WORKER_CONCURRENCY: int = 3
+    RUN_WORKER_POLL_SECONDS: float = 2.0
+    RUN_JOB_HEARTBEAT_SECONDS: int = 15
+    RUN_JOB_STALE_SECONDS: int = 120
+    RUN_JOB_MAX_ATTEMPTS: int = 3
+    # On shutdown, jobs still running after this long are cancelled and left
+    # for another worker to resume
+    RUN_WORKER_SHUTDOWN_GRACE_SECONDS: float = 5.0
+    # Execution governor (per process; 0 = unlimited). Model limits are JSON
+    # objects keyed by model name prefix, e.g. '{"gpt-4o": 500}'.
+    RATE_LIMIT_API_KEY_CONCURRENCY: int = 0
+    RATE_LIMIT_API_KEY_RPM: int = 0
+    RATE_LIMIT_API_KEY_TPM: int = 0
+    RATE_LIMIT_MODEL_CONCURRENCY: dict[str, int] = {}
+    RATE_LIMIT_MODEL_RPM: dict[str, int] = {}
+    RATE_LIMIT_MODEL_TPM: dict[str, int] = {}
+    RATE_LIMIT_ORG_CONCURRENCY: int = 0
+    RATE_LIMIT_ORG_RPM: int = 0
+    RATE_LIMIT_ESTIMATED_TOKENS: int = 4000
+    # Executor retries for transient errors (429 / 5xx / timeouts)
+    EXECUTOR_RETRY_MAX_ATTEMPTS: int = 3
+    EXECUTOR_RETRY_BASE_DELAY_SECONDS: float = 2.0
+    EXECUTOR_RETRY_MAX_DELAY_SECONDS: float = 60.0
+    EXECUTOR_RETRY_BUDGET_PER_RUN: int = 50
+    # Run results are written in bulk every N results or T milliseconds; this
+    # bounds how many finished queries a crash can lose (they are re-run).
+    RESULT_WRITER_BATCH_SIZE: int = 20
+    RESULT_WRITER_FLUSH_INTERVAL_MS: int = 1000
+    # Costs are stored on results/trace logs when written; rows priced with
+    # an older pricing file are repriced in batches (workers/reprice.py),
+    # by default in the background when the API starts.
+    COST_REPRICE_ON_STARTUP: bool = True
+    COST_REPRICE_BATCH_SIZE: int = 1000
+    # Opt-in content-addressed cache of successful executions, keyed by the
+    # executor config + query. Backend is "postgres" or "disk"; the disk
+    # store defaults to OUTPUT_BASE_DIR/.execution_cache.
+    EXECUTION_CACHE_ENABLED: bool = False
+    EXECUTION_CACHE_BACKEND: str = "postgres"
+    EXECUTION_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    EXECUTION_CACHE_MAX_ENTRIES: int = 10000
+    EXECUTION_CACHE_DIR: str = ""
+    # SSE event bus: "postgres" (LISTEN/NOTIFY, works across processes) or
+    # "local" (single process only)
+    SSE_BUS_BACKEND: str = "postgres"
+    # Per-subscriber SSE buffer; subscribers full for this long are evicted
+    SSE_SUBSCRIBER_QUEUE_SIZE: int = 100
+    SSE_SLOW_CONSUMER_EVICT_SECONDS: float = 60.0
+    # Recent events kept per run for Last-Event-ID resume
+    SSE_REPLAY_BUFFER_SIZE: int = 256
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
@@ -10,6 +10,10 @@ class ExecutionResult:
     usage: dict = field(default_factory=dict)
     execution_time_seconds: float = 0.0
     error: str | None = None
+    retryable: bool = False
+    retry_after_seconds: float | None = None
+    attempts: int = 1
+    cache_hit: bool = False
 
 
 class AgentExecutor(ABC):
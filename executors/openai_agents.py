@@ -2,6 +2,7 @@ import time
 from typing import Any
 
 from executors.base import AgentExecutor, ExecutionResult
+from executors.retry import classify_exception
 from services.error_format import format_exception_details
 from services.openai_tools import build_openai_tools
 
@@ -151,9 +152,12 @@ class OpenAIAgentsExecutor(AgentExecutor):
 
         except Exception as e:
             elapsed = time.time() - start
+            retryable, retry_after = classify_exception(e)
             return ExecutionResult(
                 error=format_exception_details(e),
                 execution_time_seconds=round(elapsed, 2),
+                retryable=retryable,
+                retry_after_seconds=retry_after,
             )
 
     async def execute(self, query: str, config: dict) -> ExecutionResult:
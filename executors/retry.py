@@ -0,0 +1,128 @@
+"""Retry policy for transient executor failures.
+
+Executors return failures as ``ExecutionResult.error`` rather than raising, so
+they also mark whether the failure is worth retrying (``retryable``) and how
+long the provider asked us to wait (``retry_after_seconds``).
+``execute_with_retry`` re-invokes the call with exponential backoff and full
+jitter, honoring Retry-After, until it succeeds, hits a permanent error, runs
+out of attempts or exhausts the shared ``RetryBudget``.
+
+Each retry sleeps in the caller's own task, so other in-flight queries keep
+running while one waits.
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable
+
+from config import get_settings
+from executors.base import ExecutionResult
+
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+_RETRYABLE_NAMES = {
+    "APIConnectionError",
+    "APITimeoutError",
+    "RateLimitError",
+    "InternalServerError",
+    "TimeoutError",
+}
+_PERMANENT_CODES = {"insufficient_quota", "invalid_api_key", "model_not_found"}
+
+
+def _parse_retry_after(headers) -> float | None:
+    if not headers:
+        return None
+    raw_ms = headers.get("retry-after-ms")
+    if raw_ms:
+        try:
+            return max(float(raw_ms) / 1000.0, 0.0)
+        except ValueError:
+            pass
+    raw = headers.get("retry-after")
+    if not raw:
+        return None
+    try:
+        return max(float(raw), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(raw)
+    except (TypeError, ValueError):
+        return None
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def classify_exception(exc: BaseException) -> tuple[bool, float | None]:
+    """Return ``(retryable, retry_after_seconds)`` for an executor exception.
+
+    Works by duck typing on the OpenAI client's exception attributes so the
+    SDK does not need to be importable here.
+    """
+    if getattr(exc, "code", None) in _PERMANENT_CODES:
+        return False, None
+    response = getattr(exc, "response", None)
+    retry_after = _parse_retry_after(getattr(response, "headers", None))
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status in _RETRYABLE_STATUS, retry_after
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError)):
+        return True, retry_after
+    names = {cls.__name__ for cls in type(exc).__mro__}
+    return bool(names & _RETRYABLE_NAMES), retry_after
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay_seconds: float = 2.0
+    max_delay_seconds: float = 60.0
+
+    @classmethod
+    def from_settings(cls) -> "RetryPolicy":
+        settings = get_settings()
+        return cls(
+            max_attempts=max(1, settings.EXECUTOR_RETRY_MAX_ATTEMPTS),
+            base_delay_seconds=settings.EXECUTOR_RETRY_BASE_DELAY_SECONDS,
+            max_delay_seconds=settings.EXECUTOR_RETRY_MAX_DELAY_SECONDS,
+        )
+
+    def delay(self, attempt: int, retry_after: float | None) -> float:
+        """Delay before retry number ``attempt`` (1-based)."""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay_seconds)
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+
+class RetryBudget:
+    """Caps the total number of retries shared by all queries of one run."""
+
+    def __init__(self, max_retries: int):
+        self.remaining = max_retries
+
+    def take(self) -> bool:
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+async def execute_with_retry(
+    call: Callable[[], Awaitable[ExecutionResult]],
+    policy: RetryPolicy | None = None,
+    budget: RetryBudget | None = None,
+) -> ExecutionResult:
+    policy = policy or RetryPolicy.from_settings()
+    attempt = 1
+    while True:
+        result = await call()
+        result.attempts = attempt
+        if not result.error or not result.retryable or attempt >= policy.max_attempts:
+            return result
+        if budget is not None and not budget.take():
+            return result
+        await asyncio.sleep(policy.delay(attempt, result.retry_after_seconds))
+        attempt += 1
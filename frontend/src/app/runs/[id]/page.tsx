@@ -6,7 +6,6 @@ import { useParams, useRouter } from "next/navigation";
 import { runsApi } from "@/lib/api/runs";
 import { resultsApi } from "@/lib/api/results";
 import { gradesApi } from "@/lib/api/grades";
-import { useSSE } from "@/hooks/use-sse";
 import { apiUrl } from "@/lib/api/client";
 import { PageHeader } from "@/components/layout/page-header";
 import { GradingView } from "@/components/grading/grading-view";
@@ -16,7 +15,11 @@ import { ConfigView } from "@/components/runs/config-view";
 import { CsvGradeImportModal } from "@/components/grading/csv-grade-import-modal";
 
 import { cn, formatElapsed } from "@/lib/utils";
-import type { RunDetailOut, SSEProgressData } from "@/lib/types";
+import type {
+  RunDetailOut,
+  SSEProgressData,
+  SSESnapshotData,
+} from "@/lib/types";
 
 type Mode = "grading" | "dashboard" | "config";
 
@@ -113,7 +116,21 @@ export default function RunDetailPage() {
         }
       });
 
-      es.addEventListener("complete", () => {
+      // "snapshot" is sent instead of a replay when the server cannot resume
+      // from Last-Event-ID; it only carries the run's progress.
+      es.addEventListener("snapshot", (e) => {
+        try {
+          const d: SSESnapshotData = JSON.parse(e.data);
+          setProgress((prev) => ({
+            ...prev,
+            [rid]: { current: d.current, total: d.total },
+          }));
+        } catch {
+          /* ignore */
+        }
+      });
+
+      const finish = () => {
         es.close();
         completedRef.current++;
         if (completedRef.current >= allRunIds.length) {
@@ -123,10 +140,16 @@ export default function RunDetailPage() {
               queryKey: ["group", run.run_group],
             });
         }
-      });
+      };
 
-      es.addEventListener("error", () => {
-        es.close();
+      es.addEventListener("complete", finish);
+
+      es.addEventListener("error", (e) => {
+        // Network blips: EventSource reconnects by itself and sends
+        // Last-Event-ID, so only give up on server errors or a closed stream.
+        if (e instanceof MessageEvent || es.readyState === EventSource.CLOSED) {
+          finish();
+        }
       });
     });
 
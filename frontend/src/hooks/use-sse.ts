@@ -27,23 +27,32 @@ export function useSSE(runId: number, options: UseSSEOptions) {
     const es = new EventSource(apiUrl(`/api/runs/${runId}/stream`));
     esRef.current = es;
 
-    es.addEventListener("progress", (e) => {
+    const handleProgress = (e: MessageEvent) => {
       try {
         const data = JSON.parse(e.data);
         onProgress?.(data);
       } catch {
         // ignore parse errors
       }
-    });
+    };
+
+    // "snapshot" is sent instead of a replay when the server cannot resume
+    // from Last-Event-ID; it carries the same current/total fields.
+    es.addEventListener("progress", handleProgress);
+    es.addEventListener("snapshot", handleProgress);
 
     es.addEventListener("complete", () => {
       es.close();
       onComplete?.();
     });
 
-    es.addEventListener("error", () => {
-      es.close();
-      onError?.();
+    es.addEventListener("error", (e) => {
+      // Network blips: EventSource reconnects by itself and sends
+      // Last-Event-ID, so only give up on server errors or a closed stream.
+      if (e instanceof MessageEvent || es.readyState === EventSource.CLOSED) {
+        es.close();
+        onError?.();
+      }
     });
 
     return cleanup;
@@ -50,6 +50,9 @@ export const runsApi = {
   cancel: (id: number) =>
     apiFetch<RunOut>(`/api/runs/${id}/cancel`, { method: "POST" }),
 
+  resume: (id: number, retryErrors = true) =>
+    apiFetch<RunOut>(`/api/runs/${id}/resume${retryErrors ? "" : "?retry_errors=false"}`, { method: "POST" }),
+
   delete: (id: number, deleteData = false) =>
     apiFetch<void>(`/api/runs/${id}${deleteData ? "?delete_data=true" : ""}`, { method: "DELETE" }),
 
@@ -14,13 +14,14 @@ export const tracesApi = {
     return apiFetch<TraceLogOut[]>(`/api/traces${query ? `?${query}` : ""}`);
   },
 
-  summary: (params?: { runId?: number; status?: string; traceType?: string; agentConfigId?: number; conversationId?: string }) => {
+  summary: (params?: { runId?: number; status?: string; traceType?: string; agentConfigId?: number; conversationId?: string; groupBy?: Array<"model" | "trace_type" | "day" | "agent"> }) => {
     const qs = new URLSearchParams();
     if (params?.runId !== undefined) qs.set("run_id", String(params.runId));
     if (params?.status) qs.set("status", params.status);
     if (params?.traceType) qs.set("trace_type", params.traceType);
     if (params?.agentConfigId !== undefined) qs.set("agent_config_id", String(params.agentConfigId));
     if (params?.conversationId) qs.set("conversation_id", params.conversationId);
+    if (params?.groupBy?.length) qs.set("group_by", params.groupBy.join(","));
     const query = qs.toString();
     return apiFetch<TraceSummaryOut>(`/api/traces/summary${query ? `?${query}` : ""}`);
   },
@@ -30,6 +30,9 @@ export interface SuiteOut {
   created_at: string;
   updated_at: string;
   query_count: number;
+  run_count: number;
+  last_run_status: string | null;
+  last_run_at: string | null;
 }
 
 export interface SuiteDetailOut extends SuiteOut {
@@ -283,6 +286,8 @@ export interface GradeCountsOut {
   total: number;
   accuracy: number;
   weighted_score: number;
+  accuracy_ci?: [number, number] | null;
+  weighted_score_ci?: [number, number] | null;
 }
 
 export interface StatsOut {
@@ -291,6 +296,9 @@ export interface StatsOut {
   std: number;
   min: number;
   max: number;
+  p50: number;
+  p90: number;
+  p99: number;
   n: number;
 }
 
@@ -341,6 +349,16 @@ export interface CompareAnalyticsOut {
   runs: RunAnalyticsOut[];
   consistency: Record<string, number>;
   query_grades: QueryGradeRow[];
+  significance: Array<{
+    run_a: number;
+    run_b: number;
+    n_pairs: number;
+    mean_score_diff: number;
+    a_only_correct: number;
+    b_only_correct: number;
+    mcnemar_p: number;
+    permutation_p: number;
+  }>;
 }
 
 // Browse
@@ -402,6 +420,13 @@ export interface SSEProgressData {
   time?: number;
 }
 
+export interface SSESnapshotData {
+  status: string;
+  current: number;
+  total: number;
+  error: string | null;
+}
+
 export type GradeValue = "correct" | "partial" | "wrong";
 
 // Comparisons
@@ -453,10 +478,28 @@ export interface TraceLogOut {
   created_at: string;
 }
 
+export interface TraceSummaryGroupOut {
+  model: string | null;
+  trace_type: string | null;
+  day: string | null;
+  agent_config_id: number | null;
+  count: number;
+  error_count: number;
+  error_rate: number;
+  total_cost_usd: number;
+  missing_model_pricing_count: number;
+  latency_ms: StatsOut;
+}
+
 export interface TraceSummaryOut {
   count: number;
   total_cost_usd: number;
   missing_model_pricing_count: number;
+  error_count: number;
+  error_rate: number;
+  latency_ms: StatsOut;
+  group_by: string[];
+  groups: TraceSummaryGroupOut[];
 }
 
 export interface AppNotificationOut {
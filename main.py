@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from contextlib import asynccontextmanager
@@ -55,11 +56,31 @@ BASE_DIR = Path(__file__).resolve().parent
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
-    yield
-    # Shutdown — clean up SSE bus
     from workers.sse_bus import sse_bus
 
+    # Startup — connect the SSE bus, optionally run a queue worker inside the
+    # API process
+    await sse_bus.start()
+    worker = None
+    worker_task = None
+    if settings.RUN_WORKER_EMBEDDED:
+        from workers.worker import RunWorker
+
+        worker = RunWorker()
+        worker_task = asyncio.create_task(worker.run_forever())
+    reprice_task = None
+    if settings.COST_REPRICE_ON_STARTUP:
+        from workers.reprice import reprice_on_startup
+
+        reprice_task = asyncio.create_task(reprice_on_startup())
+    yield
+    # Shutdown — stop the embedded worker and repricing, clean up SSE bus
+    if reprice_task is not None and not reprice_task.done():
+        reprice_task.cancel()
+    if worker is not None:
+        await worker.stop()
+        await worker_task
+    await sse_bus.stop()
     sse_bus.clear()
 
 
@@ -2,6 +2,7 @@ from models.auth_session import AuthSession
 from models.agent import AgentConfig
 from models.app_notification import AppNotification
 from models.comparison import Comparison
+from models.execution_cache_entry import ExecutionCacheEntry
 from models.grade import Grade
 from models.invitation import Invitation
 from models.organization import Organization
@@ -16,11 +17,15 @@ from models.project_role import ProjectRole
 from models.project_role_permission import ProjectRolePermission
 from models.query import Query
 from models.result import Result
+from models.result_payload import ResultPayload
 from models.run import Run
+from models.run_analytics_snapshot import RunAnalyticsSnapshot
 from models.run_cost_preview import RunCostPreview
+from models.run_job import RunJob
 from models.suite import BenchmarkSuite
 from models.system_state import SystemState
 from models.trace_log import TraceLog
+from models.trace_payload import TracePayload
 from models.user import User
 from models.user_permission_grant import UserPermissionGrant
 
@@ -45,9 +50,14 @@ __all__ = [
     "AgentConfig",
     "Run",
     "Result",
+    "ResultPayload",
     "Grade",
     "Comparison",
     "AppNotification",
     "TraceLog",
+    "TracePayload",
     "RunCostPreview",
+    "RunJob",
+    "ExecutionCacheEntry",
+    "RunAnalyticsSnapshot",
 ]
@@ -10,7 +10,10 @@ class Query(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     suite_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("benchmark_suites.id", ondelete="CASCADE"), nullable=False
+        Integer,
+        ForeignKey("benchmark_suites.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     ordinal: Mapped[int] = mapped_column(Integer, nullable=False)
     tag: Mapped[str | None] = mapped_column(String(100), nullable=True)
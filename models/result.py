@@ -1,6 +1,17 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String, Text, func
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+    inspect,
+)
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,6 +21,8 @@ from models.enums import VISIBILITY_PROJECT
 
 class Result(Base):
     __tablename__ = "results"
+    # Keyset pagination order (services/pagination.py)
+    __table_args__ = (Index("ix_results_run_id_created_at_id", "run_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     organization_id: Mapped[int] = mapped_column(
@@ -48,12 +61,21 @@ class Result(Base):
         nullable=True,
         index=True,
     )
-    agent_response: Mapped[str | None] = mapped_column(Text, nullable=True)
-    tool_calls: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
-    reasoning: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     usage: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     execution_time_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    total_cost_usd: Mapped[float | None] = mapped_column(Float, nullable=True)
+    input_cost_usd: Mapped[float | None] = mapped_column(Float, nullable=True)
+    cached_input_cost_usd: Mapped[float | None] = mapped_column(Float, nullable=True)
+    output_cost_usd: Mapped[float | None] = mapped_column(Float, nullable=True)
+    reasoning_output_cost_usd: Mapped[float | None] = mapped_column(Float, nullable=True)
+    web_search_cost_usd: Mapped[float | None] = mapped_column(Float, nullable=True)
+    web_search_calls: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    missing_model_pricing: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+    # Rate card the cost columns were computed with; NULL until priced
+    pricing_version: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, index=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -76,3 +98,32 @@ class Result(Base):
     grade: Mapped["Grade | None"] = relationship(
         "Grade", back_populates="result", uselist=False, cascade="all, delete-orphan"
     )
+    # agent_response, tool_calls and reasoning (models/result_payload.py)
+    payload: Mapped["ResultPayload | None"] = relationship(
+        "ResultPayload",
+        back_populates="result",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    def _payload_value(self, field: str):
+        # None unless the payload (and that field of it) was loaded, so
+        # serializing a slim row never lazy-loads under asyncio
+        if "payload" in inspect(self).unloaded or self.payload is None:
+            return None
+        if field in inspect(self.payload).unloaded:
+            return None
+        return getattr(self.payload, field)
+
+    @property
+    def agent_response(self) -> str | None:
+        return self._payload_value("agent_response")
+
+    @property
+    def tool_calls(self) -> list | None:
+        return self._payload_value("tool_calls")
+
+    @property
+    def reasoning(self) -> list | None:
+        return self._payload_value("reasoning")
@@ -0,0 +1,27 @@
+from sqlalchemy import ForeignKey, Integer, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from database import Base
+
+# Result fields stored here rather than on the results row
+RESULT_PAYLOAD_FIELDS = ("agent_response", "tool_calls", "reasoning")
+
+
+class ResultPayload(Base):
+    """The heavy fields of a result, one row per result.
+
+    Kept out of ``results`` so listings, analytics and grading scans read
+    narrow rows; loaded on demand through ``Result.payload``.
+    """
+
+    __tablename__ = "result_payloads"
+
+    result_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("results.id", ondelete="CASCADE"), primary_key=True
+    )
+    agent_response: Mapped[str | None] = mapped_column(Text, nullable=True)
+    tool_calls: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    reasoning: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+
+    result: Mapped["Result"] = relationship("Result", back_populates="payload")
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,6 +10,12 @@ from models.enums import VISIBILITY_PROJECT
 
 class Run(Base):
     __tablename__ = "runs"
+    __table_args__ = (
+        # Keyset pagination order (services/pagination.py)
+        Index("ix_runs_created_at_id", "created_at", "id"),
+        # Per-suite run counts and last run (suite listings)
+        Index("ix_runs_suite_id_created_at_id", "suite_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     organization_id: Mapped[int] = mapped_column(
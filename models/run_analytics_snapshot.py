@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from database import Base
+
+
+class RunAnalyticsSnapshot(Base):
+    __tablename__ = "run_analytics_snapshots"
+
+    run_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("runs.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Bumped by every write that changes the run's results or grades
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    # Version the payload was computed (or patched) at; stale when != version
+    computed_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Run.completed_at at compute time; a resumed run no longer matches
+    run_completed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    payload: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    computed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -1,6 +1,17 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+    inspect,
+)
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -9,6 +20,10 @@ from database import Base
 
 class TraceLog(Base):
     __tablename__ = "trace_logs"
+    # Keyset pagination order (services/pagination.py)
+    __table_args__ = (
+        Index("ix_trace_logs_project_id_created_at_id", "project_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     organization_id: Mapped[int] = mapped_column(
@@ -45,11 +60,22 @@ class TraceLog(Base):
     trace_type: Mapped[str] = mapped_column(
         String(20), nullable=False, server_default="benchmark", index=True
     )
-    request_payload: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
-    response_payload: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     usage: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
     latency_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+    total_cost_usd: Mapped[float | None] = mapped_column(Float, nullable=True)
+    input_cost_usd: Mapped[float | None] = mapped_column(Float, nullable=True)
+    cached_input_cost_usd: Mapped[float | None] = mapped_column(Float, nullable=True)
+    output_cost_usd: Mapped[float | None] = mapped_column(Float, nullable=True)
+    reasoning_output_cost_usd: Mapped[float | None] = mapped_column(Float, nullable=True)
+    web_search_cost_usd: Mapped[float | None] = mapped_column(Float, nullable=True)
+    web_search_calls: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    missing_model_pricing: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+    # Rate card the cost columns were computed with; NULL until priced
+    pricing_version: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, index=True
+    )
     started_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
@@ -68,3 +94,28 @@ class TraceLog(Base):
     result: Mapped["Result | None"] = relationship(
         "Result", back_populates="trace_log", uselist=False
     )
+    # request_payload and response_payload (models/trace_payload.py)
+    payload: Mapped["TracePayload | None"] = relationship(
+        "TracePayload",
+        back_populates="trace_log",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    def _payload_value(self, field: str):
+        # None unless the payload (and that field of it) was loaded, so
+        # serializing a slim row never lazy-loads under asyncio
+        if "payload" in inspect(self).unloaded or self.payload is None:
+            return None
+        if field in inspect(self.payload).unloaded:
+            return None
+        return getattr(self.payload, field)
+
+    @property
+    def request_payload(self) -> dict | None:
+        return self._payload_value("request_payload")
+
+    @property
+    def response_payload(self) -> dict | None:
+        return self._payload_value("response_payload")
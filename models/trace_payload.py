@@ -0,0 +1,26 @@
+from sqlalchemy import ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from database import Base
+
+# TraceLog fields stored here rather than on the trace_logs row
+TRACE_PAYLOAD_FIELDS = ("request_payload", "response_payload")
+
+
+class TracePayload(Base):
+    """The request and response bodies of a trace log, one row per trace.
+
+    Kept out of ``trace_logs`` so listings and summaries read narrow rows;
+    loaded on demand through ``TraceLog.payload``.
+    """
+
+    __tablename__ = "trace_payloads"
+
+    trace_log_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("trace_logs.id", ondelete="CASCADE"), primary_key=True
+    )
+    request_payload: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    response_payload: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+
+    trace_log: Mapped["TraceLog"] = relationship("TraceLog", back_populates="payload")
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any, Literal, Union
 
 from pydantic import BaseModel
@@ -44,6 +44,9 @@ class SuiteOut(BaseModel):
     created_at: datetime
     updated_at: datetime
     query_count: int = 0
+    run_count: int = 0
+    last_run_status: str | None = None
+    last_run_at: datetime | None = None
 
     model_config = {"from_attributes": True}
 
@@ -313,6 +316,9 @@ class GradeCountsOut(BaseModel):
     total: int = 0
     accuracy: float = 0.0
     weighted_score: float = 0.0
+    # 95% bootstrap intervals, [low, high] in percent
+    accuracy_ci: list[float] | None = None
+    weighted_score_ci: list[float] | None = None
 
 
 class StatsOut(BaseModel):
@@ -321,6 +327,9 @@ class StatsOut(BaseModel):
     std: float = 0
     min: float = 0
     max: float = 0
+    p50: float = 0
+    p90: float = 0
+    p99: float = 0
     n: int = 0
 
 
@@ -340,6 +349,8 @@ class CompareAnalyticsOut(BaseModel):
     runs: list[RunAnalyticsOut]
     consistency: dict[str, int] = {}
     query_grades: list[dict[str, Any]] = []
+    # Paired significance tests for every pair of runs
+    significance: list[dict[str, Any]] = []
 
 
 # --- Comparison ---
@@ -388,6 +399,7 @@ class TraceLogOut(BaseModel):
     cost_breakdown: dict = {}
     missing_model_pricing: bool = False
     latency_ms: int | None
+    attempts: int = 1
     started_at: datetime
     completed_at: datetime | None
     created_at: datetime
@@ -395,10 +407,29 @@ class TraceLogOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class TraceSummaryGroupOut(BaseModel):
+    # Only the keys named in ``group_by`` are set
+    model: str | None = None
+    trace_type: str | None = None
+    day: date | None = None
+    agent_config_id: int | None = None
+    count: int
+    error_count: int = 0
+    error_rate: float = 0
+    total_cost_usd: float = 0
+    missing_model_pricing_count: int = 0
+    latency_ms: StatsOut = StatsOut()
+
+
 class TraceSummaryOut(BaseModel):
     count: int
     total_cost_usd: float
     missing_model_pricing_count: int = 0
+    error_count: int = 0
+    error_rate: float = 0
+    latency_ms: StatsOut = StatsOut()
+    group_by: list[str] = []
+    groups: list[TraceSummaryGroupOut] = []
 
 
 class RunningJobItem(BaseModel):
@@ -420,6 +451,33 @@ class RunningJobsOut(BaseModel):
     single_queries: list[RunningJobItem] = []
 
 
+class RateLimitScopeOut(BaseModel):
+    scope: str  # api_key, model, organization
+    key: str
+    in_flight: int = 0
+    waiting: int = 0
+    max_concurrency: int = 0
+    rpm_limit: int = 0
+    rpm_available: float | None = None
+    tpm_limit: int = 0
+    tpm_available: float | None = None
+    total_requests: int = 0
+    total_tokens: int = 0
+
+
+class SSEBusMetricsOut(BaseModel):
+    backend: str
+    topics: int = 0
+    subscribers: int = 0
+    published: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    evicted: int = 0
+    queue_depth_total: int = 0
+    queue_depth_max: int = 0
+
+
 # --- Auth / Workspace ---
 class UserOut(BaseModel):
     id: int
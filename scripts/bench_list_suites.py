@@ -0,0 +1,167 @@
+"""Benchmark suite listing latency against the number of suites.
+
+Seeds ``--sizes`` suites (each with ``--queries`` queries and ``--runs`` runs)
+into a throwaway organization/project inside one transaction that is rolled
+back at the end, so the database in ``DATABASE_URL`` is left unchanged. For
+each size it times the statement behind ``GET /api/suites`` for a full
+listing and for one ``--page-size`` page, counts the statements executed, and
+with ``--compare`` also times the old per-suite ``count(*)`` loop.
+
+    uv run python scripts/bench_list_suites.py --sizes 10,100,1000 --compare
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import event, func, insert, select  # noqa: E402
+
+import models  # noqa: E402,F401  (registers every mapper)
+from api.suites import _suite_list_stmt  # noqa: E402
+from database import async_session, engine  # noqa: E402
+from models.agent import AgentConfig  # noqa: E402
+from models.organization import Organization  # noqa: E402
+from models.project import Project  # noqa: E402
+from models.query import Query  # noqa: E402
+from models.run import Run  # noqa: E402
+from models.suite import BenchmarkSuite  # noqa: E402
+from services.pagination import paginate  # noqa: E402
+
+_statements = 0
+
+
+def _count_statement(*_):
+    global _statements
+    _statements += 1
+
+
+async def _seed(db, ctx, agent_id: int, count: int, queries: int, runs: int):
+    workspace = {"organization_id": ctx.organization_id, "project_id": ctx.project_id}
+    suite_ids = (
+        await db.execute(
+            insert(BenchmarkSuite).returning(BenchmarkSuite.id),
+            [{**workspace, "name": f"bench-{uuid.uuid4().hex[:8]}"} for _ in range(count)],
+        )
+    ).scalars().all()
+    if queries:
+        await db.execute(
+            insert(Query),
+            [
+                {"suite_id": sid, "ordinal": i, "query_text": "q", "expected_answer": "a"}
+                for sid in suite_ids
+                for i in range(1, queries + 1)
+            ],
+        )
+    if runs:
+        await db.execute(
+            insert(Run),
+            [
+                {
+                    **workspace,
+                    "suite_id": sid,
+                    "agent_config_id": agent_id,
+                    "label": f"run-{i}",
+                    "status": "completed",
+                }
+                for sid in suite_ids
+                for i in range(runs)
+            ],
+        )
+
+
+async def _time(fn, repeat: int) -> tuple[float, int]:
+    """Median milliseconds and statements executed per call."""
+    global _statements
+    timings = []
+    for _ in range(repeat):
+        _statements = 0
+        started = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), _statements
+
+
+async def _main(args):
+    event.listen(engine.sync_engine, "before_cursor_execute", _count_statement)
+    sizes = sorted(int(s) for s in args.sizes.split(","))
+    async with async_session() as db:
+        org_id = (
+            await db.execute(
+                insert(Organization)
+                .values(name="bench", slug=f"bench-{uuid.uuid4().hex}")
+                .returning(Organization.id)
+            )
+        ).scalar_one()
+        project_id = (
+            await db.execute(
+                insert(Project)
+                .values(organization_id=org_id, name="bench")
+                .returning(Project.id)
+            )
+        ).scalar_one()
+        agent_id = (
+            await db.execute(
+                insert(AgentConfig)
+                .values(
+                    organization_id=org_id, project_id=project_id, name="bench", model="gpt-4o"
+                )
+                .returning(AgentConfig.id)
+            )
+        ).scalar_one()
+        ctx = SimpleNamespace(organization_id=org_id, project_id=project_id)
+
+        async def listing(limit=None):
+            stmt = paginate(_suite_list_stmt(ctx), BenchmarkSuite, None, limit)
+            return (await db.execute(stmt)).all()
+
+        async def n_plus_one():
+            stmt = paginate(
+                select(BenchmarkSuite).where(BenchmarkSuite.project_id == project_id),
+                BenchmarkSuite,
+                None,
+                None,
+            )
+            for suite in (await db.execute(stmt)).scalars().all():
+                await db.execute(
+                    select(func.count()).select_from(Query).where(Query.suite_id == suite.id)
+                )
+
+        seeded = 0
+        print(f"queries/suite={args.queries} runs/suite={args.runs} repeat={args.repeat}")
+        for size in sizes:
+            await _seed(db, ctx, agent_id, size - seeded, args.queries, args.runs)
+            seeded = size
+            full_ms, full_stmts = await _time(listing, args.repeat)
+            page_ms, page_stmts = await _time(lambda: listing(args.page_size), args.repeat)
+            line = (
+                f"suites={size:>6}  full={full_ms:8.2f}ms ({full_stmts} stmt)  "
+                f"page[{args.page_size}]={page_ms:7.2f}ms ({page_stmts} stmt)"
+            )
+            if args.compare:
+                old_ms, old_stmts = await _time(n_plus_one, args.repeat)
+                line += f"  n+1={old_ms:9.2f}ms ({old_stmts} stmt)"
+            print(line)
+        await db.rollback()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite listing benchmark")
+    parser.add_argument("--sizes", default="10,100,1000")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--compare", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark SSE bus fan-out latency with many subscribers.
+
+Publishes ``--events`` progress events for one run while ``--subscribers``
+local subscribers consume them, and reports publish-to-delivery latency
+percentiles plus the bus's coalesce/drop counters (only a subscriber whose queue
+fills up skips to the latest progress snapshot). With ``--backend postgres``
+every event makes the full NOTIFY -> LISTEN round trip through the database
+in ``DATABASE_URL``.
+
+    uv run python scripts/bench_sse_fanout.py --backend postgres --subscribers 500
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from workers.sse_bus import SSEBus  # noqa: E402
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _consume(q, latencies: list[float]):
+    while True:
+        event, payload, _ = await q.get()
+        latencies.append(time.time() - json.loads(payload)["sent_at"])
+        if event == "complete":
+            return
+
+
+async def _main(args):
+    bus = SSEBus(backend=args.backend)
+    await bus.start()
+    run_id = 0
+    latencies: list[float] = []
+    queues = [bus.subscribe(run_id) for _ in range(args.subscribers)]
+    consumers = [
+        asyncio.create_task(_consume(q, latencies)) for q in queues
+    ]
+
+    started = time.perf_counter()
+    for i in range(args.events):
+        await bus.publish(
+            run_id,
+            "progress",
+            {"current": i + 1, "total": args.events, "sent_at": time.time()},
+        )
+        if args.interval_ms:
+            await asyncio.sleep(args.interval_ms / 1000)
+    await bus.publish(run_id, "complete", {"status": "completed", "sent_at": time.time()})
+    await asyncio.wait_for(asyncio.gather(*consumers), timeout=args.timeout)
+    elapsed = time.perf_counter() - started
+
+    metrics = bus.metrics()
+    for q in queues:
+        bus.unsubscribe(run_id, q)
+    await bus.stop()
+
+    ms = [v * 1000 for v in latencies]
+    print(f"backend={args.backend} subscribers={args.subscribers} events={args.events}")
+    print(f"deliveries={len(ms)} elapsed={elapsed:.3f}s "
+          f"throughput={len(ms) / elapsed:,.0f} deliveries/s "
+          f"coalesced={metrics['coalesced']} dropped={metrics['dropped']}")
+    print(
+        f"latency ms: mean={statistics.fmean(ms):.2f} p50={_percentile(ms, 50):.2f} "
+        f"p95={_percentile(ms, 95):.2f} p99={_percentile(ms, 99):.2f} max={max(ms):.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SSE bus fan-out benchmark")
+    parser.add_argument("--backend", default="postgres", choices=["local", "postgres"])
+    parser.add_argument("--subscribers", type=int, default=200)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--interval-ms", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,13 @@
-import math
-from collections import Counter
-
-from sqlalchemy import select
+import numpy as np
+from sqlalchemy import BigInteger, Float, Numeric, and_, case, cast, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from database import async_session
+from models.grade import Grade
 from models.query import Query
 from models.result import Result
+from models.result_payload import ResultPayload
 from models.run import Run
 from models.agent import AgentConfig
 from schemas.schemas import (
@@ -15,205 +16,475 @@ from schemas.schemas import (
     RunAnalyticsOut,
     StatsOut,
 )
-from services.openai_pricing import calculate_cost, get_rate_card
+from services.analytics_snapshots import load_snapshots, patch_run_analytics, save_snapshot
+from services.openai_pricing import (
+    calculate_costs_from_counts,
+    get_compiled_rate_card,
+    get_rate_card,
+)
+from services.stats import describe, grade_confidence_intervals, paired_comparison
 from services.context import get_request_context
 from services.tenancy import apply_workspace_filter
 
 
-def _tool_call_label(tc: dict) -> str:
-    """Return a display label for a tool call entry."""
-    # New executor format: type == "web_search"
-    if tc.get("type") == "web_search":
-        action = tc.get("action_type", "search")
-        return f"web_search:{action}"
-    # Legacy imported format: raw_items.type == "web_search_call"
-    raw = tc.get("raw_items")
-    if isinstance(raw, dict) and raw.get("type") == "web_search_call":
-        action = raw.get("action", {})
-        return f"web_search:{action.get('type', 'search')}" if isinstance(action, dict) else "web_search"
-    return tc.get("name") or "unknown"
+# Bump when RunAnalyticsOut gains fields so older snapshots are recomputed
+_SNAPSHOT_FORMAT = 2
+
+# Run analytics are computed in Postgres: grade/tag counts and the
+# performance stats come back as a handful of aggregate rows, and tool calls
+# are unnested and labelled with JSONB operators. Only the per-query cost
+# breakdown is per result, and it is fetched as a narrow row of counts plus
+# the costs stored on the result; rows priced with an older rate card are
+# repriced in the same vectorized batch. Tool calls live in the
+# result_payloads side table, which only the tool statistics (and stale rows'
+# web search counts) join.
+
+# CostBatch fields and the Result columns they are stored in
+_STORED_COSTS = (
+    ("input_cost_usd", Result.input_cost_usd),
+    ("cached_input_cost_usd", Result.cached_input_cost_usd),
+    ("output_cost_usd", Result.output_cost_usd),
+    ("reasoning_output_cost_usd", Result.reasoning_output_cost_usd),
+    ("web_search_cost_usd", Result.web_search_cost_usd),
+    ("total_usd", Result.total_cost_usd),
+)
+
+
+def _usage_int(key: str):
+    """``int(usage.get(key, 0) or 0)`` as a SQL expression."""
+    value = func.nullif(Result.usage[key].astext, "")
+    return cast(func.trunc(func.coalesce(cast(value, Numeric), 0)), BigInteger)
+
+
+def _tool_call_elements():
+    """The payload's tool calls as a set of JSONB elements (none unless an array)."""
+    calls = case(
+        (func.jsonb_typeof(ResultPayload.tool_calls) == "array", ResultPayload.tool_calls),
+        else_=cast(literal("[]"), JSONB),
+    )
+    return func.jsonb_array_elements(calls, type_=JSONB).column_valued(
+        "tc", joins_implicitly=True
+    )
+
+
+def _tool_call_label(tc):
+    """Display label for a tool call entry (see the executors' formats)."""
+    raw = tc["raw_items"]
+    action = raw["action"]
+    return case(
+        # New executor format: type == "web_search"
+        (
+            tc["type"].astext == "web_search",
+            "web_search:" + func.coalesce(tc["action_type"].astext, "search"),
+        ),
+        # Legacy imported format: raw_items.type == "web_search_call"
+        (
+            and_(
+                func.jsonb_typeof(raw) == "object",
+                raw["type"].astext == "web_search_call",
+            ),
+            case(
+                (
+                    func.jsonb_typeof(action) == "object",
+                    "web_search:" + func.coalesce(action["type"].astext, "search"),
+                ),
+                (action.is_(None), "web_search:search"),
+                else_="web_search",
+            ),
+        ),
+        else_=func.coalesce(func.nullif(tc["name"].astext, ""), "unknown"),
+    )
+
+
+def _is_web_search_call(tc):
+    name = func.lower(func.coalesce(tc["name"].astext, ""))
+    return or_(
+        # New executor format
+        tc["type"].astext == "web_search",
+        # Legacy imported format
+        and_(
+            func.jsonb_typeof(tc["raw_items"]) == "object",
+            tc["raw_items"]["type"].astext == "web_search_call",
+        ),
+        # Fallback: check name field
+        name.contains("web_search", autoescape=True),
+        name.contains("web-search", autoescape=True),
+    )
+
+
+def stats_columns(name: str, value, condition=None) -> list:
+    """count/mean/median/std/min/max/p90/p99 aggregates of ``value`` over matching rows.
+
+    Non-matching rows are mapped to NULL, which every aggregate ignores.
+    """
+    value = cast(value, Float)
+    if condition is not None:
+        value = case((condition, value))
+    return [
+        func.count(value).label(f"{name}_n"),
+        func.avg(value).label(f"{name}_mean"),
+        func.percentile_cont(0.5).within_group(value).label(f"{name}_median"),
+        func.percentile_cont(0.9).within_group(value).label(f"{name}_p90"),
+        func.percentile_cont(0.99).within_group(value).label(f"{name}_p99"),
+        func.stddev_pop(value).label(f"{name}_std"),
+        func.min(value).label(f"{name}_min"),
+        func.max(value).label(f"{name}_max"),
+    ]
 
 
-def _compute_stats(values: list[float]) -> StatsOut:
-    if not values:
+def stats_from_row(row, name: str) -> StatsOut:
+    n = getattr(row, f"{name}_n")
+    if not n:
         return StatsOut()
-    n = len(values)
-    mean = sum(values) / n
-    s = sorted(values)
-    median = s[n // 2] if n % 2 else (s[n // 2 - 1] + s[n // 2]) / 2
-    variance = sum((x - mean) ** 2 for x in values) / n
-    std = math.sqrt(variance)
     return StatsOut(
-        mean=round(mean, 2),
-        median=round(median, 2),
-        std=round(std, 2),
-        min=round(min(values), 2),
-        max=round(max(values), 2),
+        mean=round(getattr(row, f"{name}_mean"), 2),
+        median=round(getattr(row, f"{name}_median"), 2),
+        std=round(getattr(row, f"{name}_std") or 0.0, 2),
+        min=round(getattr(row, f"{name}_min"), 2),
+        max=round(getattr(row, f"{name}_max"), 2),
+        p50=round(getattr(row, f"{name}_median"), 2),
+        p90=round(getattr(row, f"{name}_p90"), 2),
+        p99=round(getattr(row, f"{name}_p99"), 2),
         n=n,
     )
 
 
-def _grade_counts(grades: list[str]) -> GradeCountsOut:
-    c = p = w = 0
-    for g in grades:
-        if g == "correct":
-            c += 1
-        elif g == "partial":
-            p += 1
-        elif g == "wrong":
-            w += 1
+def _grade_counts(counts: dict[str, int]) -> GradeCountsOut:
+    c = counts.get("correct", 0)
+    p = counts.get("partial", 0)
+    w = counts.get("wrong", 0)
     total = c + p + w
     acc = round(c / total * 100, 1) if total else 0
     score = round((c + 0.5 * p) / total * 100, 1) if total else 0
+    intervals = grade_confidence_intervals(c, p, w)
     return GradeCountsOut(
-        correct=c, partial=p, wrong=w, total=total, accuracy=acc, weighted_score=score
+        correct=c,
+        partial=p,
+        wrong=w,
+        total=total,
+        accuracy=acc,
+        weighted_score=score,
+        accuracy_ci=intervals[0] if intervals else None,
+        weighted_score_ci=intervals[1] if intervals else None,
     )
 
 
 async def compute_run_analytics(run_id: int, db: AsyncSession) -> RunAnalyticsOut:
+    """Run analytics, served from the persisted snapshot for finished runs."""
     ctx = get_request_context()
     run_stmt = apply_workspace_filter(select(Run).where(Run.id == run_id), Run, ctx)
     run = (await db.execute(run_stmt)).scalar_one_or_none()
     if not run:
         raise ValueError("Run not found")
-    agent = await db.get(AgentConfig, run.agent_config_id)
-    model = agent.model if agent else ""
+    return (await _runs_analytics([run], db, ctx))[run.id]
+
+
+async def apply_grade_changes(
+    db: AsyncSession, run_id: int, changes: list[tuple[str | None, str | None, str | None]]
+) -> None:
+    """Patch the run's analytics snapshot for ``(tag, old_grade, new_grade)`` changes.
+
+    Must run in the same transaction as the grade writes.
+    """
+    if not changes:
+        return
+
+    def patch(payload: dict) -> dict:
+        totals = dict(payload["grade_counts"])
+        by_type = {qt: dict(counts) for qt, counts in payload["by_type"].items()}
+        for tag, old, new in changes:
+            counts = by_type.setdefault(tag or "unknown", {})
+            for target in (totals, counts):
+                if old in ("correct", "partial", "wrong"):
+                    target[old] = target.get(old, 0) - 1
+                if new in ("correct", "partial", "wrong"):
+                    target[new] = target.get(new, 0) + 1
+        payload = dict(payload)
+        payload["grade_counts"] = _grade_counts(totals).model_dump()
+        payload["by_type"] = {
+            qt: _grade_counts(counts).model_dump() for qt, counts in by_type.items()
+        }
+        return payload
 
-    results = (
+    await patch_run_analytics(db, run_id, patch)
+
+
+async def _runs_analytics(
+    runs: list[Run], db: AsyncSession, ctx
+) -> dict[int, RunAnalyticsOut]:
+    """Analytics for several runs: snapshots where current, one batch otherwise."""
+    snapshots = await load_snapshots(db, runs)
+    pricing_version = get_compiled_rate_card().version
+    out: dict[int, RunAnalyticsOut] = {}
+    stale: list[Run] = []
+    for run in runs:
+        payload, _ = snapshots[run.id]
+        if (
+            payload is not None
+            and payload.get("format") == _SNAPSHOT_FORMAT
+            # Costs in the payload were priced with this rate card
+            and (payload.get("pricing_rates") or {}).get("pricing_version") == pricing_version
+        ):
+            out[run.id] = RunAnalyticsOut.model_validate(payload)
+        else:
+            stale.append(run)
+    if not stale:
+        return out
+
+    computed = await _compute_runs_analytics(stale, db, ctx)
+    out.update(computed)
+    # Saved in its own transaction so the caller's session is left untouched
+    async with async_session() as snapshot_db:
+        for run in stale:
+            await save_snapshot(
+                snapshot_db,
+                run,
+                snapshots[run.id][1],
+                {"format": _SNAPSHOT_FORMAT, **computed[run.id].model_dump(mode="json")},
+            )
+        await snapshot_db.commit()
+    return out
+
+
+async def _compute_runs_analytics(
+    runs: list[Run], db: AsyncSession, ctx
+) -> dict[int, RunAnalyticsOut]:
+    """Compute analytics for ``runs`` with a fixed number of grouped queries."""
+    run_ids = [run.id for run in runs]
+    agent_ids = {run.agent_config_id for run in runs}
+    agent_models = dict(
         (
             await db.execute(
-                apply_workspace_filter(
-                    select(Result)
-                    .where(Result.run_id == run_id)
-                    .options(selectinload(Result.grade), selectinload(Result.query)),
-                    Result,
-                    ctx,
+                select(AgentConfig.id, AgentConfig.model).where(
+                    AgentConfig.id.in_(agent_ids)
                 )
             )
-        )
-        .scalars()
-        .all()
+        ).all()
     )
+    models = {run.id: agent_models.get(run.agent_config_id) or "" for run in runs}
 
-    grades = [r.grade.grade for r in results if r.grade]
-    grade_counts = _grade_counts(grades)
+    def scoped(stmt):
+        return apply_workspace_filter(
+            stmt.where(Result.run_id.in_(run_ids)), Result, ctx
+        )
 
-    # By query type
-    by_type: dict[str, list[str]] = {}
-    for r in results:
-        qt = r.query.tag or "unknown"
-        if qt not in by_type:
-            by_type[qt] = []
-        if r.grade:
-            by_type[qt].append(r.grade.grade)
-    by_type_out = {qt: _grade_counts(gs) for qt, gs in by_type.items()}
+    # Grade counts, overall and by query type
+    grade_rows = (
+        await db.execute(
+            scoped(
+                select(Result.run_id, Query.tag, Grade.grade, func.count())
+                .select_from(Result)
+                .join(Query, Query.id == Result.query_id)
+                .outerjoin(Grade, Grade.result_id == Result.id)
+                .group_by(Result.run_id, Query.tag, Grade.grade)
+            )
+        )
+    ).all()
+    totals: dict[int, dict[str, int]] = {rid: {} for rid in run_ids}
+    by_type: dict[int, dict[str, dict[str, int]]] = {rid: {} for rid in run_ids}
+    for rid, qt, grade, n in grade_rows:
+        counts = by_type[rid].setdefault(qt or "unknown", {})
+        if grade is not None:
+            counts[grade] = counts.get(grade, 0) + n
+            totals[rid][grade] = totals[rid].get(grade, 0) + n
 
     # Performance
-    times = [
-        r.execution_time_seconds
-        for r in results
-        if r.execution_time_seconds is not None
-    ]
-    tokens = [r.usage.get("total_tokens", 0) for r in results if r.usage]
-    tool_counts = [len(r.tool_calls) if r.tool_calls else 0 for r in results]
-    reasoning = [
-        r.usage.get("reasoning_tokens", 0)
-        for r in results
-        if r.usage and r.usage.get("reasoning_tokens")
-    ]
-
-    perf = {
-        "time": _compute_stats(times),
-        "tokens": _compute_stats([float(t) for t in tokens]),
-        "tools": _compute_stats([float(t) for t in tool_counts]),
-        "reasoning": _compute_stats([float(r) for r in reasoning]),
+    has_usage = and_(Result.usage.isnot(None), Result.usage != cast(literal("{}"), JSONB))
+    tool_count = case(
+        (
+            func.jsonb_typeof(ResultPayload.tool_calls) == "array",
+            func.jsonb_array_length(ResultPayload.tool_calls),
+        ),
+        else_=0,
+    )
+    reasoning_tokens = _usage_int("reasoning_tokens")
+    perf_rows = (
+        await db.execute(
+            scoped(
+                select(
+                    Result.run_id,
+                    *stats_columns(
+                        "time",
+                        Result.execution_time_seconds,
+                        Result.execution_time_seconds.isnot(None),
+                    ),
+                    *stats_columns("tokens", _usage_int("total_tokens"), has_usage),
+                    *stats_columns("tools", tool_count),
+                    *stats_columns(
+                        "reasoning", reasoning_tokens, and_(has_usage, reasoning_tokens != 0)
+                    ),
+                )
+                .outerjoin(ResultPayload, ResultPayload.result_id == Result.id)
+                .group_by(Result.run_id)
+            )
+        )
+    ).all()
+    perf: dict[int, dict[str, StatsOut]] = {
+        row.run_id: {
+            name: stats_from_row(row, name)
+            for name in ("time", "tokens", "tools", "reasoning")
+        }
+        for row in perf_rows
     }
 
     # Tool usage
-    tool_counter: Counter = Counter()
-    for r in results:
-        if r.tool_calls:
-            for tc in r.tool_calls:
-                label = _tool_call_label(tc)
-                tool_counter[label] += 1
+    tc = _tool_call_elements()
+    labels = scoped(
+        select(Result.run_id, _tool_call_label(tc).label("label"))
+        .select_from(Result)
+        .join(ResultPayload, ResultPayload.result_id == Result.id)
+    ).subquery()
+    tool_rows = (
+        await db.execute(
+            select(labels.c.run_id, labels.c.label, func.count()).group_by(
+                labels.c.run_id, labels.c.label
+            )
+        )
+    ).all()
+    tool_usage: dict[int, dict[str, int]] = {rid: {} for rid in run_ids}
+    for rid, name, n in tool_rows:
+        tool_usage[rid][name] = n
 
     # Cost summary + per-query cost breakdown
-    cost_totals = {
-        "total_cost_usd": 0.0,
-        "input_cost_usd": 0.0,
-        "cached_input_cost_usd": 0.0,
-        "output_cost_usd": 0.0,
-        "reasoning_output_cost_usd": 0.0,
-        "web_search_cost_usd": 0.0,
-        "web_search_calls": 0,
-        "input_tokens": 0,
-        "cached_tokens": 0,
-        "output_tokens": 0,
-        "reasoning_tokens": 0,
-    }
-    query_costs: list[dict] = []
-    for r in results:
-        b = calculate_cost(model, r.usage or {}, r.tool_calls if isinstance(r.tool_calls, list) else None)
-        cost_totals["total_cost_usd"] += b.total_usd
-        cost_totals["input_cost_usd"] += b.input_cost_usd
-        cost_totals["cached_input_cost_usd"] += b.cached_input_cost_usd
-        cost_totals["output_cost_usd"] += b.output_cost_usd
-        cost_totals["reasoning_output_cost_usd"] += b.reasoning_output_cost_usd
-        cost_totals["web_search_cost_usd"] += b.web_search_cost_usd
-        cost_totals["web_search_calls"] += b.web_search_calls
-        cost_totals["input_tokens"] += int(b.usage.get("input_tokens", 0) or 0)
-        cost_totals["cached_tokens"] += int(b.usage.get("cached_tokens", 0) or 0)
-        cost_totals["output_tokens"] += int(b.usage.get("output_tokens", 0) or 0)
-        cost_totals["reasoning_tokens"] += int(b.usage.get("reasoning_tokens", 0) or 0)
-
-        query_costs.append(
+    tc = _tool_call_elements()
+    priced = Result.pricing_version == get_compiled_rate_card().version
+    # Only rows without current stored costs read and unnest their tool calls
+    web_search_calls = case(
+        (priced, Result.web_search_calls),
+        else_=select(func.count())
+        .select_from(ResultPayload)
+        .where(ResultPayload.result_id == Result.id, _is_web_search_call(tc))
+        .scalar_subquery(),
+    )
+    cost_rows = (
+        await db.execute(
+            scoped(
+                select(
+                    Result.run_id,
+                    Result.query_id,
+                    Query.ordinal,
+                    func.left(func.coalesce(Query.query_text, ""), 120),
+                    _usage_int("input_tokens"),
+                    _usage_int("output_tokens"),
+                    _usage_int("cached_tokens"),
+                    reasoning_tokens,
+                    web_search_calls,
+                    priced,
+                    *(column for _, column in _STORED_COSTS),
+                )
+                .join(Query, Query.id == Result.query_id)
+                .order_by(Result.run_id, Query.ordinal, Result.id)
+            )
+        )
+    ).all()
+    rows_by_run: dict[int, list] = {rid: [] for rid in run_ids}
+    for row in cost_rows:
+        rows_by_run[row[0]].append(row)
+    cost_totals: dict[int, dict] = {}
+    query_costs: dict[int, list[dict]] = {}
+    result_costs: dict = {}
+    for rid, rows in rows_by_run.items():
+        columns = list(zip(*rows)) or [()] * (10 + len(_STORED_COSTS))
+        b = calculate_costs_from_counts(
+            models[rid],
+            input_tokens=columns[4],
+            output_tokens=columns[5],
+            cached_tokens=columns[6],
+            reasoning_tokens=columns[7],
+            web_search_calls=[n or 0 for n in columns[8]],
+        )
+        fresh = np.asarray([bool(p) for p in columns[9]], dtype=bool)
+        if fresh.any():
+            # Stored costs were priced with the model the result ran on
+            for (name, _), stored in zip(_STORED_COSTS, columns[10:]):
+                values = np.asarray([v or 0.0 for v in stored], dtype=float)
+                setattr(b, name, np.where(fresh, values, getattr(b, name)))
+        cost_totals[rid] = {
+            "total_cost_usd": float(b.total_usd.sum()),
+            "input_cost_usd": float(b.input_cost_usd.sum()),
+            "cached_input_cost_usd": float(b.cached_input_cost_usd.sum()),
+            "output_cost_usd": float(b.output_cost_usd.sum()),
+            "reasoning_output_cost_usd": float(b.reasoning_output_cost_usd.sum()),
+            "web_search_cost_usd": float(b.web_search_cost_usd.sum()),
+            "web_search_calls": int(b.web_search_calls.sum()),
+            "input_tokens": int(b.input_tokens.sum()),
+            "cached_tokens": int(b.cached_tokens.sum()),
+            "output_tokens": int(b.output_tokens.sum()),
+            "reasoning_tokens": int(b.reasoning_tokens.sum()),
+        }
+        result_costs[rid] = b.total_usd
+        costs = {
+            name: getattr(b, name).tolist()
+            for name in (
+                "total_usd",
+                "input_cost_usd",
+                "cached_input_cost_usd",
+                "output_cost_usd",
+                "reasoning_output_cost_usd",
+                "web_search_cost_usd",
+                "web_search_calls",
+                "input_tokens",
+                "output_tokens",
+                "cached_tokens",
+                "reasoning_tokens",
+            )
+        }
+        query_costs[rid] = [
             {
-                "query_id": r.query_id,
-                "ordinal": r.query.ordinal if r.query else 0,
-                "query_text": (r.query.query_text[:120] if r.query and r.query.query_text else ""),
-                "total_cost_usd": round(b.total_usd, 6),
-                "input_cost_usd": round(b.input_cost_usd, 6),
-                "cached_input_cost_usd": round(b.cached_input_cost_usd, 6),
-                "output_cost_usd": round(b.output_cost_usd, 6),
-                "reasoning_output_cost_usd": round(b.reasoning_output_cost_usd, 6),
-                "web_search_cost_usd": round(b.web_search_cost_usd, 6),
-                "web_search_calls": b.web_search_calls,
-                "usage": b.usage,
+                "query_id": row[1],
+                "ordinal": row[2],
+                "query_text": row[3],
+                "total_cost_usd": round(costs["total_usd"][i], 6),
+                "input_cost_usd": round(costs["input_cost_usd"][i], 6),
+                "cached_input_cost_usd": round(costs["cached_input_cost_usd"][i], 6),
+                "output_cost_usd": round(costs["output_cost_usd"][i], 6),
+                "reasoning_output_cost_usd": round(costs["reasoning_output_cost_usd"][i], 6),
+                "web_search_cost_usd": round(costs["web_search_cost_usd"][i], 6),
+                "web_search_calls": costs["web_search_calls"][i],
+                "usage": {
+                    "input_tokens": costs["input_tokens"][i],
+                    "output_tokens": costs["output_tokens"][i],
+                    "cached_tokens": costs["cached_tokens"][i],
+                    "reasoning_tokens": costs["reasoning_tokens"][i],
+                },
             }
+            for i, row in enumerate(rows)
+        ]
+
+    empty_perf = {name: StatsOut() for name in ("time", "tokens", "tools", "reasoning")}
+    for rid in run_ids:
+        perf.setdefault(rid, dict(empty_perf))["cost"] = describe(result_costs[rid], digits=6)
+    return {
+        run.id: RunAnalyticsOut(
+            run_id=run.id,
+            label=run.label,
+            grade_counts=_grade_counts(totals[run.id]),
+            by_type={qt: _grade_counts(c) for qt, c in by_type[run.id].items()},
+            performance=perf[run.id],
+            tool_usage=tool_usage[run.id],
+            pricing_rates=get_rate_card(models[run.id]),
+            cost_summary={
+                k: (round(v, 6) if isinstance(v, float) else v)
+                for k, v in cost_totals[run.id].items()
+            },
+            query_costs=query_costs[run.id],
         )
-    query_costs.sort(key=lambda x: x["ordinal"])
-    cost_totals = {
-        k: (round(v, 6) if isinstance(v, float) else v)
-        for k, v in cost_totals.items()
+        for run in runs
     }
 
-    return RunAnalyticsOut(
-        run_id=run_id,
-        label=run.label,
-        grade_counts=grade_counts,
-        by_type=by_type_out,
-        performance=perf,
-        tool_usage=dict(tool_counter),
-        pricing_rates=get_rate_card(model),
-        cost_summary=cost_totals,
-        query_costs=query_costs,
-    )
-
 
 async def compute_compare_analytics(
     run_ids: list[int], db: AsyncSession
 ) -> CompareAnalyticsOut:
     ctx = get_request_context()
-    runs_analytics = []
-    for rid in run_ids:
-        try:
-            analytics = await compute_run_analytics(rid, db)
-            runs_analytics.append(analytics)
-        except ValueError:
-            pass
-
-    # Consistency + per-query grades across runs
-    # Load all results keyed by query_id
+    run_stmt = apply_workspace_filter(select(Run).where(Run.id.in_(run_ids)), Run, ctx)
+    found = {run.id: run for run in (await db.execute(run_stmt)).scalars().all()}
+    runs = [found[rid] for rid in dict.fromkeys(run_ids) if rid in found]
+    analytics_by_run = await _runs_analytics(runs, db, ctx)
+    runs_analytics = [analytics_by_run[run.id] for run in runs]
+
+    # Consistency + per-query grades across runs, from one narrow pass over
+    # every run's results
     all_grades_by_query: dict[int, list[str]] = {}
     # {query_id: {run_id: grade}}
     grade_map: dict[int, dict[int, str]] = {}
@@ -221,46 +492,61 @@ async def compute_compare_analytics(
     response_map: dict[int, dict[int, dict[str, str | None]]] = {}
     # {query_id: {run_id: result_id}}
     result_id_map: dict[int, dict[int, int]] = {}
-    query_meta: dict[int, dict] = {}
 
-    for rid in run_ids:
-        results = (
-            (
-                await db.execute(
-                    apply_workspace_filter(
-                        select(Result)
-                        .where(Result.run_id == rid)
-                        .options(selectinload(Result.grade), selectinload(Result.query)),
-                        Result,
-                        ctx,
-                    )
+    scoped_ids = [run.id for run in runs]
+    rows = (
+        await db.execute(
+            apply_workspace_filter(
+                select(
+                    Result.id,
+                    Result.run_id,
+                    Result.query_id,
+                    Grade.grade,
+                    ResultPayload.agent_response,
+                    Result.error,
+                    ResultPayload.tool_calls,
+                    ResultPayload.reasoning,
+                    Result.usage,
+                    Result.execution_time_seconds,
                 )
+                .outerjoin(ResultPayload, ResultPayload.result_id == Result.id)
+                .outerjoin(Grade, Grade.result_id == Result.id)
+                .where(Result.run_id.in_(scoped_ids))
+                # Default versions come last so they win the per-run slots
+                .order_by(Result.is_default_version, Result.id),
+                Result,
+                ctx,
             )
-            .scalars()
-            .all()
         )
-        for r in results:
-            if r.grade:
-                all_grades_by_query.setdefault(r.query_id, []).append(r.grade.grade)
-                grade_map.setdefault(r.query_id, {})[rid] = r.grade.grade
-            response_map.setdefault(r.query_id, {})[rid] = {
-                "agent_response": r.agent_response,
-                "error": r.error,
-                "tool_calls": r.tool_calls,
-                "reasoning": r.reasoning,
-                "usage": r.usage,
-                "execution_time_seconds": r.execution_time_seconds,
-            }
-            result_id_map.setdefault(r.query_id, {})[rid] = r.id
-            if r.query and r.query_id not in query_meta:
-                query_meta[r.query_id] = {
-                    "query_id": r.query_id,
-                    "ordinal": r.query.ordinal,
-                    "query_text": r.query.query_text,
-                    "expected_answer": r.query.expected_answer,
-                    "comments": r.query.comments,
-                    "tag": r.query.tag,
-                }
+    ).all()
+    for r in rows:
+        if r.grade:
+            all_grades_by_query.setdefault(r.query_id, []).append(r.grade)
+            grade_map.setdefault(r.query_id, {})[r.run_id] = r.grade
+        response_map.setdefault(r.query_id, {})[r.run_id] = {
+            "agent_response": r.agent_response,
+            "error": r.error,
+            "tool_calls": r.tool_calls,
+            "reasoning": r.reasoning,
+            "usage": r.usage,
+            "execution_time_seconds": r.execution_time_seconds,
+        }
+        result_id_map.setdefault(r.query_id, {})[r.run_id] = r.id
+
+    query_rows = []
+    if response_map:
+        query_rows = (
+            await db.execute(
+                select(
+                    Query.id,
+                    Query.ordinal,
+                    Query.query_text,
+                    Query.expected_answer,
+                    Query.comments,
+                    Query.tag,
+                ).where(Query.id.in_(list(response_map)))
+            )
+        ).all()
 
     consistency = {
         "all_correct": 0,
@@ -281,14 +567,36 @@ async def compute_compare_analytics(
         else:
             consistency["inconsistent"] += 1
 
+    # Paired significance tests on the queries both runs have graded
+    significance = []
+    for i, run_a in enumerate(runs):
+        for run_b in runs[i + 1 :]:
+            pairs = [
+                (grades[run_a.id], grades[run_b.id])
+                for grades in grade_map.values()
+                if run_a.id in grades and run_b.id in grades
+            ]
+            significance.append(
+                {
+                    "run_a": run_a.id,
+                    "run_b": run_b.id,
+                    **paired_comparison([a for a, _ in pairs], [b for _, b in pairs]),
+                }
+            )
+
     # Build query_grades list sorted by ordinal
     query_grades = []
-    for qid, meta in query_meta.items():
+    for q in query_rows:
         query_grades.append({
-            **meta,
-            "grades": grade_map.get(qid, {}),
-            "responses": response_map.get(qid, {}),
-            "result_ids": result_id_map.get(qid, {}),
+            "query_id": q.id,
+            "ordinal": q.ordinal,
+            "query_text": q.query_text,
+            "expected_answer": q.expected_answer,
+            "comments": q.comments,
+            "tag": q.tag,
+            "grades": grade_map.get(q.id, {}),
+            "responses": response_map.get(q.id, {}),
+            "result_ids": result_id_map.get(q.id, {}),
         })
     query_grades.sort(key=lambda x: x["ordinal"])
 
@@ -296,4 +604,5 @@ async def compute_compare_analytics(
         runs=runs_analytics,
         consistency=consistency,
         query_grades=query_grades,
+        significance=significance,
     )
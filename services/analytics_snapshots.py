@@ -0,0 +1,127 @@
+"""Persisted per-run analytics snapshots.
+
+Each run has at most one ``run_analytics_snapshots`` row holding the last
+computed ``RunAnalyticsOut`` payload. ``version`` is bumped in the same
+transaction as every write that changes the run's results or grades, and a
+payload is only served while ``computed_version == version`` and the run is
+still the finished run it was computed for (same ``completed_at``). Runs that
+are still executing are never snapshotted.
+
+Grade writes patch a current payload in place (``patch_run_analytics``), so a
+regrade keeps the snapshot warm; other writes just invalidate it and the next
+read recomputes. Both create the row (with no payload) when the run has none
+yet, so the version is bumped even while a first computation is in flight and
+that computation's ``save_snapshot`` is then discarded.
+"""
+
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.run import Run
+from models.run_analytics_snapshot import RunAnalyticsSnapshot
+
+FINISHED_RUN_STATUSES = ("completed", "failed", "cancelled")
+
+
+def _is_finished(run: Run) -> bool:
+    return run.status in FINISHED_RUN_STATUSES and run.completed_at is not None
+
+
+async def load_snapshots(
+    db: AsyncSession, runs: list[Run]
+) -> dict[int, tuple[dict | None, int]]:
+    """Map each run id to ``(payload, version)``; payload is None unless current.
+
+    The version is what a fresh computation must be saved against.
+    """
+    rows = (
+        await db.execute(
+            select(RunAnalyticsSnapshot).where(
+                RunAnalyticsSnapshot.run_id.in_([run.id for run in runs])
+            )
+        )
+    ).scalars().all()
+    by_run = {row.run_id: row for row in rows}
+    out: dict[int, tuple[dict | None, int]] = {}
+    for run in runs:
+        snapshot = by_run.get(run.id)
+        if snapshot is None:
+            out[run.id] = (None, 0)
+        elif (
+            snapshot.payload is not None
+            and snapshot.computed_version == snapshot.version
+            and _is_finished(run)
+            and snapshot.run_completed_at == run.completed_at
+        ):
+            out[run.id] = (snapshot.payload, snapshot.version)
+        else:
+            out[run.id] = (None, snapshot.version)
+    return out
+
+
+async def save_snapshot(db: AsyncSession, run: Run, version: int, payload: dict) -> None:
+    """Store a payload computed at ``version``; dropped if the run changed since."""
+    if not _is_finished(run):
+        return
+    values = {
+        "run_id": run.id,
+        "version": version,
+        "computed_version": version,
+        "run_completed_at": run.completed_at,
+        "payload": payload,
+        "computed_at": datetime.now(timezone.utc),
+    }
+    stmt = pg_insert(RunAnalyticsSnapshot).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RunAnalyticsSnapshot.run_id],
+        set_={
+            k: stmt.excluded[k]
+            for k in ("computed_version", "run_completed_at", "payload", "computed_at")
+        },
+        where=RunAnalyticsSnapshot.version == version,
+    )
+    await db.execute(stmt)
+
+
+async def invalidate_run_analytics(db: AsyncSession, run_id: int) -> None:
+    """Mark the run's snapshot stale; call before committing the data change."""
+    stmt = pg_insert(RunAnalyticsSnapshot).values(run_id=run_id, version=1)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[RunAnalyticsSnapshot.run_id],
+            set_={"version": RunAnalyticsSnapshot.version + 1},
+        )
+    )
+
+
+async def patch_run_analytics(
+    db: AsyncSession, run_id: int, patch: Callable[[dict], dict]
+) -> None:
+    """Apply ``patch`` to a current snapshot, or invalidate a stale one.
+
+    The row is locked until the caller commits, so concurrent writers to the
+    same run apply their patches one after another.
+    """
+    await db.execute(
+        pg_insert(RunAnalyticsSnapshot)
+        .values(run_id=run_id, version=0)
+        .on_conflict_do_nothing(index_elements=[RunAnalyticsSnapshot.run_id])
+    )
+    snapshot = (
+        await db.execute(
+            select(RunAnalyticsSnapshot)
+            .where(RunAnalyticsSnapshot.run_id == run_id)
+            .with_for_update()
+        )
+    ).scalar_one()
+    current = (
+        snapshot.payload is not None and snapshot.computed_version == snapshot.version
+    )
+    snapshot.version += 1
+    if current:
+        snapshot.payload = patch(snapshot.payload)
+        snapshot.computed_version = snapshot.version
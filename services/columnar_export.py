@@ -0,0 +1,331 @@
+"""Columnar (Parquet / Arrow IPC) export of run results for offline analysis.
+
+One row per result, with its run, agent model, query, grade, flattened usage
+and the same per-result cost breakdown ``compute_run_analytics`` reports.
+Costs are the columns stored on ``results``; only rows priced with an older
+rate card are repriced here. Low-cardinality strings (run label/status, model,
+executor, tag, grade) are dictionary-encoded so pandas loads them as
+categoricals. ``result_payloads`` is only joined when text or tool call counts
+are requested.
+
+Results are read through a server-side cursor and written out one row group
+(Parquet) or record batch (Arrow) at a time, so memory is bounded by
+``ROW_GROUP_SIZE`` regardless of how many results are exported.
+
+Requires the optional ``pyarrow`` dependency (``pip install axiom[export]``).
+"""
+
+import importlib.util
+from collections.abc import AsyncIterator
+
+from sqlalchemy import case, func, select
+
+from database import async_session
+from models.agent import AgentConfig
+from models.grade import Grade
+from models.query import Query
+from models.result import Result
+from models.result_payload import ResultPayload
+from models.run import Run
+from services.openai_pricing import calculate_costs, get_compiled_rate_card
+
+ROW_GROUP_SIZE = 50_000
+_FETCH_SIZE = 1000
+
+_USAGE_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cached_tokens",
+    "reasoning_tokens",
+    "total_tokens",
+)
+_COST_FIELDS = (
+    "total_cost_usd",
+    "input_cost_usd",
+    "cached_input_cost_usd",
+    "output_cost_usd",
+    "reasoning_output_cost_usd",
+    "web_search_cost_usd",
+)
+_TEXT_FIELDS = ("query_text", "expected_answer", "agent_response")
+
+
+def pyarrow_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _schema(include_text: bool, include_tool_calls: bool):
+    import pyarrow as pa
+
+    category = pa.dictionary(pa.int32(), pa.string())
+    fields = [
+        pa.field("run_id", pa.int64()),
+        pa.field("run_label", category),
+        pa.field("run_group", pa.string()),
+        pa.field("run_status", category),
+        pa.field("suite_id", pa.int64()),
+        pa.field("agent_config_id", pa.int64()),
+        pa.field("executor_type", category),
+        pa.field("model", category),
+        pa.field("result_id", pa.int64()),
+        pa.field("trace_log_id", pa.int64()),
+        pa.field("query_id", pa.int64()),
+        pa.field("query_ordinal", pa.int32()),
+        pa.field("tag", category),
+        pa.field("version_number", pa.int32()),
+        pa.field("is_default_version", pa.bool_()),
+        pa.field("grade", category),
+        pa.field("execution_time_seconds", pa.float64()),
+        pa.field("web_search_calls", pa.int32()),
+        pa.field("error", pa.string()),
+        pa.field("created_at", pa.timestamp("us", tz="UTC")),
+    ]
+    fields += [pa.field(name, pa.int64()) for name in _USAGE_FIELDS]
+    fields += [pa.field(name, pa.float64()) for name in _COST_FIELDS]
+    if include_tool_calls:
+        fields.append(pa.field("tool_call_count", pa.int32()))
+    if include_text:
+        fields += [pa.field(name, pa.large_string()) for name in _TEXT_FIELDS]
+    return pa.schema(fields)
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to the caller."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _billed_usage(usage: dict) -> dict:
+    """Token counts as billed: cached/reasoning clamped to their parents."""
+    input_tokens = int(usage.get("input_tokens", 0) or 0)
+    output_tokens = int(usage.get("output_tokens", 0) or 0)
+    cached_tokens = int(usage.get("cached_tokens", 0) or 0)
+    reasoning_tokens = int(usage.get("reasoning_tokens", 0) or 0)
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cached_tokens": max(min(cached_tokens, input_tokens), 0),
+        "reasoning_tokens": max(min(reasoning_tokens, output_tokens), 0),
+        "total_tokens": int(usage.get("total_tokens", 0) or 0),
+    }
+
+
+def _reprice_stale(model: str, rows: list[dict], stale: list) -> None:
+    """Overwrite the stored costs of rows priced with an older rate card."""
+    if not stale:
+        return
+    batch = calculate_costs(
+        model,
+        [r.usage for _, r in stale],
+        [r.stale_tool_calls if isinstance(r.stale_tool_calls, list) else None for _, r in stale],
+    )
+    columns = {
+        "total_cost_usd": batch.total_usd.tolist(),
+        "input_cost_usd": batch.input_cost_usd.tolist(),
+        "cached_input_cost_usd": batch.cached_input_cost_usd.tolist(),
+        "output_cost_usd": batch.output_cost_usd.tolist(),
+        "reasoning_output_cost_usd": batch.reasoning_output_cost_usd.tolist(),
+        "web_search_cost_usd": batch.web_search_cost_usd.tolist(),
+        "web_search_calls": batch.web_search_calls.tolist(),
+    }
+    for k, (index, _) in enumerate(stale):
+        for name, values in columns.items():
+            rows[index][name] = values[k]
+
+
+async def _iter_rows(
+    run_ids: list[int], include_text: bool, include_tool_calls: bool
+) -> AsyncIterator[dict]:
+    version = get_compiled_rate_card().version
+    stale = Result.pricing_version.is_distinct_from(version)
+    async with async_session() as db:
+        run_rows = (
+            await db.execute(
+                select(
+                    Run.id,
+                    Run.label,
+                    Run.run_group,
+                    Run.status,
+                    Run.suite_id,
+                    Run.agent_config_id,
+                    AgentConfig.executor_type,
+                    AgentConfig.model,
+                )
+                .outerjoin(AgentConfig, AgentConfig.id == Run.agent_config_id)
+                .where(Run.id.in_(run_ids))
+            )
+        ).all()
+        runs = {row.id: row for row in run_rows}
+
+        columns = [
+            Result.id,
+            Result.trace_log_id,
+            Result.query_id,
+            Query.ordinal,
+            Query.tag,
+            Result.version_number,
+            Result.is_default_version,
+            Grade.grade,
+            Result.execution_time_seconds,
+            Result.usage,
+            Result.error,
+            Result.created_at,
+            Result.web_search_calls,
+            *(getattr(Result, name) for name in _COST_FIELDS),
+            stale.label("stale"),
+            # Only rows without current stored costs read their tool calls
+            case(
+                (
+                    stale,
+                    select(ResultPayload.tool_calls)
+                    .where(ResultPayload.result_id == Result.id)
+                    .correlate(Result)
+                    .scalar_subquery(),
+                )
+            ).label("stale_tool_calls"),
+        ]
+        if include_tool_calls:
+            columns.append(
+                case(
+                    (
+                        func.jsonb_typeof(ResultPayload.tool_calls) == "array",
+                        func.jsonb_array_length(ResultPayload.tool_calls),
+                    ),
+                    else_=0,
+                ).label("tool_call_count")
+            )
+        if include_text:
+            columns += [Query.query_text, Query.expected_answer, ResultPayload.agent_response]
+
+        for rid in run_ids:
+            run = runs.get(rid)
+            if run is None:
+                continue
+            stmt = (
+                select(*columns)
+                .join(Query, Query.id == Result.query_id)
+                .outerjoin(Grade, Grade.result_id == Result.id)
+            )
+            if include_text or include_tool_calls:
+                stmt = stmt.outerjoin(ResultPayload, ResultPayload.result_id == Result.id)
+            stmt = (
+                stmt.where(Result.run_id == rid)
+                .order_by(Result.id)
+                .execution_options(yield_per=_FETCH_SIZE)
+            )
+            result = await db.stream(stmt)
+            async for partition in result.partitions():
+                rows = []
+                stale_rows = []
+                for r in partition:
+                    row = {
+                        "run_id": run.id,
+                        "run_label": run.label,
+                        "run_group": run.run_group,
+                        "run_status": run.status,
+                        "suite_id": run.suite_id,
+                        "agent_config_id": run.agent_config_id,
+                        "executor_type": run.executor_type,
+                        "model": run.model,
+                        "result_id": r.id,
+                        "trace_log_id": r.trace_log_id,
+                        "query_id": r.query_id,
+                        "query_ordinal": r.ordinal,
+                        "tag": r.tag,
+                        "version_number": r.version_number,
+                        "is_default_version": r.is_default_version,
+                        "grade": r.grade,
+                        "execution_time_seconds": r.execution_time_seconds,
+                        "web_search_calls": r.web_search_calls,
+                        "error": r.error,
+                        "created_at": r.created_at,
+                        **_billed_usage(r.usage or {}),
+                    }
+                    for name in _COST_FIELDS:
+                        row[name] = getattr(r, name)
+                    if include_tool_calls:
+                        row["tool_call_count"] = r.tool_call_count
+                    if include_text:
+                        for name in _TEXT_FIELDS:
+                            row[name] = getattr(r, name)
+                    if r.stale:
+                        stale_rows.append((len(rows), r))
+                    rows.append(row)
+                _reprice_stale(run.model or "", rows, stale_rows)
+                for row in rows:
+                    yield row
+
+
+async def stream_columnar_export(
+    run_ids: list[int],
+    fmt: str,
+    include_text: bool = False,
+    include_tool_calls: bool = False,
+) -> AsyncIterator[bytes]:
+    """Yield a Parquet file or Arrow IPC stream of the given runs' results.
+
+    ``run_ids`` must already be authorized; runs are exported in that order.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _schema(include_text, include_tool_calls)
+    sink = _ChunkSink()
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    batch = {name: [] for name in schema.names}
+    size = 0
+
+    def write_batch():
+        table = pa.Table.from_pydict(batch, schema=schema)
+        if fmt == "parquet":
+            writer.write_table(table, row_group_size=ROW_GROUP_SIZE)
+        else:
+            writer.write_table(table, max_chunksize=ROW_GROUP_SIZE)
+        for values in batch.values():
+            values.clear()
+
+    async for row in _iter_rows(run_ids, include_text, include_tool_calls):
+        for name, values in batch.items():
+            values.append(row[name])
+        size += 1
+        if size >= ROW_GROUP_SIZE:
+            write_batch()
+            size = 0
+            yield sink.drain()
+    if size:
+        write_batch()
+    writer.close()
+    yield sink.drain()
@@ -15,6 +15,7 @@ async def get_or_404(
     id: int,
     name: str | None = None,
     enforce_workspace_scope: bool = True,
+    options: list | None = None,
 ) -> T:
     """Fetch a model instance by ID or raise 404 if not found.
     
@@ -24,6 +25,7 @@ async def get_or_404(
         id: Primary key ID to fetch
         name: Optional custom name for error message. If None, uses the model's 
               class name (e.g., "AgentConfig" becomes "AgentConfig not found").
+        options: Optional loader options, e.g. ``[selectinload(Model.payload)]``
         
     Returns:
         Model instance
@@ -31,7 +33,7 @@ async def get_or_404(
     Raises:
         HTTPException: 404 if not found, with message "{name} not found"
     """
-    obj = await db.get(model, id)
+    obj = await db.get(model, id, options=options)
     if not obj:
         entity_name = name or model.__name__
         raise HTTPException(404, f"{entity_name} not found")
@@ -0,0 +1,265 @@
+"""Opt-in content-addressed cache of agent executions.
+
+Entries are keyed by a SHA-256 of the executor type, the full executor config
+(system prompt, model, tools, model settings) and the query text, so only
+byte-identical requests replay. Only successful results are stored. A hit
+returns the stored ``ExecutionResult`` with ``cache_hit=True`` and costs no
+API call, which makes repeated regression runs and dry-runs of deterministic
+configs instant.
+
+Two stores are available (``EXECUTION_CACHE_BACKEND``):
+
+- ``postgres``: the ``execution_cache`` table, shared by all processes.
+- ``disk``: one JSON file per key under ``EXECUTION_CACHE_DIR``.
+
+Entries expire after ``EXECUTION_CACHE_TTL_SECONDS``; when more than
+``EXECUTION_CACHE_MAX_ENTRIES`` remain, the least recently used are evicted.
+Cache failures are logged and never fail the execution itself.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from loguru import logger
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from config import get_settings
+from database import async_session
+from executors.base import AgentExecutor, ExecutionResult
+from models.execution_cache_entry import ExecutionCacheEntry
+
+# Eviction is amortized: run it once per this many stores in each process
+_EVICT_EVERY = 100
+
+
+def cache_key(executor_type: str, query: str, config: dict) -> str:
+    payload = {"executor_type": executor_type, "config": config, "query": query}
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _serialize(result: ExecutionResult) -> dict:
+    return {
+        "response": result.response,
+        "tool_calls": result.tool_calls,
+        "reasoning": result.reasoning,
+        "usage": result.usage,
+        "execution_time_seconds": result.execution_time_seconds,
+    }
+
+
+def _deserialize(data: dict) -> ExecutionResult:
+    return ExecutionResult(
+        response=data.get("response") or "",
+        tool_calls=data.get("tool_calls") or [],
+        reasoning=data.get("reasoning") or [],
+        usage=data.get("usage") or {},
+        execution_time_seconds=data.get("execution_time_seconds") or 0.0,
+        cache_hit=True,
+    )
+
+
+class PostgresCacheStore:
+    async def get(self, key: str) -> dict | None:
+        now = datetime.now(timezone.utc)
+        async with async_session() as db:
+            stmt = (
+                update(ExecutionCacheEntry)
+                .where(
+                    ExecutionCacheEntry.cache_key == key,
+                    ExecutionCacheEntry.expires_at > now,
+                )
+                .values(
+                    hit_count=ExecutionCacheEntry.hit_count + 1,
+                    last_used_at=now,
+                )
+                .returning(ExecutionCacheEntry.result)
+                .execution_options(synchronize_session=False)
+            )
+            data = (await db.execute(stmt)).scalar_one_or_none()
+            await db.commit()
+            return data
+
+    async def put(
+        self, key: str, executor_type: str, model: str | None, data: dict, ttl: int
+    ):
+        now = datetime.now(timezone.utc)
+        values = {
+            "cache_key": key,
+            "executor_type": executor_type,
+            "model": model,
+            "result": data,
+            "size_bytes": len(json.dumps(data, default=str)),
+            "created_at": now,
+            "last_used_at": now,
+            "expires_at": now + timedelta(seconds=ttl),
+        }
+        stmt = pg_insert(ExecutionCacheEntry).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ExecutionCacheEntry.cache_key],
+            set_={
+                k: stmt.excluded[k]
+                for k in ("result", "size_bytes", "created_at", "last_used_at", "expires_at")
+            },
+        )
+        async with async_session() as db:
+            await db.execute(stmt)
+            await db.commit()
+
+    async def evict(self, max_entries: int):
+        now = datetime.now(timezone.utc)
+        async with async_session() as db:
+            await db.execute(
+                delete(ExecutionCacheEntry).where(ExecutionCacheEntry.expires_at <= now)
+            )
+            total = (
+                await db.execute(select(func.count()).select_from(ExecutionCacheEntry))
+            ).scalar_one()
+            if total > max_entries:
+                oldest = (
+                    select(ExecutionCacheEntry.cache_key)
+                    .order_by(ExecutionCacheEntry.last_used_at)
+                    .limit(total - max_entries)
+                )
+                await db.execute(
+                    delete(ExecutionCacheEntry).where(
+                        ExecutionCacheEntry.cache_key.in_(oldest)
+                    )
+                )
+            await db.commit()
+
+
+class DiskCacheStore:
+    """One ``<key>.json`` per entry, sharded by the first two hex digits.
+
+    The file's mtime doubles as the last-used time for LRU eviction.
+    """
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = base_dir
+
+    def _path(self, key: str) -> Path:
+        return self.base_dir / key[:2] / f"{key}.json"
+
+    def _get_sync(self, key: str) -> dict | None:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if entry.get("expires_at", 0) <= time.time():
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)
+        return entry.get("result")
+
+    def _put_sync(self, key: str, data: dict, ttl: int):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(
+            json.dumps({"expires_at": time.time() + ttl, "result": data}, default=str)
+        )
+        tmp.replace(path)
+
+    def _evict_sync(self, max_entries: int):
+        now = time.time()
+        ttl = get_settings().EXECUTION_CACHE_TTL_SECONDS
+        entries = []
+        for path in self.base_dir.glob("*/*"):
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            # Not used for a whole TTL means expired (expiry counts from
+            # creation); younger expired entries are dropped on read.
+            if now - mtime > ttl or (path.suffix == ".tmp" and now - mtime > 3600):
+                path.unlink(missing_ok=True)
+            elif path.suffix == ".json":
+                entries.append((mtime, path))
+        entries.sort()
+        for _, path in entries[: max(0, len(entries) - max_entries)]:
+            path.unlink(missing_ok=True)
+
+    async def get(self, key: str) -> dict | None:
+        return await asyncio.to_thread(self._get_sync, key)
+
+    async def put(
+        self, key: str, executor_type: str, model: str | None, data: dict, ttl: int
+    ):
+        await asyncio.to_thread(self._put_sync, key, data, ttl)
+
+    async def evict(self, max_entries: int):
+        await asyncio.to_thread(self._evict_sync, max_entries)
+
+
+class ExecutionCache:
+    def __init__(self):
+        self._store = None
+        self._backend: str | None = None
+        self._stores_since_evict = 0
+
+    @property
+    def enabled(self) -> bool:
+        return get_settings().EXECUTION_CACHE_ENABLED
+
+    def _get_store(self):
+        settings = get_settings()
+        backend = settings.EXECUTION_CACHE_BACKEND
+        if self._store is None or backend != self._backend:
+            if backend == "disk":
+                base = settings.EXECUTION_CACHE_DIR or str(
+                    Path(settings.OUTPUT_BASE_DIR) / ".execution_cache"
+                )
+                self._store = DiskCacheStore(Path(base).expanduser())
+            elif backend == "postgres":
+                self._store = PostgresCacheStore()
+            else:
+                raise ValueError(f"Unknown execution cache backend: {backend}")
+            self._backend = backend
+        return self._store
+
+    async def lookup(
+        self, executor: AgentExecutor, query: str, config: dict
+    ) -> ExecutionResult | None:
+        if not self.enabled:
+            return None
+        key = cache_key(executor.executor_type(), query, config)
+        try:
+            data = await self._get_store().get(key)
+        except Exception:
+            logger.exception("Execution cache lookup failed")
+            return None
+        return _deserialize(data) if data is not None else None
+
+    async def store(
+        self, executor: AgentExecutor, query: str, config: dict, result: ExecutionResult
+    ):
+        if not self.enabled or result.error or result.cache_hit:
+            return
+        settings = get_settings()
+        key = cache_key(executor.executor_type(), query, config)
+        try:
+            store = self._get_store()
+            await store.put(
+                key,
+                executor.executor_type(),
+                config.get("model"),
+                _serialize(result),
+                settings.EXECUTION_CACHE_TTL_SECONDS,
+            )
+            self._stores_since_evict += 1
+            if self._stores_since_evict >= _EVICT_EVERY:
+                self._stores_since_evict = 0
+                await store.evict(settings.EXECUTION_CACHE_MAX_ENTRIES)
+        except Exception:
+            logger.exception("Execution cache store failed")
+
+
+execution_cache = ExecutionCache()
@@ -29,7 +29,11 @@ async def generate_export_html(run_ids: list[int], db: AsyncSession) -> str:
                     apply_workspace_filter(
                         select(Result)
                         .where(Result.run_id == rid)
-                        .options(selectinload(Result.grade), selectinload(Result.query))
+                        .options(
+                            selectinload(Result.grade),
+                            selectinload(Result.query),
+                            selectinload(Result.payload),
+                        )
                         .order_by(Result.query_id),
                         Result,
                         ctx,
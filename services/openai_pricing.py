@@ -3,6 +3,8 @@ from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
+
 
 _PRICING_FILE = Path(__file__).resolve().parent.parent / "data" / "openai_pricing.json"
 
@@ -12,18 +14,6 @@ def load_pricing() -> dict:
     return json.loads(_PRICING_FILE.read_text())
 
 
-def _find_model_key(model: str, pricing: dict) -> str | None:
-    models = pricing.get("models", {})
-    if model in models:
-        return model
-    # Resolve dated/suffixed variants like gpt-4.1-2025-xx
-    by_length = sorted(models.keys(), key=len, reverse=True)
-    for prefix in by_length:
-        if model.startswith(prefix):
-            return prefix
-    return None
-
-
 def _web_search_calls(tool_calls: list[dict] | None) -> int:
     if not tool_calls:
         return 0
@@ -45,35 +35,90 @@ def _web_search_calls(tool_calls: list[dict] | None) -> int:
     return count
 
 
-def _web_search_price_per_call(model: str, pricing: dict) -> float:
-    tools = pricing.get("tools", {}).get("web_search", {})
-    default_rate = float(tools.get("default_per_call_usd", 0))
-    for prefix, rate in (tools.get("per_call_by_model_prefix", {}) or {}).items():
-        if model.startswith(prefix):
-            return float(rate)
-    return default_rate
+@dataclass(frozen=True)
+class ModelRates:
+    model_key: str | None
+    input_per_million: float
+    cached_input_per_million: float
+    output_per_million: float
+    reasoning_output_per_million: float
+    web_search_per_call: float
+
+    @property
+    def missing(self) -> bool:
+        return self.model_key is None
+
+
+class RateCard:
+    """A pricing file compiled for lookups.
+
+    Model keys are ordered longest-first once, so dated/suffixed variants
+    like gpt-4.1-2025-xx resolve to their longest matching prefix, and every
+    resolved model is memoized; pricing a row is then a dict hit plus a few
+    multiplications.
+    """
+
+    def __init__(self, pricing: dict):
+        self.version = str(pricing.get("version", "unknown"))
+        self.currency = str(pricing.get("currency", "USD"))
+        self._models = pricing.get("models", {})
+        self._prefixes = sorted(self._models, key=len, reverse=True)
+        web_search = pricing.get("tools", {}).get("web_search", {})
+        self._web_search_default = float(web_search.get("default_per_call_usd", 0))
+        self._web_search_by_prefix = [
+            (prefix, float(rate))
+            for prefix, rate in (web_search.get("per_call_by_model_prefix", {}) or {}).items()
+        ]
+        self.rates = lru_cache(maxsize=1024)(self._resolve)
+
+    def _model_key(self, model: str) -> str | None:
+        if model in self._models:
+            return model
+        # Resolve dated/suffixed variants like gpt-4.1-2025-xx
+        for prefix in self._prefixes:
+            if model.startswith(prefix):
+                return prefix
+        return None
+
+    def _resolve(self, model: str) -> ModelRates:
+        model_key = self._model_key(model)
+        prices = self._models.get(model_key or "", {})
+        input_rate = float(prices.get("input_per_million", 0))
+        output_rate = float(prices.get("output_per_million", 0))
+        web_search_rate = next(
+            (rate for prefix, rate in self._web_search_by_prefix if model.startswith(prefix)),
+            self._web_search_default,
+        )
+        return ModelRates(
+            model_key=model_key,
+            input_per_million=input_rate,
+            cached_input_per_million=float(prices.get("cached_input_per_million", input_rate)),
+            output_per_million=output_rate,
+            reasoning_output_per_million=float(
+                prices.get("reasoning_output_per_million", output_rate)
+            ),
+            web_search_per_call=web_search_rate,
+        )
+
+
+@lru_cache(maxsize=1)
+def get_compiled_rate_card() -> RateCard:
+    return RateCard(load_pricing())
 
 
 def get_rate_card(model: str) -> dict:
-    pricing = load_pricing()
-    model_key = _find_model_key(model, pricing)
-    model_prices = pricing.get("models", {}).get(model_key or "", {})
-    missing = model_key is None
-    input_rate = float(model_prices.get("input_per_million", 0))
-    cached_rate = float(model_prices.get("cached_input_per_million", input_rate))
-    output_rate = float(model_prices.get("output_per_million", 0))
-    reasoning_rate = float(model_prices.get("reasoning_output_per_million", output_rate))
-    web_search_rate = _web_search_price_per_call(model, pricing)
+    card = get_compiled_rate_card()
+    rates = card.rates(model)
     return {
-        "pricing_version": str(pricing.get("version", "unknown")),
-        "currency": str(pricing.get("currency", "USD")),
-        "model_key": model_key,
-        "missing_model_pricing": missing,
-        "input_per_million": input_rate,
-        "cached_input_per_million": cached_rate,
-        "output_per_million": output_rate,
-        "reasoning_output_per_million": reasoning_rate,
-        "web_search_per_call": web_search_rate,
+        "pricing_version": card.version,
+        "currency": card.currency,
+        "model_key": rates.model_key,
+        "missing_model_pricing": rates.missing,
+        "input_per_million": rates.input_per_million,
+        "cached_input_per_million": rates.cached_input_per_million,
+        "output_per_million": rates.output_per_million,
+        "reasoning_output_per_million": rates.reasoning_output_per_million,
+        "web_search_per_call": rates.web_search_per_call,
     }
 
 
@@ -93,16 +138,50 @@ class CostBreakdown:
 
 def calculate_cost(model: str, usage: dict | None, tool_calls: list[dict] | None) -> CostBreakdown:
     usage = usage or {}
-    pricing = load_pricing()
-    model_key = _find_model_key(model, pricing)
-    model_prices = pricing.get("models", {}).get(model_key or "", {})
+    return calculate_cost_from_counts(
+        model,
+        input_tokens=int(usage.get("input_tokens", 0) or 0),
+        output_tokens=int(usage.get("output_tokens", 0) or 0),
+        cached_tokens=int(usage.get("cached_tokens", 0) or 0),
+        reasoning_tokens=int(usage.get("reasoning_tokens", 0) or 0),
+        web_search_calls=_web_search_calls(tool_calls),
+    )
+
+
+def cost_columns(breakdown: CostBreakdown) -> dict:
+    """Values for the cost columns stored on ``results`` and ``trace_logs``."""
+    return {
+        "input_cost_usd": breakdown.input_cost_usd,
+        "cached_input_cost_usd": breakdown.cached_input_cost_usd,
+        "output_cost_usd": breakdown.output_cost_usd,
+        "reasoning_output_cost_usd": breakdown.reasoning_output_cost_usd,
+        "web_search_cost_usd": breakdown.web_search_cost_usd,
+        "total_cost_usd": breakdown.total_usd,
+        "web_search_calls": breakdown.web_search_calls,
+        "missing_model_pricing": breakdown.missing_model_pricing,
+        "pricing_version": get_compiled_rate_card().version,
+    }
 
-    input_tokens = int(usage.get("input_tokens", 0) or 0)
-    output_tokens = int(usage.get("output_tokens", 0) or 0)
-    cached_tokens = int(usage.get("cached_tokens", 0) or 0)
-    reasoning_tokens = int(usage.get("reasoning_tokens", 0) or 0)
 
-    if not model_key:
+def set_cost_columns(row, breakdown: CostBreakdown) -> None:
+    """Store ``breakdown`` on a ``Result`` or ``TraceLog`` instance."""
+    for key, value in cost_columns(breakdown).items():
+        setattr(row, key, value)
+
+
+def calculate_cost_from_counts(
+    model: str,
+    *,
+    input_tokens: int,
+    output_tokens: int,
+    cached_tokens: int,
+    reasoning_tokens: int,
+    web_search_calls: int,
+) -> CostBreakdown:
+    """Price already-extracted token and web search counts (e.g. from SQL)."""
+    rates = get_compiled_rate_card().rates(model)
+
+    if rates.missing:
         return CostBreakdown(
             total_usd=0.0,
             input_cost_usd=0.0,
@@ -110,7 +189,7 @@ def calculate_cost(model: str, usage: dict | None, tool_calls: list[dict] | None
             output_cost_usd=0.0,
             reasoning_output_cost_usd=0.0,
             web_search_cost_usd=0.0,
-            web_search_calls=_web_search_calls(tool_calls),
+            web_search_calls=web_search_calls,
             model_key=None,
             missing_model_pricing=True,
             usage={
@@ -121,24 +200,16 @@ def calculate_cost(model: str, usage: dict | None, tool_calls: list[dict] | None
             },
         )
 
-    input_rate = float(model_prices.get("input_per_million", 0))
-    cached_rate = float(model_prices.get("cached_input_per_million", input_rate))
-    output_rate = float(model_prices.get("output_per_million", 0))
-    reasoning_rate = float(model_prices.get("reasoning_output_per_million", output_rate))
-
     cached_count = max(min(cached_tokens, input_tokens), 0)
     non_cached_count = max(input_tokens - cached_count, 0)
     reasoning_count = max(min(reasoning_tokens, output_tokens), 0)
     non_reasoning_count = max(output_tokens - reasoning_count, 0)
 
-    input_cost = (non_cached_count / 1_000_000.0) * input_rate
-    cached_input_cost = (cached_count / 1_000_000.0) * cached_rate
-    output_cost = (non_reasoning_count / 1_000_000.0) * output_rate
-    reasoning_cost = (reasoning_count / 1_000_000.0) * reasoning_rate
-
-    web_search_calls = _web_search_calls(tool_calls)
-    web_search_rate = _web_search_price_per_call(model, pricing)
-    web_search_cost = web_search_calls * web_search_rate
+    input_cost = (non_cached_count / 1_000_000.0) * rates.input_per_million
+    cached_input_cost = (cached_count / 1_000_000.0) * rates.cached_input_per_million
+    output_cost = (non_reasoning_count / 1_000_000.0) * rates.output_per_million
+    reasoning_cost = (reasoning_count / 1_000_000.0) * rates.reasoning_output_per_million
+    web_search_cost = web_search_calls * rates.web_search_per_call
 
     total = input_cost + cached_input_cost + output_cost + reasoning_cost + web_search_cost
     return CostBreakdown(
@@ -149,7 +220,7 @@ def calculate_cost(model: str, usage: dict | None, tool_calls: list[dict] | None
         reasoning_output_cost_usd=round(reasoning_cost, 6),
         web_search_cost_usd=round(web_search_cost, 6),
         web_search_calls=web_search_calls,
-        model_key=model_key,
+        model_key=rates.model_key,
         missing_model_pricing=False,
         usage={
             "input_tokens": input_tokens,
@@ -158,3 +229,154 @@ def calculate_cost(model: str, usage: dict | None, tool_calls: list[dict] | None
             "reasoning_tokens": reasoning_count,
         },
     )
+
+
+@dataclass
+class CostBatch:
+    """Costs of many usages at one model's rates, as parallel arrays.
+
+    Token arrays hold the counts that were billed (cached/reasoning clamped
+    to their parents, as in ``CostBreakdown.usage``).
+    """
+
+    model_key: str | None
+    missing_model_pricing: bool
+    input_tokens: np.ndarray
+    output_tokens: np.ndarray
+    cached_tokens: np.ndarray
+    reasoning_tokens: np.ndarray
+    web_search_calls: np.ndarray
+    input_cost_usd: np.ndarray
+    cached_input_cost_usd: np.ndarray
+    output_cost_usd: np.ndarray
+    reasoning_output_cost_usd: np.ndarray
+    web_search_cost_usd: np.ndarray
+    total_usd: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.total_usd)
+
+
+def calculate_costs_from_counts(
+    model: str,
+    *,
+    input_tokens,
+    output_tokens,
+    cached_tokens,
+    reasoning_tokens,
+    web_search_calls,
+) -> CostBatch:
+    """Vectorized ``calculate_cost_from_counts`` over equal-length sequences."""
+    rates = get_compiled_rate_card().rates(model)
+    inp = np.asarray(input_tokens, dtype=np.int64)
+    out = np.asarray(output_tokens, dtype=np.int64)
+    cached = np.asarray(cached_tokens, dtype=np.int64)
+    reasoning = np.asarray(reasoning_tokens, dtype=np.int64)
+    searches = np.asarray(web_search_calls, dtype=np.int64)
+
+    if rates.missing:
+        zeros = np.zeros(len(inp))
+        return CostBatch(
+            model_key=None,
+            missing_model_pricing=True,
+            input_tokens=inp,
+            output_tokens=out,
+            cached_tokens=cached,
+            reasoning_tokens=reasoning,
+            web_search_calls=searches,
+            input_cost_usd=zeros,
+            cached_input_cost_usd=zeros,
+            output_cost_usd=zeros,
+            reasoning_output_cost_usd=zeros,
+            web_search_cost_usd=zeros,
+            total_usd=zeros,
+        )
+
+    cached = np.clip(np.minimum(cached, inp), 0, None)
+    non_cached = np.clip(inp - cached, 0, None)
+    reasoning = np.clip(np.minimum(reasoning, out), 0, None)
+    non_reasoning = np.clip(out - reasoning, 0, None)
+
+    input_cost = non_cached / 1_000_000.0 * rates.input_per_million
+    cached_input_cost = cached / 1_000_000.0 * rates.cached_input_per_million
+    output_cost = non_reasoning / 1_000_000.0 * rates.output_per_million
+    reasoning_cost = reasoning / 1_000_000.0 * rates.reasoning_output_per_million
+    web_search_cost = searches * rates.web_search_per_call
+
+    total = input_cost + cached_input_cost + output_cost + reasoning_cost + web_search_cost
+    return CostBatch(
+        model_key=rates.model_key,
+        missing_model_pricing=False,
+        input_tokens=inp,
+        output_tokens=out,
+        cached_tokens=cached,
+        reasoning_tokens=reasoning,
+        web_search_calls=searches,
+        input_cost_usd=np.round(input_cost, 6),
+        cached_input_cost_usd=np.round(cached_input_cost, 6),
+        output_cost_usd=np.round(output_cost, 6),
+        reasoning_output_cost_usd=np.round(reasoning_cost, 6),
+        web_search_cost_usd=np.round(web_search_cost, 6),
+        total_usd=np.round(total, 6),
+    )
+
+
+def calculate_costs(
+    model: str,
+    usages: list[dict | None],
+    tool_calls: list[list[dict] | None] | None = None,
+) -> CostBatch:
+    """Price many usage dicts (and optional tool call lists) for one model."""
+    usages = [usage or {} for usage in usages]
+
+    def counts(key: str) -> list[int]:
+        return [int(usage.get(key, 0) or 0) for usage in usages]
+
+    return calculate_costs_from_counts(
+        model,
+        input_tokens=counts("input_tokens"),
+        output_tokens=counts("output_tokens"),
+        cached_tokens=counts("cached_tokens"),
+        reasoning_tokens=counts("reasoning_tokens"),
+        web_search_calls=(
+            [_web_search_calls(calls) for calls in tool_calls]
+            if tool_calls is not None
+            else [0] * len(usages)
+        ),
+    )
+
+
+def batch_cost_columns(batch: CostBatch) -> list[dict]:
+    """``cost_columns`` for every row of a batch, in order."""
+    version = get_compiled_rate_card().version
+    columns = zip(
+        batch.input_cost_usd.tolist(),
+        batch.cached_input_cost_usd.tolist(),
+        batch.output_cost_usd.tolist(),
+        batch.reasoning_output_cost_usd.tolist(),
+        batch.web_search_cost_usd.tolist(),
+        batch.total_usd.tolist(),
+        batch.web_search_calls.tolist(),
+    )
+    return [
+        {
+            "input_cost_usd": input_cost,
+            "cached_input_cost_usd": cached_input_cost,
+            "output_cost_usd": output_cost,
+            "reasoning_output_cost_usd": reasoning_cost,
+            "web_search_cost_usd": web_search_cost,
+            "total_cost_usd": total,
+            "web_search_calls": web_search_calls,
+            "missing_model_pricing": batch.missing_model_pricing,
+            "pricing_version": version,
+        }
+        for (
+            input_cost,
+            cached_input_cost,
+            output_cost,
+            reasoning_cost,
+            web_search_cost,
+            total,
+            web_search_calls,
+        ) in columns
+    ]
@@ -0,0 +1,132 @@
+"""Keyset pagination and column omission for list endpoints.
+
+Paginated lists are ordered by ``(created_at, id)``. A page's cursor encodes
+the last row's pair and the next page starts strictly after it, so Postgres
+walks the ``(created_at, id)`` index instead of scanning past an OFFSET and
+every page costs the same however deep it is. The next cursor is returned in
+the ``X-Next-Cursor`` response header (absent on the last page), which keeps
+list bodies unchanged; without ``limit`` or ``cursor`` an endpoint returns
+everything as before.
+
+``exclude`` lets list views leave out heavy fields (payloads, tool calls,
+reasoning): they are deferred in the query and come back as null. Fields kept
+in a payload side table (``Result.payload``, ``TraceLog.payload``) are loaded
+by one extra ``SELECT ... WHERE id IN`` per page, and not at all when every
+one of them is excluded.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+from sqlalchemy.orm import defer, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(400, "Invalid cursor")
+
+
+def page_size(limit: int | None, default: int | None = None) -> int | None:
+    """Clamp ``limit`` to 1..MAX_PAGE_SIZE; None means unpaginated."""
+    limit = limit if limit is not None else default
+    if limit is None:
+        return None
+    return min(max(limit, 1), MAX_PAGE_SIZE)
+
+
+def paginate(stmt, model, cursor: str | None, limit: int | None, descending: bool = True):
+    """Order ``stmt`` by ``(created_at, id)`` and apply the cursor and limit.
+
+    One extra row is fetched so ``finish_page`` can tell if another page follows.
+    """
+    key = tuple_(model.created_at, model.id)
+    if cursor:
+        after = tuple_(*decode_cursor(cursor))
+        stmt = stmt.where(key < after if descending else key > after)
+    if descending:
+        stmt = stmt.order_by(model.created_at.desc(), model.id.desc())
+    else:
+        stmt = stmt.order_by(model.created_at.asc(), model.id.asc())
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    return stmt
+
+
+def finish_page(rows: list, limit: int | None, response: Response, entity=None) -> list:
+    """Trim the look-ahead row and set the next-page cursor header.
+
+    ``entity`` picks the paginated instance out of a row with extra columns.
+    """
+    if limit is None or len(rows) <= limit:
+        return list(rows)
+    last = rows[limit - 1] if entity is None else entity(rows[limit - 1])
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    return list(rows[:limit])
+
+
+def parse_exclude(exclude: str | None, allowed: tuple[str, ...]) -> list[str]:
+    fields = [f.strip() for f in (exclude or "").split(",") if f.strip()]
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise HTTPException(
+            400,
+            f"Cannot exclude {', '.join(unknown)}; excludable fields are "
+            f"{', '.join(allowed)}",
+        )
+    return list(dict.fromkeys(fields))
+
+
+def _payload_fields(model) -> list[str]:
+    """Fields ``model`` keeps in its ``payload`` side table, if it has one."""
+    relationship = model.__mapper__.relationships.get("payload")
+    if relationship is None:
+        return []
+    return [
+        attr.key
+        for attr in relationship.mapper.column_attrs
+        if not attr.columns[0].primary_key
+    ]
+
+
+def defer_columns(stmt, model, fields: list[str]):
+    """Leave ``fields`` out of the SELECT and load the other payload fields."""
+    payload_fields = _payload_fields(model)
+    columns = [f for f in fields if f not in payload_fields]
+    if columns:
+        stmt = stmt.options(*(defer(getattr(model, field)) for field in columns))
+    wanted = [f for f in payload_fields if f not in fields]
+    if wanted:
+        payload = model.payload.property.mapper.class_
+        stmt = stmt.options(
+            selectinload(model.payload).load_only(
+                *(getattr(payload, field) for field in wanted)
+            )
+        )
+    return stmt
+
+
+def blank_deferred(rows, fields: list[str]) -> None:
+    """Set deferred ``fields`` to None so serializing never lazy-loads them.
+
+    Payload fields need nothing here: they read as None unless loaded.
+    """
+    columns = [f for f in fields if f not in _payload_fields(type(rows[0]))] if rows else []
+    for row in rows:
+        for field in columns:
+            set_committed_value(row, field, None)
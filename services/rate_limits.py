@@ -0,0 +1,327 @@
+"""Concurrency and rate-limit governor for agent executions.
+
+Every executor call (benchmark runs, cost previews, result retries, agent
+chat) goes through ``governor.acquire`` which enforces, in order:
+
+- the API key scope (all calls made with ``OPENAI_API_KEY``),
+- the model scope (longest configured prefix of the model name),
+- the organization scope.
+
+Each scope can have a concurrency cap, a requests-per-minute token bucket and
+a tokens-per-minute token bucket; a limit of 0 means unlimited. TPM is
+charged with an estimate up front and reconciled with the real usage when the
+call finishes, so a bucket may briefly go negative and delay later callers.
+
+Limits are enforced per process: with N worker processes, configure each with
+roughly 1/N of the account budget.
+"""
+
+import asyncio
+import hashlib
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from config import get_settings
+from executors.retry import RetryBudget, execute_with_retry
+from services.execution_cache import execution_cache
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``per_minute`` tokens per minute."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate_per_second = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate_per_second
+        )
+        self.updated = now
+
+    async def acquire(self, amount: float):
+        # Requests larger than the bucket only need a full bucket
+        amount = min(amount, self.capacity)
+        # The lock makes waiters queue up FIFO instead of racing for refills
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate_per_second)
+
+    def adjust(self, delta: float):
+        """Charge (positive) or refund (negative) tokens after the fact."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+
+@dataclass
+class ScopeLimit:
+    scope: str
+    key: str
+    max_concurrency: int = 0
+    rpm: int = 0
+    tpm: int = 0
+    in_flight: int = 0
+    waiting: int = 0
+    total_requests: int = 0
+    total_tokens: int = 0
+    _semaphore: asyncio.Semaphore | None = field(default=None, repr=False)
+    _rpm_bucket: TokenBucket | None = field(default=None, repr=False)
+    _tpm_bucket: TokenBucket | None = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.max_concurrency > 0:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.rpm > 0:
+            self._rpm_bucket = TokenBucket(self.rpm)
+        if self.tpm > 0:
+            self._tpm_bucket = TokenBucket(self.tpm)
+
+    async def enter(self, estimated_tokens: int):
+        self.waiting += 1
+        try:
+            if self._semaphore is not None:
+                await self._semaphore.acquire()
+            try:
+                if self._rpm_bucket is not None:
+                    await self._rpm_bucket.acquire(1)
+                if self._tpm_bucket is not None:
+                    await self._tpm_bucket.acquire(estimated_tokens)
+            except BaseException:
+                if self._semaphore is not None:
+                    self._semaphore.release()
+                raise
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        self.total_requests += 1
+
+    def exit(self, estimated_tokens: int, actual_tokens: int | None):
+        self.in_flight -= 1
+        if self._semaphore is not None:
+            self._semaphore.release()
+        if actual_tokens is not None:
+            self.total_tokens += actual_tokens
+            if self._tpm_bucket is not None:
+                self._tpm_bucket.adjust(actual_tokens - estimated_tokens)
+
+    def snapshot(self) -> dict:
+        return {
+            "scope": self.scope,
+            "key": self.key,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "rpm_limit": self.rpm,
+            "rpm_available": round(self._rpm_bucket.available(), 2)
+            if self._rpm_bucket
+            else None,
+            "tpm_limit": self.tpm,
+            "tpm_available": round(self._tpm_bucket.available(), 2)
+            if self._tpm_bucket
+            else None,
+            "total_requests": self.total_requests,
+            "total_tokens": self.total_tokens,
+        }
+
+
+class ExecutionLease:
+    """Handle yielded by ``ExecutionGovernor.acquire``; report usage on it."""
+
+    def __init__(self):
+        self.actual_tokens: int | None = None
+
+    def record_usage(self, usage: dict | None):
+        if usage:
+            self.actual_tokens = int(usage.get("total_tokens", 0) or 0) or (
+                int(usage.get("input_tokens", 0) or 0)
+                + int(usage.get("output_tokens", 0) or 0)
+            )
+
+
+class ModelLimits:
+    """Per-model limits compiled for lookups.
+
+    Configured prefixes are ordered longest-first once and every resolved
+    model is memoized, so picking a call's model scope is a dict hit.
+    """
+
+    def __init__(self, concurrency: dict, rpm: dict, tpm: dict):
+        self._concurrency = dict(concurrency)
+        self._rpm = dict(rpm)
+        self._tpm = dict(tpm)
+        self._prefixes = sorted(
+            set(self._concurrency) | set(self._rpm) | set(self._tpm), key=len, reverse=True
+        )
+        self.resolve = lru_cache(maxsize=1024)(self._resolve)
+
+    def _resolve(self, model: str) -> tuple[str, dict]:
+        """The model's scope key (longest configured prefix) and its limits."""
+        key = next((p for p in self._prefixes if model.startswith(p)), None)
+        key = key or model or "unknown"
+        return key, {
+            "max_concurrency": self._concurrency.get(key, 0),
+            "rpm": self._rpm.get(key, 0),
+            "tpm": self._tpm.get(key, 0),
+        }
+
+
+class ExecutionGovernor:
+    def __init__(self):
+        self._scopes: dict[tuple[str, str], ScopeLimit] = {}
+        self._model_limits: ModelLimits | None = None
+
+    def _models(self) -> ModelLimits:
+        if self._model_limits is None:
+            settings = get_settings()
+            self._model_limits = ModelLimits(
+                settings.RATE_LIMIT_MODEL_CONCURRENCY,
+                settings.RATE_LIMIT_MODEL_RPM,
+                settings.RATE_LIMIT_MODEL_TPM,
+            )
+        return self._model_limits
+
+    def _scope(self, scope: str, key: str, **limits) -> ScopeLimit:
+        existing = self._scopes.get((scope, key))
+        if existing is None:
+            existing = ScopeLimit(scope=scope, key=key, **limits)
+            self._scopes[(scope, key)] = existing
+        return existing
+
+    def _scopes_for(self, model: str, organization_id: int | None) -> list[ScopeLimit]:
+        settings = get_settings()
+        api_key = settings.OPENAI_API_KEY or ""
+        key_id = hashlib.sha256(api_key.encode()).hexdigest()[:8] if api_key else "default"
+        scopes = [
+            self._scope(
+                "api_key",
+                key_id,
+                max_concurrency=settings.RATE_LIMIT_API_KEY_CONCURRENCY,
+                rpm=settings.RATE_LIMIT_API_KEY_RPM,
+                tpm=settings.RATE_LIMIT_API_KEY_TPM,
+            )
+        ]
+
+        model_key, model_limits = self._models().resolve(model or "")
+        scopes.append(self._scope("model", model_key, **model_limits))
+
+        if organization_id is not None:
+            scopes.append(
+                self._scope(
+                    "organization",
+                    str(organization_id),
+                    max_concurrency=settings.RATE_LIMIT_ORG_CONCURRENCY,
+                    rpm=settings.RATE_LIMIT_ORG_RPM,
+                )
+            )
+        return scopes
+
+    @asynccontextmanager
+    async def acquire(
+        self,
+        *,
+        model: str,
+        organization_id: int | None,
+        estimated_tokens: int | None = None,
+    ):
+        """Wait for capacity in every scope, then hold it for the call.
+
+        Scopes are always entered in the same order (API key, model,
+        organization) so concurrent callers cannot deadlock each other.
+        """
+        estimate = estimated_tokens or get_settings().RATE_LIMIT_ESTIMATED_TOKENS
+        scopes = self._scopes_for(model, organization_id)
+        entered: list[ScopeLimit] = []
+        lease = ExecutionLease()
+        try:
+            for scope in scopes:
+                await scope.enter(estimate)
+                entered.append(scope)
+            yield lease
+        finally:
+            for scope in reversed(entered):
+                scope.exit(estimate, lease.actual_tokens)
+
+    def snapshot(self, organization_id: int | None = None) -> list[dict]:
+        """Live utilization; organization scopes are filtered to one org if given."""
+        out = []
+        for (scope, key), limit in sorted(self._scopes.items()):
+            if (
+                scope == "organization"
+                and organization_id is not None
+                and key != str(organization_id)
+            ):
+                continue
+            out.append(limit.snapshot())
+        return out
+
+
+governor = ExecutionGovernor()
+
+
+async def governed_execute(
+    executor,
+    query: str,
+    config: dict,
+    *,
+    organization_id: int | None,
+    retry_budget: RetryBudget | None = None,
+    use_cache: bool = True,
+):
+    """Run ``executor.execute`` under the governor, retrying transient errors.
+
+    The governor lease is released between attempts so a query sleeping on
+    backoff does not hold capacity other queries could use. When the
+    execution cache is enabled, a cached result is returned without taking a
+    lease; ``use_cache=False`` forces a fresh call (the result still
+    refreshes the cache).
+    """
+    if use_cache:
+        cached = await execution_cache.lookup(executor, query, config)
+        if cached is not None:
+            return cached
+
+    async def _attempt():
+        async with governor.acquire(
+            model=config.get("model") or "", organization_id=organization_id
+        ) as lease:
+            result = await executor.execute(query, config)
+            lease.record_usage(result.usage)
+            return result
+
+    result = await execute_with_retry(_attempt, budget=retry_budget)
+    await execution_cache.store(executor, query, config, result)
+    return result
+
+
+async def governed_execute_chat(
+    executor,
+    messages: list[dict],
+    config: dict,
+    *,
+    organization_id: int | None,
+):
+    """Run ``executor.execute_chat`` under the governor, retrying transient errors."""
+
+    async def _attempt():
+        async with governor.acquire(
+            model=config.get("model") or "", organization_id=organization_id
+        ) as lease:
+            result = await executor.execute_chat(messages, config)
+            lease.record_usage(result.usage)
+            return result
+
+    return await execute_with_retry(_attempt)
@@ -0,0 +1,119 @@
+"""Vectorized statistics for run analytics and comparisons.
+
+Everything here works on NumPy arrays so it stays fast on 100k-element
+inputs: summary stats with p50/p90/p99, bootstrap confidence intervals for
+accuracy and weighted score, and paired significance tests between two runs
+graded on the same queries. Random draws use a fixed seed so the same data
+always produces the same intervals and p-values.
+"""
+
+import numpy as np
+
+from schemas.schemas import StatsOut
+
+BOOTSTRAP_SAMPLES = 2000
+PERMUTATION_SAMPLES = 2000
+CONFIDENCE_LEVEL = 0.95
+_SEED = 0
+# Upper bound on elements materialized per permutation chunk
+_PERMUTATION_CHUNK_ELEMENTS = 4_000_000
+
+GRADE_SCORES = {"correct": 1.0, "partial": 0.5, "wrong": 0.0}
+
+
+def describe(values, digits: int = 2) -> StatsOut:
+    """Mean/median/std/min/max and p50/p90/p99 of ``values``."""
+    arr = np.asarray(values, dtype=float)
+    if arr.size == 0:
+        return StatsOut()
+    p50, p90, p99 = np.percentile(arr, [50, 90, 99])
+    return StatsOut(
+        mean=round(float(arr.mean()), digits),
+        median=round(float(p50), digits),
+        std=round(float(arr.std()), digits),
+        min=round(float(arr.min()), digits),
+        max=round(float(arr.max()), digits),
+        p50=round(float(p50), digits),
+        p90=round(float(p90), digits),
+        p99=round(float(p99), digits),
+        n=int(arr.size),
+    )
+
+
+def grade_confidence_intervals(
+    correct: int, partial: int, wrong: int
+) -> tuple[list[float], list[float]] | None:
+    """Bootstrap CIs (percent) for accuracy and weighted score.
+
+    Resampling n graded results with replacement only depends on the grade
+    proportions, so each bootstrap sample is one multinomial draw.
+    """
+    n = correct + partial + wrong
+    if n == 0:
+        return None
+    rng = np.random.default_rng(_SEED)
+    draws = rng.multinomial(n, np.array([correct, partial, wrong]) / n, size=BOOTSTRAP_SAMPLES)
+    accuracy = draws[:, 0] / n * 100
+    weighted = (draws[:, 0] + 0.5 * draws[:, 1]) / n * 100
+    alpha = (1 - CONFIDENCE_LEVEL) / 2 * 100
+    bounds = [alpha, 100 - alpha]
+    acc_lo, acc_hi = np.percentile(accuracy, bounds)
+    ws_lo, ws_hi = np.percentile(weighted, bounds)
+    return (
+        [round(float(acc_lo), 1), round(float(acc_hi), 1)],
+        [round(float(ws_lo), 1), round(float(ws_hi), 1)],
+    )
+
+
+def _mcnemar_exact_p(a_only: int, b_only: int) -> float:
+    """Two-sided exact McNemar test on the discordant pairs."""
+    n = a_only + b_only
+    if n == 0:
+        return 1.0
+    m = min(a_only, b_only)
+    k = np.arange(1, m + 1)
+    # log C(n, k) for k = 0..m, built incrementally
+    log_comb = np.concatenate(([0.0], np.cumsum(np.log(n - k + 1) - np.log(k))))
+    log_pmf = log_comb - n * np.log(2)
+    top = log_pmf.max()
+    tail = float(np.exp(top) * np.exp(log_pmf - top).sum())
+    return min(1.0, 2 * tail)
+
+
+def _sign_flip_p(diffs: np.ndarray) -> float:
+    """Two-sided paired permutation test on the mean of ``diffs``."""
+    diffs = diffs[diffs != 0]
+    if diffs.size == 0:
+        return 1.0
+    observed = abs(diffs.mean())
+    rng = np.random.default_rng(_SEED)
+    chunk = max(1, _PERMUTATION_CHUNK_ELEMENTS // diffs.size)
+    extreme = 0
+    remaining = PERMUTATION_SAMPLES
+    while remaining:
+        rows = min(chunk, remaining)
+        signs = rng.integers(0, 2, size=(rows, diffs.size), dtype=np.int8) * 2 - 1
+        means = np.abs(signs @ diffs) / diffs.size
+        extreme += int((means >= observed - 1e-12).sum())
+        remaining -= rows
+    # Add-one smoothing keeps the estimate a valid p-value
+    return (extreme + 1) / (PERMUTATION_SAMPLES + 1)
+
+
+def paired_comparison(a_grades: list[str], b_grades: list[str]) -> dict:
+    """Compare two runs on the queries both have graded (same order)."""
+    a = np.array([GRADE_SCORES.get(g, 0.0) for g in a_grades], dtype=float)
+    b = np.array([GRADE_SCORES.get(g, 0.0) for g in b_grades], dtype=float)
+    a_correct = a == 1.0
+    b_correct = b == 1.0
+    a_only = int((a_correct & ~b_correct).sum())
+    b_only = int((b_correct & ~a_correct).sum())
+    diffs = b - a
+    return {
+        "n_pairs": int(a.size),
+        "mean_score_diff": round(float(diffs.mean()) * 100, 1) if a.size else 0.0,
+        "a_only_correct": a_only,
+        "b_only_correct": b_only,
+        "mcnemar_p": round(_mcnemar_exact_p(a_only, b_only), 4),
+        "permutation_p": round(_sign_flip_p(diffs), 4),
+    }
@@ -2,7 +2,28 @@
 
 from models.trace_log import TraceLog
 from schemas.schemas import TraceLogOut
-from services.openai_pricing import calculate_cost
+from services.openai_pricing import calculate_cost, cost_columns, get_compiled_rate_card
+
+# Heavy columns list views may leave out (``exclude=``)
+EXCLUDABLE_TRACE_FIELDS = ("request_payload", "response_payload", "usage")
+
+
+def _cost_columns(trace: TraceLog) -> dict:
+    """The trace's stored cost columns, or freshly computed ones if stale."""
+    if trace.pricing_version == get_compiled_rate_card().version:
+        return {
+            "input_cost_usd": trace.input_cost_usd or 0.0,
+            "cached_input_cost_usd": trace.cached_input_cost_usd or 0.0,
+            "output_cost_usd": trace.output_cost_usd or 0.0,
+            "reasoning_output_cost_usd": trace.reasoning_output_cost_usd or 0.0,
+            "web_search_cost_usd": trace.web_search_cost_usd or 0.0,
+            "total_cost_usd": trace.total_cost_usd or 0.0,
+            "web_search_calls": trace.web_search_calls or 0,
+            "missing_model_pricing": bool(trace.missing_model_pricing),
+        }
+    response_payload = trace.response_payload if isinstance(trace.response_payload, dict) else {}
+    tool_calls = response_payload.get("tool_calls")
+    return cost_columns(calculate_cost(trace.model or "", trace.usage or {}, tool_calls))
 
 
 def trace_to_out(trace: TraceLog) -> TraceLogOut:
@@ -14,11 +35,10 @@ def trace_to_out(trace: TraceLog) -> TraceLogOut:
                safe processing.
         
     Returns:
-        TraceLogOut schema with calculated costs and breakdown
+        TraceLogOut schema with stored (or, for rows priced with an older
+        rate card, recalculated) costs and breakdown
     """
-    response_payload = trace.response_payload if isinstance(trace.response_payload, dict) else {}
-    tool_calls = response_payload.get("tool_calls")
-    breakdown = calculate_cost(trace.model or "", trace.usage or {}, tool_calls)
+    cost = _cost_columns(trace)
     return TraceLogOut(
         id=trace.id,
         organization_id=trace.organization_id,
@@ -37,18 +57,19 @@ def trace_to_out(trace: TraceLog) -> TraceLogOut:
         response_payload=trace.response_payload,
         usage=trace.usage,
         error=trace.error,
-        estimated_cost_usd=breakdown.total_usd,
+        estimated_cost_usd=cost["total_cost_usd"],
         cost_breakdown={
-            "input_cost_usd": breakdown.input_cost_usd,
-            "cached_input_cost_usd": breakdown.cached_input_cost_usd,
-            "output_cost_usd": breakdown.output_cost_usd,
-            "reasoning_output_cost_usd": breakdown.reasoning_output_cost_usd,
-            "web_search_cost_usd": breakdown.web_search_cost_usd,
-            "total_usd": breakdown.total_usd,
-            "web_search_calls": breakdown.web_search_calls,
+            "input_cost_usd": cost["input_cost_usd"],
+            "cached_input_cost_usd": cost["cached_input_cost_usd"],
+            "output_cost_usd": cost["output_cost_usd"],
+            "reasoning_output_cost_usd": cost["reasoning_output_cost_usd"],
+            "web_search_cost_usd": cost["web_search_cost_usd"],
+            "total_usd": cost["total_cost_usd"],
+            "web_search_calls": cost["web_search_calls"],
         },
-        missing_model_pricing=breakdown.missing_model_pricing,
+        missing_model_pricing=cost["missing_model_pricing"],
         latency_ms=trace.latency_ms,
+        attempts=trace.attempts or 1,
         started_at=trace.started_at,
         completed_at=trace.completed_at,
         created_at=trace.created_at,
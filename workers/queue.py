@@ -0,0 +1,135 @@
+"""Postgres-backed job queue for benchmark runs.
+
+Jobs are rows in ``run_jobs``. Workers claim them with
+``SELECT ... FOR UPDATE SKIP LOCKED`` so any number of worker processes can
+poll the same table without handing the same job out twice. A claimed job is
+kept alive by heartbeats; jobs whose worker stopped heartbeating are put back
+on the queue (or failed once they run out of attempts).
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import get_settings
+from database import async_session
+from models.run import Run
+from models.run_job import RunJob
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def enqueue_run_job(
+    db: AsyncSession, *, run_id: int, query_ids: list[int], batch_size: int
+) -> RunJob:
+    """Add a job for ``run_id`` to the session; the caller commits."""
+    job = RunJob(
+        run_id=run_id,
+        query_ids=list(query_ids),
+        batch_size=batch_size,
+        status="queued",
+    )
+    db.add(job)
+    return job
+
+
+async def claim_next_job(worker_id: str) -> RunJob | None:
+    """Atomically claim the oldest available job, or return None."""
+    now = _utcnow()
+    async with async_session() as db:
+        stmt = (
+            select(RunJob)
+            .where(RunJob.status == "queued", RunJob.available_at <= now)
+            .order_by(RunJob.available_at.asc(), RunJob.id.asc())
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        job = (await db.execute(stmt)).scalar_one_or_none()
+        if job is None:
+            return None
+        job.status = "running"
+        job.worker_id = worker_id
+        job.attempts += 1
+        job.claimed_at = now
+        job.heartbeat_at = now
+        await db.commit()
+        return job
+
+
+async def heartbeat_job(job_id: int, worker_id: str) -> None:
+    async with async_session() as db:
+        job = await db.get(RunJob, job_id)
+        if job and job.status == "running" and job.worker_id == worker_id:
+            job.heartbeat_at = _utcnow()
+            await db.commit()
+
+
+async def finish_job(job_id: int, status: str, error_message: str | None = None) -> None:
+    async with async_session() as db:
+        job = await db.get(RunJob, job_id)
+        if not job:
+            return
+        job.status = status
+        job.error_message = error_message
+        job.completed_at = _utcnow()
+        await db.commit()
+
+
+async def run_job_outcome(run_id: int) -> tuple[str, str | None]:
+    """Job status and error for a run whose job has returned.
+
+    ``execute_run`` records failures on the run rather than raising, so the
+    job's outcome is read back from the run.
+    """
+    async with async_session() as db:
+        run = await db.get(Run, run_id)
+        if run is None:
+            return "failed", f"Run {run_id} not found"
+        if run.status in ("completed", "cancelled"):
+            return "completed", None
+        return "failed", run.error_message or f"Run ended as {run.status}"
+
+
+async def requeue_stale_jobs() -> int:
+    """Return jobs whose worker stopped heartbeating to the queue.
+
+    Jobs that already used up ``RUN_JOB_MAX_ATTEMPTS`` are failed instead, and
+    their run is marked failed so it does not stay "running" forever.
+    """
+    settings = get_settings()
+    cutoff = _utcnow() - timedelta(seconds=settings.RUN_JOB_STALE_SECONDS)
+    async with async_session() as db:
+        stmt = (
+            select(RunJob)
+            .where(RunJob.status == "running", RunJob.heartbeat_at < cutoff)
+            .with_for_update(skip_locked=True)
+        )
+        stale = (await db.execute(stmt)).scalars().all()
+        for job in stale:
+            if job.attempts >= settings.RUN_JOB_MAX_ATTEMPTS:
+                job.status = "failed"
+                job.error_message = (
+                    f"Worker {job.worker_id} stopped responding "
+                    f"after {job.attempts} attempts"
+                )
+                job.completed_at = _utcnow()
+                run = await db.get(Run, job.run_id)
+                if run and run.status in ("pending", "running"):
+                    run.status = "failed"
+                    run.error_message = job.error_message
+                    run.completed_at = job.completed_at
+                logger.warning(f"Run job {job.id} (run {job.run_id}) failed: {job.error_message}")
+            else:
+                job.status = "queued"
+                job.worker_id = None
+                job.available_at = _utcnow()
+                logger.warning(
+                    f"Re-queued stale run job {job.id} (run {job.run_id}, attempt {job.attempts})"
+                )
+        if stale:
+            await db.commit()
+        return len(stale)
@@ -0,0 +1,135 @@
+"""Backfill and reprice the stored cost columns of results and trace logs.
+
+Every ``results`` / ``trace_logs`` row stores its cost breakdown together with
+the ``pricing_version`` of the rate card it was priced with. This job prices
+every row whose ``pricing_version`` differs from the current
+``data/openai_pricing.json`` (rows written before the columns existed, or
+after the pricing file changed) in id-ordered batches, one transaction each.
+Batches are claimed with ``FOR UPDATE SKIP LOCKED``, so several processes can
+run it at once, and it is safe to interrupt and rerun::
+
+    uv run python -m workers.reprice --batch-size 1000
+
+The API process also runs it in the background on startup when
+``COST_REPRICE_ON_STARTUP`` is set.
+"""
+
+import argparse
+import asyncio
+import sys
+
+from loguru import logger
+from sqlalchemy import select, update
+
+from config import get_settings
+from database import async_session
+from models.agent import AgentConfig
+from models.result import Result
+from models.result_payload import ResultPayload
+from models.run import Run
+from models.trace_log import TraceLog
+from models.trace_payload import TracePayload
+from services.openai_pricing import (
+    batch_cost_columns,
+    calculate_costs,
+    get_compiled_rate_card,
+)
+
+
+def _trace_batch(after_id: int, version: str, batch_size: int):
+    return (
+        select(
+            TraceLog.id,
+            TraceLog.model,
+            TraceLog.usage,
+            TracePayload.response_payload["tool_calls"],
+        )
+        .outerjoin(TracePayload, TracePayload.trace_log_id == TraceLog.id)
+        .where(TraceLog.id > after_id, TraceLog.pricing_version.is_distinct_from(version))
+        .order_by(TraceLog.id)
+        .limit(batch_size)
+        .with_for_update(of=TraceLog, skip_locked=True)
+    )
+
+
+def _result_batch(after_id: int, version: str, batch_size: int):
+    # Results are priced at the rates of their run's agent model
+    return (
+        select(Result.id, AgentConfig.model, Result.usage, ResultPayload.tool_calls)
+        .outerjoin(ResultPayload, ResultPayload.result_id == Result.id)
+        .outerjoin(Run, Run.id == Result.run_id)
+        .outerjoin(AgentConfig, AgentConfig.id == Run.agent_config_id)
+        .where(Result.id > after_id, Result.pricing_version.is_distinct_from(version))
+        .order_by(Result.id)
+        .limit(batch_size)
+        .with_for_update(of=Result, skip_locked=True)
+    )
+
+
+async def _reprice_table(model_cls, batch_stmt, batch_size: int) -> int:
+    version = get_compiled_rate_card().version
+    after_id = 0
+    repriced = 0
+    while True:
+        async with async_session() as db:
+            rows = (await db.execute(batch_stmt(after_id, version, batch_size))).all()
+            if not rows:
+                return repriced
+            by_model: dict[str, list] = {}
+            for row in rows:
+                by_model.setdefault(row[1] or "", []).append(row)
+            params = []
+            for model, model_rows in by_model.items():
+                batch = calculate_costs(
+                    model,
+                    [row[2] for row in model_rows],
+                    [row[3] if isinstance(row[3], list) else None for row in model_rows],
+                )
+                params.extend(
+                    {"id": row[0], **costs}
+                    for row, costs in zip(model_rows, batch_cost_columns(batch))
+                )
+            # ORM bulk UPDATE by primary key: one executemany per batch
+            await db.execute(update(model_cls), params)
+            await db.commit()
+        repriced += len(rows)
+        after_id = rows[-1][0]
+
+
+async def reprice_costs(batch_size: int | None = None) -> dict[str, int]:
+    """Price every row not yet priced with the current rate card."""
+    batch_size = max(1, batch_size or get_settings().COST_REPRICE_BATCH_SIZE)
+    counts = {
+        "trace_logs": await _reprice_table(TraceLog, _trace_batch, batch_size),
+        "results": await _reprice_table(Result, _result_batch, batch_size),
+    }
+    if any(counts.values()):
+        logger.info(
+            f"Repriced {counts['results']} results and {counts['trace_logs']} "
+            f"trace logs with pricing version {get_compiled_rate_card().version}"
+        )
+    return counts
+
+
+async def reprice_on_startup():
+    """``reprice_costs`` as a background task; failures are logged, not raised."""
+    try:
+        await reprice_costs()
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:
+        logger.warning(f"Cost repricing failed: {exc}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reprice stored result and trace costs")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+    asyncio.run(reprice_costs(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""Buffered persistence of finished benchmark queries.
+
+Instead of one ``INSERT`` + ``COMMIT`` per query, the runner hands finished
+queries to a ``ResultWriter`` task which writes them in bulk: all buffered trace
+logs in one multi-row ``INSERT ... RETURNING``, all results in another, their
+payload side-table rows in one multi-row ``INSERT`` each, and a single
+coalesced ``progress_current`` update, then one commit. The buffer is flushed every ``RESULT_WRITER_BATCH_SIZE`` results or
+``RESULT_WRITER_FLUSH_INTERVAL_MS`` milliseconds, whichever comes first; that
+is also the most work a crash can lose (the checkpoint/resume logic simply
+re-executes those queries). Each flush prices its rows in one vectorized batch
+and stores the cost columns alongside them.
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+from sqlalchemy import insert, update
+
+from config import get_settings
+from database import async_session
+from models.query import Query
+from models.result import Result
+from models.result_payload import RESULT_PAYLOAD_FIELDS, ResultPayload
+from models.run import Run
+from models.trace_log import TraceLog
+from models.trace_payload import TRACE_PAYLOAD_FIELDS, TracePayload
+from services.openai_pricing import batch_cost_columns, calculate_costs
+from workers.sse_bus import sse_bus
+
+
+@dataclass
+class PendingResult:
+    query: Query
+    # Column values for ``results`` plus its RESULT_PAYLOAD_FIELDS
+    # (trace_log_id filled on flush)
+    result: dict
+    # Column values for ``trace_logs`` plus its TRACE_PAYLOAD_FIELDS
+    trace: dict | None = None
+
+    @property
+    def error(self) -> str | None:
+        return self.result.get("error")
+
+
+class ResultWriter:
+    """Single task that owns the run's write session.
+
+    Executions never share a session: they hand finished queries to
+    ``submit`` and this task persists them in bulk from its own session.
+    Every flush also reads the run status back, so the runner learns about
+    cancellation without opening a session of its own.
+    """
+
+    def __init__(
+        self,
+        run: Run,
+        output_dir: Path | None,
+        model: str | None = None,
+        max_batch: int | None = None,
+        flush_interval_ms: int | None = None,
+    ):
+        settings = get_settings()
+        self.run_id = run.id
+        self.progress_current = run.progress_current
+        self.progress_total = run.progress_total
+        self.output_dir = output_dir
+        self.model = model or ""
+        self.max_batch = max(1, max_batch or settings.RESULT_WRITER_BATCH_SIZE)
+        self.flush_interval = (
+            flush_interval_ms
+            if flush_interval_ms is not None
+            else settings.RESULT_WRITER_FLUSH_INTERVAL_MS
+        ) / 1000.0
+        self.cancelled = False
+        self._queue: asyncio.Queue[PendingResult | None] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> asyncio.Task:
+        self._task = asyncio.create_task(self._run())
+        return self._task
+
+    def submit(self, item: PendingResult):
+        self._queue.put_nowait(item)
+
+    async def close(self):
+        """Flush everything submitted so far and stop the writer task."""
+        if self._task is None or self._task.done():
+            return
+        self._queue.put_nowait(None)
+        await self._task
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        async with async_session() as db:
+            while True:
+                item = await self._queue.get()
+                if item is None:
+                    return
+                # The interval is measured from the oldest unflushed result
+                batch = [item]
+                deadline = loop.time() + self.flush_interval
+                closing = False
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is None:
+                        closing = True
+                        break
+                    batch.append(item)
+                await self._flush(db, batch)
+                if closing:
+                    return
+
+    def _price(self, items: list[PendingResult]):
+        batch = calculate_costs(
+            self.model,
+            [item.result.get("usage") for item in items],
+            [item.result.get("tool_calls") for item in items],
+        )
+        for item, costs in zip(items, batch_cost_columns(batch)):
+            item.result.update(costs)
+            if item.trace is not None:
+                item.trace.update(costs)
+
+    async def _flush(self, db, items: list[PendingResult]):
+        self._price(items)
+        traced = [item for item in items if item.trace is not None]
+        if traced:
+            trace_ids = await _insert_with_payloads(
+                db,
+                TraceLog,
+                TracePayload,
+                "trace_log_id",
+                TRACE_PAYLOAD_FIELDS,
+                [item.trace for item in traced],
+            )
+            for item, trace_id in zip(traced, trace_ids):
+                item.result["trace_log_id"] = trace_id
+
+        await _insert_with_payloads(
+            db,
+            Result,
+            ResultPayload,
+            "result_id",
+            RESULT_PAYLOAD_FIELDS,
+            [item.result for item in items],
+        )
+        progress, status = (
+            await db.execute(
+                update(Run)
+                .where(Run.id == self.run_id)
+                .values(progress_current=Run.progress_current + len(items))
+                .returning(Run.progress_current, Run.status)
+                .execution_options(synchronize_session=False)
+            )
+        ).one()
+        await db.commit()
+        self.cancelled = status == "cancelled"
+
+        self.progress_current = progress - len(items)
+        for item in items:
+            self.progress_current += 1
+            await self._after_commit(item)
+
+    async def _after_commit(self, item: PendingResult):
+        q = item.query
+        result = item.result
+        # Save JSON file to output directory
+        if self.output_dir:
+            save_result_json(self.output_dir / "json" / f"{q.ordinal}.json", q, result)
+
+        status = "OK" if item.error is None else f"ERR: {item.error[:80]}"
+        logger.info(
+            f"Run {self.run_id} Q{q.ordinal} "
+            f"[{self.progress_current}/{self.progress_total}] {status}"
+        )
+
+        # Publish SSE
+        await sse_bus.publish(
+            self.run_id,
+            "progress",
+            {
+                "current": self.progress_current,
+                "total": self.progress_total,
+                "query_id": q.id,
+                "query_ordinal": q.ordinal,
+                "query_text": q.query_text[:100],
+                "success": item.error is None,
+                "time": result.get("execution_time_seconds"),
+            },
+        )
+
+
+async def _insert_with_payloads(
+    db, model, payload_model, fk: str, payload_fields: tuple[str, ...], rows: list[dict]
+) -> list[int]:
+    """Insert ``rows`` into ``model`` and their payload fields into ``payload_model``."""
+    ids = (
+        await db.execute(
+            insert(model).returning(model.id, sort_by_parameter_order=True),
+            [{k: v for k, v in row.items() if k not in payload_fields} for row in rows],
+        )
+    ).scalars().all()
+    await db.execute(
+        insert(payload_model),
+        [
+            {fk: row_id, **{field: row.get(field) for field in payload_fields}}
+            for row_id, row in zip(ids, rows)
+        ],
+    )
+    return ids
+
+
+def save_result_json(filepath: Path, query: Query, result: dict):
+    """Save result as JSON file matching the existing json/ folder format."""
+    data = {
+        "id": str(query.ordinal),
+        "query": query.query_text,
+        "expected_answer": query.expected_answer,
+        "agent_response": result.get("agent_response") or "",
+        "tool_calls": result.get("tool_calls") or [],
+        "reasoning": result.get("reasoning") or [],
+        "usage": result.get("usage") or {},
+        "execution_time_seconds": result.get("execution_time_seconds") or 0,
+    }
+    if result.get("error"):
+        data["error"] = result["error"]
+    try:
+        filepath.write_text(json.dumps(data, indent=2, ensure_ascii=False))
+    except Exception as e:
+        logger.warning(f"Failed to write JSON to {filepath}: {e}")
@@ -1,5 +1,4 @@
 import asyncio
-import json
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -7,18 +6,18 @@ from loguru import logger
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
+from config import get_settings
 from database import async_session
 from executors.registry import get_executor
+from executors.retry import RetryBudget
 from models.agent import AgentConfig
 from models.app_notification import AppNotification
 from models.query import Query
 from models.result import Result
 from models.run import Run
-from models.trace_log import TraceLog
-from workers.sse_bus import sse_bus
-
-# Global semaphore: max 3 concurrent runs
-_run_semaphore = asyncio.Semaphore(3)
+from services.rate_limits import governed_execute
+from workers.result_writer import PendingResult, ResultWriter
+from workers.sse_bus import publish_notification, sse_bus
 
 
 async def _create_run_notification(
@@ -47,27 +46,32 @@ async def _create_run_notification(
         message = f"{run_label} failed.{suffix}"
         notif_type = "run_failed"
 
-    db.add(
-        AppNotification(
-            organization_id=organization_id,
-            project_id=project_id,
-            user_id=user_id,
-            notif_type=notif_type,
-            title=title,
-            message=message,
-            related_id=run_id,
-        )
+    notification = AppNotification(
+        organization_id=organization_id,
+        project_id=project_id,
+        user_id=user_id,
+        notif_type=notif_type,
+        title=title,
+        message=message,
+        related_id=run_id,
     )
+    db.add(notification)
+    # Commits the caller's pending run changes together with the notification
+    await db.commit()
+    await publish_notification(notification)
 
 
 async def execute_run(run_id: int, query_ids: list[int], batch_size: int):
-    """Background job: execute benchmark run."""
+    """Background job: execute benchmark run.
+
+    Called by a ``RunWorker`` for each claimed job; concurrency across runs is
+    bounded by the worker's slot count.
+    """
     logger.info(
         f"Starting run {run_id} with {len(query_ids)} queries (batch={batch_size})"
     )
     try:
-        async with _run_semaphore:
-            await _execute_run_inner(run_id, query_ids, batch_size)
+        await _execute_run_inner(run_id, query_ids, batch_size)
     except Exception as e:
         logger.exception(f"Run {run_id} failed with unhandled error: {e}")
         try:
@@ -87,7 +91,6 @@ async def execute_run(run_id: int, query_ids: list[int], batch_size: int):
                         status="failed",
                         error_message=str(e),
                     )
-                    await db.commit()
                 await sse_bus.publish(
                     run_id, "complete", {"status": "failed", "error": str(e)}
                 )
@@ -101,9 +104,20 @@ async def _execute_run_inner(run_id: int, query_ids: list[int], batch_size: int)
         if not run:
             logger.error(f"Run {run_id} not found")
             return
+        if run.status not in ("pending", "running"):
+            logger.info(f"Run {run_id} is {run.status}; skipping")
+            return
+
+        # Checkpoint: queries that already have a result for this run (from a
+        # previous attempt of this job or before a resume) are not re-executed.
+        done_stmt = select(Result.query_id).where(
+            Result.run_id == run_id, Result.parent_result_id.is_(None)
+        )
+        done_query_ids = set((await db.execute(done_stmt)).scalars().all())
 
         run.status = "running"
-        run.started_at = datetime.now(timezone.utc)
+        run.started_at = run.started_at or datetime.now(timezone.utc)
+        run.progress_current = len(done_query_ids)
         await db.commit()
 
         # Create output directory
@@ -114,7 +128,15 @@ async def _execute_run_inner(run_id: int, query_ids: list[int], batch_size: int)
             json_dir = output_dir / "json"
             json_dir.mkdir(exist_ok=True)
 
-        await sse_bus.publish(run_id, "status", {"status": "running"})
+        await sse_bus.publish(
+            run_id,
+            "status",
+            {
+                "status": "running",
+                "current": run.progress_current,
+                "total": run.progress_total,
+            },
+        )
 
         # Load agent config
         agent_config = await db.get(AgentConfig, run.agent_config_id)
@@ -132,7 +154,6 @@ async def _execute_run_inner(run_id: int, query_ids: list[int], batch_size: int)
                 status="failed",
                 error_message=run.error_message,
             )
-            await db.commit()
             await sse_bus.publish(
                 run_id, "error", {"message": "Agent config not found"}
             )
@@ -148,28 +169,40 @@ async def _execute_run_inner(run_id: int, query_ids: list[int], batch_size: int)
 
         # Load queries
         stmt = select(Query).where(Query.id.in_(query_ids)).order_by(Query.ordinal)
-        queries = (await db.execute(stmt)).scalars().all()
-
-        # Process in batches
-        for i in range(0, len(queries), batch_size):
-            # Check for cancellation
-            await db.refresh(run)
-            if run.status == "cancelled":
-                await _create_run_notification(
-                    db,
-                    organization_id=run.organization_id,
-                    project_id=run.project_id,
-                    user_id=run.created_by_user_id,
-                    run_id=run.id,
-                    label=run.label,
-                    status="cancelled",
-                )
-                await db.commit()
-                await sse_bus.publish(run_id, "complete", {"status": "cancelled"})
-                return
+        queries = [
+            q
+            for q in (await db.execute(stmt)).scalars().all()
+            if q.id not in done_query_ids
+        ]
+        if done_query_ids:
+            logger.info(
+                f"Run {run_id} resuming: {len(done_query_ids)} done, {len(queries)} remaining"
+            )
 
-            batch = queries[i : i + batch_size]
-            tasks = [
+    # The setup session is closed here: executions never touch a session, and
+    # all writes go through the writer task's own session.
+
+    # Transient-error retries are capped per run, shared by all queries
+    retry_budget = RetryBudget(get_settings().EXECUTOR_RETRY_BUDGET_PER_RUN)
+
+    # Finished queries are handed to a single writer task that persists them
+    # in bulk; see ResultWriter.
+    writer = ResultWriter(run, output_dir, model=agent_config.model)
+    writer_task = writer.start()
+
+    # Sliding window: keep up to batch_size executions in flight and start
+    # the next query as soon as any one finishes.
+    window = max(1, batch_size)
+    remaining = iter(queries)
+    in_flight: dict[asyncio.Task, Query] = {}
+    cancelled = False
+
+    def _fill_window():
+        while not cancelled and len(in_flight) < window:
+            q = next(remaining, None)
+            if q is None:
+                return
+            task = asyncio.create_task(
                 _execute_single(
                     executor,
                     q,
@@ -179,59 +212,72 @@ async def _execute_run_inner(run_id: int, query_ids: list[int], batch_size: int)
                     run.organization_id,
                     run.project_id,
                     run.created_by_user_id,
-                    db,
+                    run.visibility_scope,
+                    retry_budget,
                 )
-                for q in batch
-            ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            )
+            in_flight[task] = q
 
-            for q, res in zip(batch, results):
-                if isinstance(res, Exception):
-                    result = Result(
-                        organization_id=run.organization_id,
-                        project_id=run.project_id,
-                        created_by_user_id=run.created_by_user_id,
-                        visibility_scope=run.visibility_scope,
-                        run_id=run_id,
-                        query_id=q.id,
-                        error=str(res),
-                        execution_time_seconds=0,
+    try:
+        _fill_window()
+        while in_flight:
+            done, _ = await asyncio.wait(
+                [*in_flight, writer_task], return_when=asyncio.FIRST_COMPLETED
+            )
+            if writer_task in done:
+                # The writer only stops on close(); surface its error
+                writer_task.result()
+                raise RuntimeError("Result writer stopped unexpectedly")
+            for task in done:
+                q = in_flight.pop(task)
+                exc = task.exception()
+                if exc is not None:
+                    writer.submit(
+                        PendingResult(
+                            query=q,
+                            result=_result_values(
+                                run.organization_id,
+                                run.project_id,
+                                run.created_by_user_id,
+                                run.visibility_scope,
+                                run_id,
+                                q.id,
+                                error=str(exc),
+                                execution_time_seconds=0,
+                            ),
+                        )
                     )
                 else:
-                    result = res
-                db.add(result)
-
-                run.progress_current += 1
-                await db.commit()
-
-                # Save JSON file to output directory
-                if output_dir:
-                    _save_result_json(
-                        output_dir / "json" / f"{q.ordinal}.json", q, result
-                    )
+                    writer.submit(task.result())
+
+            # The writer reads the run status on every flush; once cancelled,
+            # in-flight queries are drained and recorded, but nothing new is
+            # started.
+            cancelled = writer.cancelled
+            _fill_window()
+    finally:
+        # Unhandled errors or worker shutdown: don't leak running executions,
+        # but keep whatever already finished.
+        for task in in_flight:
+            task.cancel()
+        await writer.close()
 
-                status = "OK" if result.error is None else f"ERR: {result.error[:80]}"
-                logger.info(
-                    f"Run {run_id} Q{q.ordinal} [{run.progress_current}/{run.progress_total}] {status}"
-                )
-
-                # Publish SSE
-                await sse_bus.publish(
-                    run_id,
-                    "progress",
-                    {
-                        "current": run.progress_current,
-                        "total": run.progress_total,
-                        "query_id": q.id,
-                        "query_ordinal": q.ordinal,
-                        "query_text": q.query_text[:100],
-                        "success": result.error is None,
-                        "time": result.execution_time_seconds,
-                    },
-                )
+    async with async_session() as db:
+        run = await db.get(Run, run_id)
+        if run.status == "cancelled":
+            await _create_run_notification(
+                db,
+                organization_id=run.organization_id,
+                project_id=run.project_id,
+                user_id=run.created_by_user_id,
+                run_id=run.id,
+                label=run.label,
+                status="cancelled",
+            )
+            await sse_bus.publish(run_id, "complete", {"status": "cancelled"})
+            return
 
         # Mark complete
-        await db.refresh(run)
         if run.status == "running":
             run.status = "completed"
             run.completed_at = datetime.now(timezone.utc)
@@ -244,7 +290,6 @@ async def _execute_run_inner(run_id: int, query_ids: list[int], batch_size: int)
                 label=run.label,
                 status="completed",
             )
-            await db.commit()
 
         await sse_bus.publish(
             run_id,
@@ -257,24 +302,37 @@ async def _execute_run_inner(run_id: int, query_ids: list[int], batch_size: int)
         )
 
 
-def _save_result_json(filepath: Path, query: Query, result: Result):
-    """Save result as JSON file matching the existing json/ folder format."""
-    data = {
-        "id": str(query.ordinal),
-        "query": query.query_text,
-        "expected_answer": query.expected_answer,
-        "agent_response": result.agent_response or "",
-        "tool_calls": result.tool_calls or [],
-        "reasoning": result.reasoning or [],
-        "usage": result.usage or {},
-        "execution_time_seconds": result.execution_time_seconds or 0,
+def _result_values(
+    organization_id: int,
+    project_id: int,
+    created_by_user_id: int | None,
+    visibility_scope: str,
+    run_id: int,
+    query_id: int,
+    *,
+    agent_response: str | None = None,
+    tool_calls: list | None = None,
+    reasoning: list | None = None,
+    usage: dict | None = None,
+    execution_time_seconds: float | None = None,
+    error: str | None = None,
+) -> dict:
+    # Every row carries the same keys so the bulk INSERT stays one statement
+    return {
+        "organization_id": organization_id,
+        "project_id": project_id,
+        "created_by_user_id": created_by_user_id,
+        "visibility_scope": visibility_scope,
+        "run_id": run_id,
+        "query_id": query_id,
+        "trace_log_id": None,
+        "agent_response": agent_response,
+        "tool_calls": tool_calls,
+        "reasoning": reasoning,
+        "usage": usage,
+        "execution_time_seconds": execution_time_seconds,
+        "error": error,
     }
-    if result.error:
-        data["error"] = result.error
-    try:
-        filepath.write_text(json.dumps(data, indent=2, ensure_ascii=False))
-    except Exception as e:
-        logger.warning(f"Failed to write JSON to {filepath}: {e}")
 
 
 async def _execute_single(
@@ -286,60 +344,69 @@ async def _execute_single(
     organization_id: int,
     project_id: int,
     created_by_user_id: int | None,
-    db,
-) -> Result:
+    visibility_scope: str,
+    retry_budget: RetryBudget | None = None,
+) -> PendingResult:
+    """Execute one query; the trace and result rows are written by the caller."""
     started_at = datetime.now(timezone.utc)
-    trace = TraceLog(
+    exec_result = await governed_execute(
+        executor,
+        query.query_text,
+        config,
         organization_id=organization_id,
-        project_id=project_id,
-        created_by_user_id=created_by_user_id,
-        run_id=run_id,
-        query_id=query.id,
-        agent_config_id=agent_config_id,
-        trace_type="benchmark",
-        provider="openai",
-        endpoint="agents.runner.run",
-        model=config.get("model"),
-        status="started",
-        started_at=started_at,
-        request_payload={
+        retry_budget=retry_budget,
+    )
+    completed_at = datetime.now(timezone.utc)
+    latency_ms = int((completed_at - started_at).total_seconds() * 1000)
+
+    trace = {
+        "organization_id": organization_id,
+        "project_id": project_id,
+        "created_by_user_id": created_by_user_id,
+        "run_id": run_id,
+        "query_id": query.id,
+        "agent_config_id": agent_config_id,
+        "trace_type": "benchmark",
+        "provider": "openai",
+        "endpoint": "agents.runner.run",
+        "model": config.get("model"),
+        "status": "failed" if exec_result.error else "completed",
+        "started_at": started_at,
+        "completed_at": completed_at,
+        "latency_ms": latency_ms,
+        "attempts": exec_result.attempts,
+        "request_payload": {
             "query": query.query_text,
             "system_prompt": config.get("system_prompt"),
             "model": config.get("model"),
             "tools_config": config.get("tools_config"),
             "model_settings": config.get("model_settings"),
         },
-    )
-    db.add(trace)
-    await db.flush()
-
-    exec_result = await executor.execute(query.query_text, config)
-    completed_at = datetime.now(timezone.utc)
-    latency_ms = int((completed_at - started_at).total_seconds() * 1000)
-
-    trace.response_payload = {
-        "response": exec_result.response,
-        "tool_calls": exec_result.tool_calls,
-        "reasoning": exec_result.reasoning,
+        "response_payload": {
+            "response": exec_result.response,
+            "tool_calls": exec_result.tool_calls,
+            "reasoning": exec_result.reasoning,
+            "cache_hit": exec_result.cache_hit,
+        },
+        "usage": exec_result.usage or None,
+        "error": exec_result.error,
     }
-    trace.usage = exec_result.usage or None
-    trace.error = exec_result.error
-    trace.status = "failed" if exec_result.error else "completed"
-    trace.completed_at = completed_at
-    trace.latency_ms = latency_ms
 
-    return Result(
-        organization_id=organization_id,
-        project_id=project_id,
-        created_by_user_id=created_by_user_id,
-        visibility_scope="project",
-        run_id=run_id,
-        query_id=query.id,
-        trace_log_id=trace.id,
-        agent_response=exec_result.response if not exec_result.error else None,
-        tool_calls=exec_result.tool_calls or None,
-        reasoning=exec_result.reasoning or None,
-        usage=exec_result.usage or None,
-        execution_time_seconds=exec_result.execution_time_seconds,
-        error=exec_result.error,
+    return PendingResult(
+        query=query,
+        trace=trace,
+        result=_result_values(
+            organization_id,
+            project_id,
+            created_by_user_id,
+            visibility_scope,
+            run_id,
+            query.id,
+            agent_response=exec_result.response if not exec_result.error else None,
+            tool_calls=exec_result.tool_calls or None,
+            reasoning=exec_result.reasoning or None,
+            usage=exec_result.usage or None,
+            execution_time_seconds=exec_result.execution_time_seconds,
+            error=exec_result.error,
+        ),
     )
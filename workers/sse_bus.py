@@ -1,33 +1,478 @@
+"""Pub/sub for SSE events keyed by topic.
+
+Topics are strings: ``run:<id>`` for benchmark runs (``publish``/``subscribe``
+take a run id directly), ``previews:<org_id>`` for cost previews and
+``notifications:<org_id>`` for app notifications. One subscriber queue can
+listen to many topics at once (``subscribe_topics``) for multiplexed streams.
+
+Subscribers always read from a local ``asyncio.Queue``; the backend decides
+how published events reach every process that may hold subscribers:
+
+- ``local``: delivered in-process only (single API process, embedded worker).
+- ``postgres`` (default): ``pg_notify`` on the ``sse_events`` channel; every
+  process keeps one ``LISTEN`` connection and fans received events out to its
+  own subscribers, so progress from standalone workers or other uvicorn
+  workers reaches every stream.
+
+Until ``start()`` has connected the listener (scripts, tests, or a database
+outage) the Postgres backend falls back to local delivery so events are
+never silently lost in-process.
+
+Each subscriber gets a bounded ``SubscriberQueue`` and publishing never
+waits on a subscriber: a subscriber that keeps up receives every event, and
+only once its queue is full is a new "progress"/"status" event coalesced into
+the latest pending one of its kind (the latest snapshot wins) or, failing
+that, the oldest non-terminal event dropped. A subscriber that stays full
+without reading for
+``SSE_SLOW_CONSUMER_EVICT_SECONDS`` is evicted with a final "evicted" event
+so the client reconnects.
+
+Every event carries a per-topic monotonic id (microsecond timestamp, strictly
+increasing per publisher) and each process keeps the last
+``SSE_REPLAY_BUFFER_SIZE`` events per topic in a ring buffer, so a reconnecting
+client can resume from its ``Last-Event-ID``.
+"""
+
 import asyncio
 import json
-from collections import defaultdict
+import time
+from collections import OrderedDict, defaultdict, deque
+
+from loguru import logger
+from sqlalchemy import text
+
+from config import get_settings
+
+CHANNEL = "sse_events"
+# NOTIFY payloads are limited to 8000 bytes
+_MAX_NOTIFY_BYTES = 7900
+
+# Snapshot events: a full queue keeps only the latest pending one
+COALESCED_EVENTS = {"progress", "status"}
+# Never dropped: the stream ends on these
+TERMINAL_EVENTS = {"complete", "error"}
+# Topics with a replay buffer kept per process (least recently published evicted)
+_MAX_REPLAY_TOPICS = 500
+
+
+def run_topic(run_id: int) -> str:
+    return f"run:{run_id}"
+
+
+def preview_topic(organization_id: int) -> str:
+    return f"previews:{organization_id}"
+
+
+def notification_topic(organization_id: int) -> str:
+    return f"notifications:{organization_id}"
+
+
+class SubscriberQueue:
+    """Bounded per-subscriber buffer; ``get`` matches ``asyncio.Queue.get``."""
+
+    def __init__(self, maxsize: int, evict_after_seconds: float):
+        self.maxsize = max(1, maxsize)
+        self.evict_after_seconds = evict_after_seconds
+        self.dropped = 0
+        self.coalesced = 0
+        self.evicted = False
+        self.replayed = False
+        self.topics: list[str] = []
+        # Entries are [topic, event, payload, event_id]
+        self._items: deque[list] = deque()
+        self._pending: dict[tuple[str, str], list] = {}
+        self._ready = asyncio.Event()
+        self._full_since: float | None = None
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def offer(
+        self, topic: str, event: str, payload: str, event_id: int | None = None
+    ) -> str:
+        """Enqueue without waiting.
+
+        Every event is queued while there is room. Once the queue is full a
+        "progress"/"status" event replaces the latest pending one of its kind
+        ("coalesced"); otherwise the oldest non-terminal event is dropped to
+        make room ("dropped"). Returns "queued", "coalesced", "dropped" or
+        "evict" (the subscriber should be evicted).
+        """
+        outcome = "queued"
+        if len(self._items) >= self.maxsize:
+            now = time.monotonic()
+            if self._full_since is None:
+                self._full_since = now
+            elif (
+                self.evict_after_seconds > 0
+                and now - self._full_since >= self.evict_after_seconds
+            ):
+                return "evict"
+            pending = self._pending.get((topic, event))
+            if pending is not None:
+                pending[2] = payload
+                pending[3] = event_id
+                self.coalesced += 1
+                return "coalesced"
+            if self._drop_oldest():
+                self.dropped += 1
+                outcome = "dropped"
+
+        entry = [topic, event, payload, event_id]
+        self._items.append(entry)
+        if event in COALESCED_EVENTS:
+            # The newest pending entry of its kind is the one to coalesce into
+            self._pending[(topic, event)] = entry
+        self._ready.set()
+        return outcome
+
+    def _drop_oldest(self) -> bool:
+        for i, entry in enumerate(self._items):
+            if entry[1] not in TERMINAL_EVENTS:
+                del self._items[i]
+                if self._pending.get((entry[0], entry[1])) is entry:
+                    del self._pending[(entry[0], entry[1])]
+                return True
+        return False
+
+    def evict(self):
+        self.evicted = True
+        self._items.clear()
+        self._pending.clear()
+        self._items.append(
+            ["", "evicted", json.dumps({"reason": "slow consumer"}), None]
+        )
+        self._ready.set()
+
+    async def get_tagged(self) -> tuple[str, str, str, int | None]:
+        """Return the next ``(topic, event, payload, event_id)``."""
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        entry = self._items.popleft()
+        if self._pending.get((entry[0], entry[1])) is entry:
+            del self._pending[(entry[0], entry[1])]
+        self._full_since = None
+        return entry[0], entry[1], entry[2], entry[3]
+
+    async def get(self) -> tuple[str, str, int | None]:
+        """Return the next ``(event, payload, event_id)``."""
+        _, event, payload, event_id = await self.get_tagged()
+        return event, payload, event_id
+
+
+class LocalBackend:
+    name = "local"
+
+    def __init__(self, deliver):
+        self._deliver = deliver
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def publish(self, topic: str, event: str, payload: str, event_id: int):
+        self._deliver(topic, event, payload, event_id)
+
+
+class PostgresBackend:
+    name = "postgres"
+
+    def __init__(self, deliver):
+        self._deliver = deliver
+        self._conn = None
+        self._supervisor: asyncio.Task | None = None
+        self._connected = asyncio.Event()
+
+    @property
+    def listening(self) -> bool:
+        return self._connected.is_set()
+
+    async def start(self):
+        if self._supervisor is None:
+            self._supervisor = asyncio.create_task(self._listen_forever())
+            # Give the first connection a moment so early events go over NOTIFY
+            try:
+                await asyncio.wait_for(self._connected.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                logger.warning("SSE bus listener not connected yet; delivering locally")
+
+    async def stop(self):
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            try:
+                await self._supervisor
+            except asyncio.CancelledError:
+                pass
+            self._supervisor = None
+        await self._close()
+
+    async def _close(self):
+        self._connected.clear()
+        conn, self._conn = self._conn, None
+        if conn is not None and not conn.is_closed():
+            await conn.close()
+
+    def _on_notify(self, connection, pid, channel, payload: str):
+        try:
+            message = json.loads(payload)
+            self._deliver(
+                message["topic"], message["event"], message["data"], message["id"]
+            )
+        except Exception:
+            logger.exception("Malformed SSE bus notification")
+
+    async def _listen_forever(self):
+        import asyncpg
+
+        dsn = get_settings().DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+        delay = 1.0
+        while True:
+            try:
+                self._conn = await asyncpg.connect(dsn)
+                await self._conn.add_listener(CHANNEL, self._on_notify)
+                self._connected.set()
+                delay = 1.0
+                logger.info(f"SSE bus listening on Postgres channel {CHANNEL}")
+                while not self._conn.is_closed():
+                    await asyncio.sleep(5)
+                logger.warning("SSE bus listener connection closed; reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(f"SSE bus listener failed; retrying in {delay}s")
+            await self._close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    async def publish(self, topic: str, event: str, payload: str, event_id: int):
+        message = json.dumps(
+            {"topic": topic, "event": event, "data": payload, "id": event_id}
+        )
+        if not self.listening or len(message.encode()) > _MAX_NOTIFY_BYTES:
+            # Our own listener delivers NOTIFYs back to this process, so only
+            # deliver directly when the event cannot go through Postgres.
+            if self.listening:
+                logger.warning(
+                    f"SSE event {event} for {topic} too large to NOTIFY; "
+                    "delivered to local subscribers only"
+                )
+            self._deliver(topic, event, payload, event_id)
+            return
+        from database import engine
+
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(
+                    text("SELECT pg_notify(:channel, :message)"),
+                    {"channel": CHANNEL, "message": message},
+                )
+                await conn.commit()
+        except Exception:
+            logger.exception(f"SSE NOTIFY failed for {topic}; delivering locally")
+            self._deliver(topic, event, payload, event_id)
+
+
+_BACKENDS = {
+    LocalBackend.name: LocalBackend,
+    PostgresBackend.name: PostgresBackend,
+}
 
 
 class SSEBus:
-    """In-process pub/sub for SSE events keyed by run_id."""
+    """Pub/sub for SSE events keyed by topic, fanned out across processes."""
+
+    def __init__(self, backend: str | None = None):
+        self._subscribers: dict[str, list[SubscriberQueue]] = defaultdict(list)
+        self._backend_name = backend
+        self._backend = None
+        self._published = 0
+        self._delivered = 0
+        self._dropped = 0
+        self._coalesced = 0
+        self._evicted = 0
+        self._replay: OrderedDict[str, deque[tuple[str, str, int]]] = OrderedDict()
+        self._last_ids: dict[str, int] = {}
 
-    def __init__(self):
-        self._subscribers: dict[int, list[asyncio.Queue]] = defaultdict(list)
+    @property
+    def backend(self):
+        if self._backend is None:
+            name = self._backend_name or get_settings().SSE_BUS_BACKEND
+            cls = _BACKENDS.get(name)
+            if cls is None:
+                raise ValueError(
+                    f"Unknown SSE bus backend: {name}. Available: {list(_BACKENDS)}"
+                )
+            self._backend = cls(self._deliver)
+        return self._backend
 
-    def subscribe(self, run_id: int) -> asyncio.Queue:
-        q: asyncio.Queue = asyncio.Queue()
-        self._subscribers[run_id].append(q)
+    async def start(self):
+        await self.backend.start()
+
+    async def stop(self):
+        if self._backend is not None:
+            await self._backend.stop()
+
+    def _new_queue(self) -> SubscriberQueue:
+        settings = get_settings()
+        return SubscriberQueue(
+            settings.SSE_SUBSCRIBER_QUEUE_SIZE,
+            settings.SSE_SLOW_CONSUMER_EVICT_SECONDS,
+        )
+
+    def _attach(self, topics: list[str], q: SubscriberQueue):
+        q.topics = list(topics)
+        for topic in q.topics:
+            self._subscribers[topic].append(q)
+
+    def subscribe(
+        self,
+        run_id: int,
+        last_event_id: int | str | None = None,
+        *,
+        replay_buffered: bool = False,
+    ) -> SubscriberQueue:
+        """Subscribe to a run, optionally replaying buffered events first.
+
+        With ``last_event_id``, events after it are replayed if the buffer
+        still reaches back to it (``q.replayed`` tells whether it did; if not
+        the caller should send a snapshot). ``replay_buffered`` replays the
+        whole buffer.
+        """
+        topic = run_topic(run_id)
+        q = self._new_queue()
+        buffered = self._replay.get(topic) or ()
+        after: int | None = None
+        if replay_buffered:
+            after = 0
+        elif last_event_id is not None:
+            try:
+                last = int(last_event_id)
+            except (TypeError, ValueError):
+                last = None
+            if (
+                last is not None
+                and buffered
+                and (
+                    last >= buffered[-1][2]
+                    or any(event_id == last for _, _, event_id in buffered)
+                )
+            ):
+                after = last
+        if after is not None:
+            for event, payload, event_id in buffered:
+                if event_id > after:
+                    q.offer(topic, event, payload, event_id)
+            q.replayed = True
+        self._attach([topic], q)
+        return q
+
+    def subscribe_topics(self, topics: list[str]) -> SubscriberQueue:
+        """One queue for many topics; read it with ``get_tagged``."""
+        q = self._new_queue()
+        self._attach(topics, q)
         return q
 
-    def unsubscribe(self, run_id: int, q: asyncio.Queue):
-        subs = self._subscribers.get(run_id, [])
-        if q in subs:
-            subs.remove(q)
-        if not subs:
-            self._subscribers.pop(run_id, None)
+    def last_event_id(self, run_id: int) -> int | None:
+        """Id of the newest buffered event for a run in this process."""
+        buffered = self._replay.get(run_topic(run_id))
+        return buffered[-1][2] if buffered else None
+
+    def unsubscribe(self, run_id: int, q: SubscriberQueue):
+        self.unsubscribe_topics(q)
+
+    def unsubscribe_topics(self, q: SubscriberQueue):
+        for topic in q.topics:
+            subs = self._subscribers.get(topic, [])
+            if q in subs:
+                subs.remove(q)
+            if not subs:
+                self._subscribers.pop(topic, None)
+
+    def _remember(self, topic: str, event: str, payload: str, event_id: int):
+        buffered = self._replay.get(topic)
+        if buffered is None:
+            buffered = deque(maxlen=max(1, get_settings().SSE_REPLAY_BUFFER_SIZE))
+            self._replay[topic] = buffered
+            while len(self._replay) > _MAX_REPLAY_TOPICS:
+                self._replay.popitem(last=False)
+        else:
+            self._replay.move_to_end(topic)
+        buffered.append((event, payload, event_id))
+
+    def _deliver(self, topic: str, event: str, payload: str, event_id: int):
+        self._published += 1
+        self._remember(topic, event, payload, event_id)
+        for q in list(self._subscribers.get(topic, [])):
+            outcome = q.offer(topic, event, payload, event_id)
+            if outcome == "evict":
+                q.evict()
+                self.unsubscribe_topics(q)
+                self._evicted += 1
+                logger.warning(f"Evicted slow SSE subscriber for {topic}")
+            elif outcome == "coalesced":
+                self._coalesced += 1
+            else:
+                self._delivered += 1
+                if outcome == "dropped":
+                    self._dropped += 1
+
+    def _next_id(self, topic: str, event: str) -> int:
+        event_id = max(time.time_ns() // 1000, self._last_ids.get(topic, 0) + 1)
+        if event in TERMINAL_EVENTS:
+            self._last_ids.pop(topic, None)
+        else:
+            self._last_ids[topic] = event_id
+        return event_id
+
+    async def publish_topic(self, topic: str, event: str, data: dict):
+        await self.backend.publish(
+            topic, event, json.dumps(data), self._next_id(topic, event)
+        )
 
     async def publish(self, run_id: int, event: str, data: dict):
-        payload = json.dumps(data)
-        for q in self._subscribers.get(run_id, []):
-            await q.put((event, payload))
+        await self.publish_topic(run_topic(run_id), event, data)
+
+    def metrics(self) -> dict:
+        """Counters since startup plus current queue depths in this process."""
+        queues = {id(q): q for subs in self._subscribers.values() for q in subs}
+        depths = [q.qsize() for q in queues.values()]
+        return {
+            "backend": self.backend.name,
+            "topics": len(self._subscribers),
+            "subscribers": len(depths),
+            "published": self._published,
+            "delivered": self._delivered,
+            "dropped": self._dropped,
+            "coalesced": self._coalesced,
+            "evicted": self._evicted,
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+        }
 
     def clear(self):
         self._subscribers.clear()
+        self._replay.clear()
+        self._last_ids.clear()
 
 
 sse_bus = SSEBus()
+
+
+async def publish_notification(notification):
+    """Publish a committed ``AppNotification`` to its organization's topic."""
+    await sse_bus.publish_topic(
+        notification_topic(notification.organization_id),
+        "notification",
+        {
+            "id": notification.id,
+            "project_id": notification.project_id,
+            "user_id": notification.user_id,
+            "notif_type": notification.notif_type,
+            "title": notification.title,
+            "message": notification.message,
+            "related_id": notification.related_id,
+        },
+    )
@@ -0,0 +1,142 @@
+"""Run worker: claims jobs from ``run_jobs`` and executes them.
+
+Start standalone workers with::
+
+    uv run python -m workers.worker --concurrency 3
+
+Every worker process (and the API process, when ``RUN_WORKER_EMBEDDED`` is
+set) polls the same queue, so runners scale horizontally across processes and
+nodes.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import uuid
+
+from loguru import logger
+
+from config import get_settings
+from workers.queue import (
+    claim_next_job,
+    finish_job,
+    heartbeat_job,
+    requeue_stale_jobs,
+    run_job_outcome,
+)
+from workers.runner import execute_run
+from workers.sse_bus import sse_bus
+
+
+class RunWorker:
+    def __init__(self, concurrency: int | None = None, worker_id: str | None = None):
+        settings = get_settings()
+        self.concurrency = max(1, concurrency or settings.RUN_WORKER_CONCURRENCY)
+        self.poll_seconds = settings.RUN_WORKER_POLL_SECONDS
+        self.heartbeat_seconds = settings.RUN_JOB_HEARTBEAT_SECONDS
+        self.shutdown_grace_seconds = settings.RUN_WORKER_SHUTDOWN_GRACE_SECONDS
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._active: set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+
+    async def run_forever(self):
+        logger.info(f"Run worker {self.worker_id} started (concurrency={self.concurrency})")
+        last_recovery = 0.0
+        loop = asyncio.get_running_loop()
+        while not self._stopping.is_set():
+            try:
+                now = loop.time()
+                if now - last_recovery >= self.heartbeat_seconds:
+                    last_recovery = now
+                    await requeue_stale_jobs()
+
+                claimed = False
+                while len(self._active) < self.concurrency:
+                    job = await claim_next_job(self.worker_id)
+                    if job is None:
+                        break
+                    claimed = True
+                    task = asyncio.create_task(self._process(job.id, job.run_id, job.query_ids, job.batch_size))
+                    self._active.add(task)
+                    task.add_done_callback(self._active.discard)
+                if claimed:
+                    continue
+            except Exception:
+                logger.exception(f"Run worker {self.worker_id} poll failed")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def stop(self):
+        """Stop polling and cancel in-flight jobs after a short grace period.
+
+        Runs can take hours, so shutdown does not wait for them. Interrupted
+        jobs keep status "running" and are re-queued by another worker once
+        their heartbeat goes stale; the run resumes from its checkpoints.
+        """
+        self._stopping.set()
+        if not self._active:
+            return
+        _, pending = await asyncio.wait(self._active, timeout=self.shutdown_grace_seconds)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.info(f"Run worker {self.worker_id} interrupted {len(pending)} job(s) on shutdown")
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _heartbeat(self, job_id: int):
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                await heartbeat_job(job_id, self.worker_id)
+            except Exception:
+                logger.exception(f"Heartbeat failed for run job {job_id}")
+
+    async def _process(self, job_id: int, run_id: int, query_ids: list[int], batch_size: int):
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            await execute_run(run_id, query_ids, batch_size)
+            status, error_message = await run_job_outcome(run_id)
+            await finish_job(job_id, status, error_message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception(f"Run job {job_id} (run {run_id}) crashed")
+            await finish_job(job_id, "failed", str(e))
+        finally:
+            heartbeat.cancel()
+
+
+async def _main(concurrency: int | None):
+    # Progress events must reach API processes serving the SSE streams
+    await sse_bus.start()
+    worker = RunWorker(concurrency=concurrency)
+    try:
+        await worker.run_forever()
+    finally:
+        await worker.stop()
+        await sse_bus.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark run worker")
+    parser.add_argument("--concurrency", type=int, default=None)
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+    settings = get_settings()
+    if settings.OPENAI_API_KEY:
+        os.environ.setdefault("OPENAI_API_KEY", settings.OPENAI_API_KEY)
+
+    try:
+        asyncio.run(_main(args.concurrency))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()